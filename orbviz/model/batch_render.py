@@ -0,0 +1,234 @@
+'''Headless rendering of sensor images over a range of timespan indices.
+
+Frames are raycast with EarthRayCastData.rayCastFromSensor, without creating any Qt widgets or
+vispy canvases, and streamed to disk as PNG images, individual .npy arrays, or one memory-mapped
+.npy array per sensor.
+'''
+import concurrent.futures
+import datetime as dt
+import logging
+import multiprocessing
+import pathlib
+
+from typing import Any
+
+import numpy as np
+from PIL import Image
+from progressbar import progressbar
+
+import orbviz
+from orbviz.model.data_models import data_types, groundstation_data
+import orbviz.model.data_models.earth_raycast_data as earth_raycast_data
+import orbviz.model.data_models.history_data as history_data
+import orbviz.model.lens_models.pinhole as pinhole
+import orbviz.model.lens_models.ray_tables as ray_tables
+import orbviz.util.threading as threading
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ('png', 'npy', 'memmap')
+
+# per process state of render workers
+_raycast_src: earth_raycast_data.EarthRayCastData | None = None
+_memmaps: dict[str, np.ndarray] = {}
+
+
+def initHeadless() -> None:
+	'''Allow data models to be processed without a Qt event loop.'''
+	if orbviz.threadpool is None:
+		orbviz.threadpool = threading.SynchronousThreadpool()
+
+def loadHistory(primary_config_file:pathlib.Path, pointing_file:pathlib.Path,
+				period_start:dt.datetime|None=None, period_end:dt.datetime|None=None,
+				sampling_period:int=30) -> history_data.HistoryData:
+	'''Propagate the spacecraft of a primary configuration and load their pointing.
+
+	Args:
+		primary_config_file (pathlib.Path): primary configuration json
+		pointing_file (pathlib.Path): pointing csv for the primary spacecraft
+		period_start (dt.datetime|None): start of timespan, the pointing file defines the timespan if None
+		period_end (dt.datetime|None): end of timespan
+		sampling_period (int): timespan step [s]
+
+	Returns:
+		history_data.HistoryData: processed history data
+	'''
+	initHeadless()
+	history = history_data.HistoryData()
+	history.groundstationCollection = groundstation_data.GroundStationCollection()
+	history.setPrimaryConfig(data_types.PrimaryConfig.fromJSON(primary_config_file))
+	history.updateConfig('is_pointing_defined', True)
+	history.updateConfig('pointing_file', pointing_file)
+	if period_start is None:
+		history.updateConfig('pointing_defines_timespan', True)
+	else:
+		if period_end is None:
+			logger.error("Timespan start %s given without an end", period_start)
+			raise ValueError(f"Timespan start {period_start} given without an end")
+		history.updateConfig('pointing_defines_timespan', False)
+		history.updateConfig('timespan_period_start', period_start)
+		history.updateConfig('timespan_period_end', period_end)
+		history.updateConfig('sampling_period', sampling_period)
+
+	history.process()
+	if not history.hasOrbits():
+		logger.error("Failed to propagate orbits for %s", primary_config_file)
+		raise RuntimeError(f"Failed to propagate orbits for {primary_config_file}")
+	return history
+
+def loadRaycastSource() -> earth_raycast_data.EarthRayCastData:
+	initHeadless()
+	raycast_src = earth_raycast_data.EarthRayCastData()
+	for sphere_img in raycast_src.data.values():
+		if sphere_img.arr is None:
+			logger.error("Failed to load %s", sphere_img.getConfigValue('img_path'))
+			raise RuntimeError(f"Failed to load {sphere_img.getConfigValue('img_path')}")
+	return raycast_src
+
+def listImagingSensors(history:history_data.HistoryData) -> list[tuple[int, str, str]]:
+	'''List (spacecraft id, suite name, sensor name) of every sensor which can form an image.'''
+	sensors = []
+	for sc_id, sc_config in history.getPrimaryConfig().getAllSpacecraftConfigs().items():
+		for suite_name, suite_config in sc_config.getSensorSuites().items():
+			sensors.extend((sc_id, suite_name, sens_name) for sens_name in suite_config.getSensorNames()
+							if suite_config.getSensorConfig(sens_name)['shape'] == data_types.SensorTypes.FPA)
+	return sensors
+
+def buildFrameJobs(history:history_data.HistoryData, sensors:list[tuple[int, str, str]],
+					indices:range) -> list[dict[str, Any]]:
+	'''Gather everything needed to raycast each sensor at each index.
+
+	Indices at which the spacecraft attitude is not defined are skipped.
+	'''
+	timespan = history.getTimespan()
+	orbits = history.getOrbits()
+	jobs = []
+	for sc_id, suite_name, sens_name in sensors:
+		attitude = history.getSCAttitude(sc_id)
+		sens_config = history.getPrimaryConfig().getAllSpacecraftConfigs()[sc_id].getSensorSuites()[suite_name].getSensorConfig(sens_name)
+		frame_num = 0
+		for index in indices:
+			if not attitude.isAttitudeValid(index):
+				logger.warning("Spacecraft %s has no valid attitude at index %s, skipping", sc_id, index)
+				continue
+			T = np.eye(4)
+			T[0:3,0:3] = attitude.getSensorAttitudeMatrix(suite_name, sens_name, index)
+			T[0:3,3] = orbits[sc_id].pos[index]
+			jobs.append({'sc_id':sc_id,
+						'suite_name':suite_name,
+						'sens_name':sens_name,
+						'index':index,
+						'frame_num':frame_num,
+						'resolution':tuple(sens_config['resolution']),
+						'fov':tuple(sens_config['fov']),
+						'transform':T,
+						'datetime':timespan[index],
+						'sun_eci':orbits[sc_id].sun_pos[index],
+						'moon_eci':orbits[sc_id].moon_pos[index]})
+			frame_num += 1
+	return jobs
+
+def renderFrames(raycast_src:earth_raycast_data.EarthRayCastData, jobs:list[dict[str, Any]],
+				output_dir:pathlib.Path, output_format:str='png', raycast_options:dict[str, Any]|None=None,
+				num_workers:int=1) -> list[pathlib.Path]:
+	'''Raycast and write each frame job, spread over a pool of processes.
+
+	Args:
+		raycast_src (earth_raycast_data.EarthRayCastData): loaded raycast data
+		jobs (list[dict[str, Any]]): frame jobs from buildFrameJobs
+		output_dir (pathlib.Path): directory to write frames to
+		output_format (str): one of OUTPUT_FORMATS
+		raycast_options (dict[str, Any]|None): keyword arguments passed to rayCastFromSensor
+		num_workers (int): number of processes, frames are rendered in this process if 1
+
+	Returns:
+		list[pathlib.Path]: file written for each job
+	'''
+	global _raycast_src
+	if output_format not in OUTPUT_FORMATS:
+		logger.error("Unknown output format %s, should be one of %s", output_format, OUTPUT_FORMATS)
+		raise ValueError(f"Unknown output format {output_format}, should be one of {OUTPUT_FORMATS}")
+	if raycast_options is None:
+		raycast_options = {}
+	output_dir.mkdir(parents=True, exist_ok=True)
+
+	_memmaps.clear()
+	if output_format == 'memmap':
+		_createMemmaps(jobs, output_dir)
+
+	# generate ray tables before any workers are forked, so they share them
+	for resolution, fov in {(job['resolution'], job['fov']) for job in jobs}:
+		ray_tables.getPixelRays(pinhole, resolution, fov)
+
+	tasks = [(job, output_dir, output_format, raycast_options) for job in jobs]
+	# forked workers inherit the loaded raycast data rather than each loading their own
+	_raycast_src = raycast_src
+	if num_workers <= 1:
+		return [_renderFrame(task) for task in progressbar(tasks)]
+
+	if 'fork' in multiprocessing.get_all_start_methods():
+		mp_context = multiprocessing.get_context('fork')
+	else:
+		mp_context = multiprocessing.get_context()
+	chunksize = max(1, len(tasks)//(num_workers*8))
+	with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers,
+												mp_context=mp_context,
+												initializer=_initRenderWorker) as executor:
+		paths = list(progressbar(executor.map(_renderFrame, tasks, chunksize=chunksize), max_value=len(tasks)))
+	return paths
+
+def _initRenderWorker() -> None:
+	global _raycast_src
+	if _raycast_src is None:
+		_raycast_src = loadRaycastSource()
+
+def _frameStem(job:dict[str, Any]) -> str:
+	return f"{job['sc_id']}_{job['suite_name']}_{job['sens_name']}"
+
+def _createMemmaps(jobs:list[dict[str, Any]], output_dir:pathlib.Path) -> None:
+	# one (num_frames, height, width, 3) array per sensor, and the timespan index of each frame
+	indices = {}
+	resolutions = {}
+	for job in jobs:
+		stem = _frameStem(job)
+		indices.setdefault(stem, []).append(job['index'])
+		resolutions[stem] = job['resolution']
+	for stem, stem_indices in indices.items():
+		res = resolutions[stem]
+		path = output_dir.joinpath(f'{stem}.npy')
+		logger.info("Creating %s frame array %s", len(stem_indices), path)
+		np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(len(stem_indices), res[1], res[0], 3)).flush()
+		np.save(output_dir.joinpath(f'{stem}_indices.npy'), np.asarray(stem_indices))
+
+def _renderFrame(task:tuple[dict[str, Any], pathlib.Path, str, dict[str, Any]]) -> pathlib.Path:
+	job, output_dir, output_format, raycast_options = task
+	if _raycast_src is None:
+		logger.error("Raycast data has not been loaded for render worker")
+		raise RuntimeError("Raycast data has not been loaded for render worker")
+	resolution = job['resolution']
+	rays_sf = ray_tables.getPixelRays(pinhole, resolution, job['fov'])
+	pix_per_rad = pinhole.calcPixelAngularSize(resolution, job['fov'])
+	img_data, _ = _raycast_src.rayCastFromSensor(resolution,
+												pix_per_rad,
+												job['transform'],
+												rays_sf,
+												job['datetime'],
+												job['sun_eci'],
+												job['moon_eci'],
+												**raycast_options)
+	img = np.clip(img_data, 0, 255).astype(np.uint8).reshape(resolution[1], resolution[0], 3)
+
+	stem = _frameStem(job)
+	if output_format == 'png':
+		path = output_dir.joinpath(f"{stem}_{job['index']:06d}.png")
+		Image.fromarray(img).save(path)
+	elif output_format == 'npy':
+		path = output_dir.joinpath(f"{stem}_{job['index']:06d}.npy")
+		np.save(path, img)
+	else:
+		path = output_dir.joinpath(f'{stem}.npy')
+		if stem not in _memmaps:
+			_memmaps[stem] = np.load(path, mmap_mode='r+')
+		_memmaps[stem][job['frame_num']] = img
+		_memmaps[stem].flush()
+	return path
@@ -1,12 +1,14 @@
 from dataclasses import dataclass
 import datetime as dt
-from enum import Enum
+from enum import Enum, IntEnum
 import json
 import logging
 import pathlib
 
 from typing import Any
 
+import numpy as np
+
 import orbviz.visualiser.interface.console as console
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,17 @@ class DataType(Enum):
 	PLANETARYRAYCAST = 4
 	SPHEREIMAGE = 5
 
+class MouseOverType(IntEnum):
+	DUMMY = -1
+	GEODETIC = 0
+	CELESTIAL = 1
+	SUN = 2
+	MOON = 3
+
+# per pixel mouse over data: type of label, and up to two values describing the point under the pixel
+# geodetic: (lat, lon) [deg], celestial: (ra [hrs], dec [deg])
+MOUSE_OVER_DTYPE = np.dtype([('type', np.int8), ('val1', np.float32), ('val2', np.float32)])
+
 class SensorTypes(Enum):
 	CONE = 'cone'
 	FPA = 'square_pyramid'
@@ -2,6 +2,7 @@ import datetime as dt
 import logging
 import warnings
 
+import types
 from typing import Any
 
 import numpy as np
@@ -10,12 +11,18 @@ import orbviz
 from orbviz.model.data_models.base_models import BaseDataModel
 import orbviz.model.data_models.data_types as data_types
 import orbviz.model.data_models.sphere_img_data as sphere_img_data
+import orbviz.model.lens_models.pinhole as pinhole
 import orbviz.util.constants as orbviz_const
 import orbviz.util.conversion as orbviz_conversion
 import orbviz.util.threading as threading
 
 logger = logging.getLogger(__name__)
 
+# disc stamps are cached for radii rounded to this step [px]
+DISC_STAMP_RADIUS_STEP = 0.25
+# maximum number of cached disc stamps
+MAX_DISC_STAMPS = 64
+
 class EarthRayCastData(BaseDataModel):
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
@@ -26,6 +33,8 @@ class EarthRayCastData(BaseDataModel):
 		self.lookups: dict[int,dict[str,tuple[float,float]|str|bool]] = {}
 		self.data: dict[int, sphere_img_data.SphereImageData] = {}
 		self._worker_threads: dict[str, threading.Worker | None] = {}
+		# pixel offsets within a celestial body's disc, keyed by disc radius in DISC_STAMP_RADIUS_STEPs
+		self._disc_stamps: dict[int, tuple[np.ndarray, np.ndarray]] = {}
 
 		self.process()
 
@@ -107,23 +116,76 @@ class EarthRayCastData(BaseDataModel):
 								atm_lit_colour:tuple[int,int,int]=(168, 231, 255), atm_eclipsed_colour:tuple[int,int,int]=(23, 32, 35),
 								draw_sun:bool=True, sun_colour:tuple[int,int,int]=(255, 0, 0),
 								draw_moon:bool=True, moon_colour:tuple[int,int,int]=(0, 255, 0),
-								highlight_edge:bool=False, highlight_height:int=10, highlight_colour:tuple[int,int,int]=(255,0,0)) -> tuple[np.ndarray, np.ndarray]:
+								highlight_edge:bool=False, highlight_height:int=10, highlight_colour:tuple[int,int,int]=(255,0,0),
+								pixel_idxs:np.ndarray|None=None,
+								lens_model:types.ModuleType=pinhole) -> tuple[np.ndarray, np.ndarray]:
 		'''[summary]
 
 		[description]
 
 		Args:
 			sens_eci_transform (np.ndarray[4,4]): [description]
-			sens_rays_cf (np.ndarray[n,4]): [description]
+			sens_rays_cf (np.ndarray[n,>=3]): unit rays in sensor frame
 			curr_dt (dt.datetime): [description]
+			pixel_idxs (np.ndarray[n]|None): flattened index within resolution of each ray in sens_rays_cf,
+				used when only a subset of the sensor pixels is raycast. None if sens_rays_cf covers every pixel.
+			lens_model (types.ModuleType): lens model the rays were generated by
 
 		Returns:
-			[type]: [description]
+			np.ndarray[n,3]: float32 pixel colours
+			np.ndarray[n]: mouse over data for each pixel, of dtype data_types.MOUSE_OVER_DTYPE
 		'''
-		num_rays = len(sens_rays_cf)
+		sensor = {'resolution':resolution,
+					'pixels_per_radian':pixels_per_radian,
+					'sens_eci_transform':sens_eci_transform,
+					'sens_rays_cf':sens_rays_cf,
+					'pixel_idxs':pixel_idxs,
+					'lens_model':lens_model}
+		return self.rayCastFromSensors([sensor], curr_dt, sun_eci, moon_eci,
+										draw_eclipse=draw_eclipse,
+										draw_atm=draw_atm, atm_height=atm_height,
+										atm_lit_colour=atm_lit_colour, atm_eclipsed_colour=atm_eclipsed_colour,
+										draw_sun=draw_sun, sun_colour=sun_colour,
+										draw_moon=draw_moon, moon_colour=moon_colour,
+										highlight_edge=highlight_edge, highlight_height=highlight_height,
+										highlight_colour=highlight_colour)[0]
+
+	def rayCastFromSensors(self, sensors:list[dict[str, Any]],
+								curr_dt:dt.datetime, sun_eci:np.ndarray, moon_eci:np.ndarray,
+								draw_eclipse:bool=True,
+								draw_atm:bool=False, atm_height:int=150,
+								atm_lit_colour:tuple[int,int,int]=(168, 231, 255), atm_eclipsed_colour:tuple[int,int,int]=(23, 32, 35),
+								draw_sun:bool=True, sun_colour:tuple[int,int,int]=(255, 0, 0),
+								draw_moon:bool=True, moon_colour:tuple[int,int,int]=(0, 255, 0),
+								highlight_edge:bool=False, highlight_height:int=10,
+								highlight_colour:tuple[int,int,int]=(255,0,0)) -> list[tuple[np.ndarray, np.ndarray]]:
+		'''Raycast several sensors sharing a position (i.e. on the same spacecraft) in a single pass.
+
+		The rays of all sensors are concatenated, so the frame conversions and surface intersections
+		are computed once for the timestep, then the results are split back per sensor.
+
+		Args:
+			sensors (list[dict[str, Any]]): for each sensor:
+				'resolution' (tuple[int,int]),
+				'pixels_per_radian' (tuple[float,float]),
+				'sens_eci_transform' (np.ndarray[4,4]): sensor to eci transform,
+				'sens_rays_cf' (np.ndarray[n,>=3]): unit rays in sensor frame,
+				'pixel_idxs' (np.ndarray[n]|None, optional): as for rayCastFromSensor
+				'lens_model' (types.ModuleType, optional): as for rayCastFromSensor, pinhole if not given
+			curr_dt (dt.datetime): [description]
+
+		Returns:
+			list[tuple[np.ndarray, np.ndarray]]: pixel colours and mouse over data of each sensor, as for rayCastFromSensor
+		'''
+		pos_eci = sensors[0]['sens_eci_transform'][:3,3]
+		for sensor in sensors[1:]:
+			if not np.allclose(sensor['sens_eci_transform'][:3,3], pos_eci):
+				logger.error("Sensors raycast together must share a position")
+				raise ValueError("Sensors raycast together must share a position")
 		# convert sensor frame to eci
-		sens_rays_eci = sens_eci_transform[:3,:3].dot(sens_rays_cf[:,:3].T).T
-		pos_eci = sens_eci_transform[:3,3]
+		sens_rays_eci = np.vstack([sensor['sens_eci_transform'][:3,:3].dot(sensor['sens_rays_cf'][:,:3].T).T for sensor in sensors])
+		num_rays = len(sens_rays_eci)
+		split_idxs = np.cumsum([len(sensor['sens_rays_cf']) for sensor in sensors])[:-1]
 
 		# convert eci frame to ecef
 		sens_rays_ecf = orbviz_conversion.eci2ecef(sens_rays_eci, curr_dt, high_precision=orbviz.high_precision)
@@ -145,47 +207,26 @@ class EarthRayCastData(BaseDataModel):
 		data = self.getPixelDataOnSphere(lats, lons, surface_sunlit_mask)
 
 		full_img = np.zeros((num_rays, 3))
-		mo_data = np.empty((num_rays,3), dtype=object)
+		mo_data = np.empty(num_rays, dtype=data_types.MOUSE_OVER_DTYPE)
 		mo_data[~earth_intsct] = self.encodeCelestialStringArrays(sens_rays_eci[~earth_intsct])
 		mo_data[earth_intsct] = self.encodeGeodeticStringArrays(lats[earth_intsct],lons[earth_intsct])
 
+		bodies = []
 		if draw_sun:
-			sun_ang_r = np.deg2rad(0.25)
-			# assume pixels are square
-			sun_ang_px = sun_ang_r * pixels_per_radian[0]
-			rel_sun_eci = sun_eci - pos_eci
-			unit_rel_sun_eci = rel_sun_eci/ np.linalg.norm(rel_sun_eci)
-			dp = np.sum(sens_rays_eci*unit_rel_sun_eci, axis=1)
-
-			if np.isclose(np.max(dp),1, atol=1/pixels_per_radian[0]):
-				centre_idx = np.argmax(dp)
-				full_img[centre_idx] = (255,0,0)
-				y, x = np.unravel_index(centre_idx, (resolution[1],resolution[0]))
-				colnums, rownums = np.meshgrid(range(resolution[0]), range(resolution[1]))
-				dist = np.sqrt((colnums - x)**2 + (rownums - y)**2).flatten()
-				dist_mask = dist < sun_ang_px
-				full_img[dist_mask] = sun_colour
-				mo_data[dist_mask,1] = 'Sun'
-				mo_data[dist_mask,0] = 2
-
+			bodies.append((sun_eci, sun_colour, data_types.MouseOverType.SUN))
 		if draw_moon:
-			moon_ang_r = np.deg2rad(0.25)
-			# assume pixels are square
-			moon_ang_px = moon_ang_r * pixels_per_radian[0]
-			rel_moon_eci = moon_eci - pos_eci
-			unit_rel_moon_eci = rel_moon_eci/ np.linalg.norm(rel_moon_eci)
-			dp = np.sum(sens_rays_eci*unit_rel_moon_eci, axis=1)
-			if np.isclose(np.max(dp),1, atol=1/pixels_per_radian[0]):
-				centre_idx = np.argmax(dp)
-				full_img[centre_idx] = (255,0,0)
-				y, x = np.unravel_index(centre_idx, (resolution[1],resolution[0]))
-				colnums, rownums = np.meshgrid(range(resolution[0]), range(resolution[1]))
-				dist = np.sqrt((colnums - x)**2 + (rownums - y)**2).flatten()
-				dist_mask = dist < moon_ang_px
-				full_img[dist_mask] = moon_colour
-				mo_data[dist_mask,1] = 'Moon'
-				mo_data[dist_mask,0] = 2
-
+			bodies.append((moon_eci, moon_colour, data_types.MouseOverType.MOON))
+		# views of each sensor's rays within the concatenated arrays
+		sensor_imgs = np.split(full_img, split_idxs)
+		sensor_mo_types = np.split(mo_data['type'], split_idxs)
+		for sensor, sensor_img, sensor_mo_type in zip(sensors, sensor_imgs, sensor_mo_types, strict=True):
+			for body_eci, body_colour, body_mo_type in bodies:
+				dist_mask = self._calcBodyDiscMask(sensor['resolution'], sensor['pixels_per_radian'],
+													sensor['sens_eci_transform'], body_eci, sensor.get('pixel_idxs'),
+													lens_model=sensor.get('lens_model', pinhole))
+				if dist_mask is not None:
+					sensor_img[dist_mask] = body_colour
+					sensor_mo_type[dist_mask] = body_mo_type
 
 		# populate img array
 		full_img[earth_intsct] = data[earth_intsct]
@@ -254,29 +295,150 @@ class EarthRayCastData(BaseDataModel):
 			hl_intsct[~all_intsct] = hl_valid
 			full_img[hl_intsct] = highlight_colour
 
-		return full_img.astype(np.float32), mo_data
+		return list(zip(np.split(full_img.astype(np.float32), split_idxs), np.split(mo_data, split_idxs), strict=True))
+
+	def reprojectSensorFrame(self, resolution:tuple[int,int],
+								pixels_per_radian:tuple[float,float],
+								sens_eci_transform:np.ndarray,
+								curr_dt:dt.datetime, sun_eci:np.ndarray,
+								prev_frame:dict[str, Any],
+								draw_eclipse:bool=True,
+								max_error_px:float=0.5,
+								lens_model:types.ModuleType=pinhole) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+		'''Reuse the Earth surface pixels of a previous frame of a sensor in a new frame.
+
+		The geolocated pixels of the previous frame are placed back on the Earth's surface, projected into
+		the new sensor pose, and kept where they land within max_error_px of a pixel centre and are still
+		visible from the sensor. Pixels which are not filled (disoccluded surface, space, sun/moon discs, or
+		surface whose lighting changed) must be raycast to complete the frame.
+		Reused pixels keep any atmosphere blending of the previous frame.
+
+		Args:
+			resolution (tuple[int,int]): sensor resolution of the new frame
+			pixels_per_radian (tuple[float,float]): angular size of a pixel of the new frame
+			sens_eci_transform (np.ndarray[4,4]): sensor frame to eci transform of the new frame
+			curr_dt (dt.datetime): datetime of the new frame
+			sun_eci (np.ndarray[3]): eci position of the sun at the new frame
+			prev_frame (dict[str, Any]): previous frame of the sensor;
+				'img' (np.ndarray[n,3]) pixel colours,
+				'mo_data' (np.ndarray[n]) mouse over data,
+				'datetime' (dt.datetime),
+				'sun_eci' (np.ndarray[3])
+			draw_eclipse (bool): whether the frames are drawn with solar lighting
+			max_error_px (float): maximum distance of a reprojected pixel from the centre of the pixel it fills [px]
+			lens_model (types.ModuleType): lens model of the sensor
+
+		Returns:
+			np.ndarray[n,3]: float32 pixel colours of the new frame, zero where not filled
+			np.ndarray[n]: mouse over data of the new frame, DUMMY type where not filled
+			np.ndarray[m]: flattened indices of the pixels which were not filled
+		'''
+		num_pixels = resolution[0]*resolution[1]
+		img = np.zeros((num_pixels, 3), dtype=np.float32)
+		mo_data = np.zeros(num_pixels, dtype=data_types.MOUSE_OVER_DTYPE)
+		mo_data['type'] = data_types.MouseOverType.DUMMY
+
+		prev_mo_data = prev_frame['mo_data']
+		prev_idxs = np.flatnonzero(prev_mo_data['type'] == data_types.MouseOverType.GEODETIC)
+		cart = self._convertEllipsoidGeodeticToCartesian(prev_mo_data['val1'][prev_idxs].astype(np.float64),
+															prev_mo_data['val2'][prev_idxs].astype(np.float64))
 
-	def rayCastFromSensorFor2D(self, resolution:tuple[int,int],
-								sens_eci_transform:np.ndarray, sens_rays_cf:np.ndarray,
-								curr_dt:dt.datetime) -> tuple[np.ndarray, np.ndarray]:
-		num_rays = len(sens_rays_cf)
-		# convert sensor frame to eci
-		sens_rays_eci = sens_eci_transform[:3,:3].dot(sens_rays_cf[:,:3].T).T
 		pos_eci = sens_eci_transform[:3,3]
+		pos_ecf = orbviz_conversion.eci2ecef(pos_eci.reshape(1,3), curr_dt, high_precision=orbviz.high_precision)[0]
+		# sensor axes in ecef, eci to ecef is a rotation so can be applied to the axes directly
+		sens_axes_ecf = orbviz_conversion.eci2ecef(sens_eci_transform[:3,:3].T, curr_dt, high_precision=orbviz.high_precision)
+
+		# surface points facing the sensor, using the ellipsoid normal
+		normals = cart/np.array([6378137.0**2, 6378137.0**2, 6356752.314245**2])
+		los = cart - pos_ecf*1000
+		visible = np.einsum('ij,ij->i', normals, los) < 0
+		if draw_eclipse:
+			# equivalent to _calcSunlitSurfaceMask, for both suns at once
+			prev_sun_ecf = orbviz_conversion.eci2ecef(prev_frame['sun_eci'].reshape(1,3), prev_frame['datetime'],
+														high_precision=orbviz.high_precision)[0]
+			sun_ecf = orbviz_conversion.eci2ecef(sun_eci.reshape(1,3), curr_dt, high_precision=orbviz.high_precision)[0]
+			sq_radius = np.einsum('ij,ij->i', cart, cart).reshape(-1,1)
+			sunlit = cart.dot(np.column_stack((prev_sun_ecf, sun_ecf))*1000) > sq_radius
+			visible &= sunlit[:,0] == sunlit[:,1]
+
+		# position of surface points within sensor frame, nan behind the sensor
+		los_cf = los.dot(sens_axes_ecf.T)
+		x, y = lens_model.projectToPixel(los_cf, resolution, _calcFov(resolution, pixels_per_radian))
+		visible &= np.isfinite(x)
+		px = np.round(x)
+		py = np.round(y)
+		valid = visible & ((x-px)**2 + (y-py)**2 <= max_error_px**2) \
+					& (px >= 0) & (px < resolution[0]) & (py >= 0) & (py < resolution[1])
+
+		new_idxs = np.ravel_multi_index((py[valid].astype(int), px[valid].astype(int)), (resolution[1], resolution[0]))
+		# where several previous pixels land on the same pixel, any of them is within max_error_px
+		src_idxs = np.full(num_pixels, -1)
+		src_idxs[new_idxs] = prev_idxs[valid]
+		filled = src_idxs >= 0
+		img[filled] = prev_frame['img'][src_idxs[filled]]
+		mo_data[filled] = prev_mo_data[src_idxs[filled]]
+		return img, mo_data, np.flatnonzero(~filled)
+
+	def rayCastFootprintFor2D(self, resolution:tuple[int,int], pixels_per_radian:tuple[float,float],
+								sens_eci_transform:np.ndarray, perimeter_rays_cf:np.ndarray,
+								curr_dt:dt.datetime, lens_model:types.ModuleType=pinhole) -> tuple[np.ndarray, np.ndarray]:
+		'''Find the outline of a sensor's footprint on the Earth's surface from the rays around its perimeter.
+
+		Perimeter rays which miss the Earth are clipped to the limb, by replacing them with the ray tangent to
+		the Earth in the plane of the ray and nadir, so the outline follows the horizon where the sensor sees past it.
 
-		# convert eci frame to ecef
-		sens_rays_ecf = orbviz_conversion.eci2ecef(sens_rays_eci, curr_dt, high_precision=orbviz.high_precision)
-		# np.save(f"sens_rays_ecf_{state}_{curr_dt}.npy",sens_rays_ecf)
-		pos_ecf = orbviz_conversion.eci2ecef(pos_eci, curr_dt, high_precision=orbviz.high_precision)
-		# check intersection of rays with earth
-		cart_earth_intsct, earth_intsct = self._lineOfSightToSurface(pos_ecf, sens_rays_ecf)
+		Args:
+			resolution (tuple[int,int]): sensor resolution
+			pixels_per_radian (tuple[float,float]): angular size of a pixel
+			sens_eci_transform (np.ndarray[4,4]): sensor frame to eci transform
+			perimeter_rays_cf (np.ndarray[n,>=3]): rays around the frame, in order, i.e. from pinhole.generatePerimeterRays
+			curr_dt (dt.datetime): datetime of the footprint
+			lens_model (types.ModuleType): lens model of the sensor
 
-		# earth_intsct.shape = (num_rays,)
-		lats = np.zeros(num_rays)
-		lons = np.zeros(num_rays)
-		lats[earth_intsct], lons[earth_intsct] = self._convertCartesianToEllipsoidGeodetic(cart_earth_intsct[earth_intsct,:])
-		# np.save(f"lats_lons_{state}_{curr_dt}.npy",np.column_stack((lats,lons)))
-		return lats[earth_intsct], lons[earth_intsct]
+		Returns:
+			np.ndarray[m]: latitude of each outline vertex [deg], empty if the Earth is not in view
+			np.ndarray[m]: longitude of each outline vertex [deg]
+		'''
+		rays_eci = sens_eci_transform[:3,:3].dot(perimeter_rays_cf[:,:3].T).T
+		pos_eci = sens_eci_transform[:3,3]
+		rays_ecf = orbviz_conversion.eci2ecef(rays_eci, curr_dt, high_precision=orbviz.high_precision)
+		pos_ecf = orbviz_conversion.eci2ecef(pos_eci.reshape(1,3), curr_dt, high_precision=orbviz.high_precision)[0]
+		cart_earth_intsct, earth_intsct = self._lineOfSightToSurface(pos_ecf, rays_ecf)
+
+		if not np.all(earth_intsct):
+			if not np.any(earth_intsct):
+				# either the Earth is entirely within the frame, or not in view at all
+				nadir_cf = sens_eci_transform[:3,:3].T.dot(-pos_eci)
+				x, y = lens_model.projectToPixel(nadir_cf, resolution, _calcFov(resolution, pixels_per_radian))
+				# nan, so out of frame, if nadir is behind the sensor
+				if not (0 <= x[0] < resolution[0] and 0 <= y[0] < resolution[1]):
+					return np.empty(0), np.empty(0)
+			dist = np.linalg.norm(pos_ecf)
+			nadir = -pos_ecf/dist
+			missed_idxs = np.flatnonzero(~earth_intsct)
+			missed_rays = rays_ecf[missed_idxs]
+			perp = missed_rays - np.sum(missed_rays*nadir, axis=1).reshape(-1,1)*nadir
+			perp_norm = np.linalg.norm(perp, axis=1)
+			valid = perp_norm > 1e-9
+			perp[valid] /= perp_norm[valid].reshape(-1,1)
+			# limb lies between the tangents to spheres of the polar and equatorial radii, bisect for the last ray to hit
+			hit_ang = np.full(len(missed_idxs), np.arcsin(min(6356.752314245/dist, 1)))
+			miss_ang = np.full(len(missed_idxs), np.arcsin(min(6378.137/dist, 1)))
+			cart_limb_intsct, limb_intsct = self._lineOfSightToSurface(pos_ecf, self._limbRays(nadir, perp, hit_ang))
+			# ~1e-4 deg from low orbit
+			for _ in range(12):
+				mid_ang = (hit_ang + miss_ang)/2
+				mid_intsct, mid_hit = self._lineOfSightToSurface(pos_ecf, self._limbRays(nadir, perp, mid_ang))
+				hit_ang[mid_hit] = mid_ang[mid_hit]
+				miss_ang[~mid_hit] = mid_ang[~mid_hit]
+				cart_limb_intsct[mid_hit] = mid_intsct[mid_hit]
+			cart_earth_intsct[missed_idxs] = cart_limb_intsct
+			earth_intsct[missed_idxs] = limb_intsct & valid
+
+		return self._convertCartesianToEllipsoidGeodetic(cart_earth_intsct[earth_intsct])
+
+	def _limbRays(self, nadir:np.ndarray, perp:np.ndarray, nadir_ang:np.ndarray) -> np.ndarray:
+		return np.cos(nadir_ang).reshape(-1,1)*nadir + np.sin(nadir_ang).reshape(-1,1)*perp
 
 	def _convertCartesianToEllipsoidGeodetic(self, cart:np.ndarray, iters:int=3, wrap_lon:bool=True) -> tuple[np.ndarray, np.ndarray]:
 		'''
@@ -315,6 +477,96 @@ class EarthRayCastData(BaseDataModel):
 		lat = np.degrees(lat)
 		return lat, lon
 
+	def _convertEllipsoidGeodeticToCartesian(self, lat:np.ndarray, lon:np.ndarray) -> np.ndarray:
+		'''
+		Compute the ECEF position on the WGS-84 geoid of latitudes and longitudes from _convertCartesianToEllipsoidGeodetic
+
+		Parameters:
+			lat (ndarray(dtype=float, ndim = N)): latitudes [deg]
+			lon (ndarray(dtype=float, ndim = N)): longitudes [deg]
+
+		Returns:
+			ndarray(dtype=float, ndim=[N,3]): ECEF cartesian vectors [m], within tens of metres of the original points
+		'''
+		lat = np.radians(lat)
+		lon = np.radians(lon)
+		# _convertCartesianToEllipsoidGeodetic is close to geocentric latitude, so scale the radial direction onto the geoid
+		unit_cart = np.column_stack((np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)))
+		r = 1/np.sqrt((unit_cart[:,0]**2 + unit_cart[:,1]**2)/6378137.0**2 + unit_cart[:,2]**2/6356752.314245**2)
+		return unit_cart * r.reshape(-1,1)
+
+	def _calcBodyDiscMask(self, resolution:tuple[int,int], pixels_per_radian:tuple[float,float],
+								sens_eci_transform:np.ndarray, body_eci:np.ndarray,
+								pixel_idxs:np.ndarray|None=None,
+								disc_ang_radius:float=np.deg2rad(0.25),
+								lens_model:types.ModuleType=pinhole) -> np.ndarray|None:
+		'''Find the pixels covered by the disc of a celestial body.
+
+		The pixel under the centre of the body is found by projecting the body's direction into the sensor
+		with the lens model, the disc is then a precomputed stamp of pixel offsets around that pixel.
+
+		Args:
+			resolution (tuple[int,int]): sensor resolution
+			pixels_per_radian (tuple[float,float]): angular size of a pixel
+			sens_eci_transform (np.ndarray[4,4]): sensor frame to eci transform
+			body_eci (np.ndarray[3]): eci position of the body
+			pixel_idxs (np.ndarray[n]|None): flattened index of each raycast pixel, None if all pixels are raycast
+			disc_ang_radius (float): angular radius of the body's disc [rad]
+			lens_model (types.ModuleType): lens model of the sensor
+
+		Returns:
+			np.ndarray|None: flattened indices into the raycast pixels, or boolean mask if pixel_idxs is given,
+				of the pixels covered by the disc. None if the disc is not in view.
+		'''
+		pos_eci = sens_eci_transform[:3,3]
+		rot_mat = sens_eci_transform[:3,:3]
+		rel_body_eci = body_eci - pos_eci
+		unit_rel_body_eci = rel_body_eci/np.linalg.norm(rel_body_eci)
+
+		# cheap rejection of bodies outside the field of view, using the angle to the corner of the frame
+		half_fov = (resolution[0]/2/pixels_per_radian[0], resolution[1]/2/pixels_per_radian[1])
+		if max(half_fov) < np.pi/2:
+			half_diag = np.arctan(np.hypot(np.tan(half_fov[0]), np.tan(half_fov[1])))
+			if np.dot(rot_mat[:,2], unit_rel_body_eci) < np.cos(min(half_diag + disc_ang_radius, np.pi)):
+				return None
+
+		# position of body within sensor frame
+		body_cf = rot_mat.T.dot(unit_rel_body_eci)
+		x, y = lens_model.projectToPixel(body_cf, resolution, _calcFov(resolution, pixels_per_radian))
+		if not np.isfinite(x[0]):
+			return None
+		x = int(np.round(x[0]))
+		y = int(np.round(y[0]))
+
+		# assume pixels are square
+		disc_ang_px = disc_ang_radius * pixels_per_radian[0]
+		stamp_x, stamp_y = self._getDiscStamp(disc_ang_px)
+		disc_x = stamp_x + x
+		disc_y = stamp_y + y
+		in_frame = (disc_x >= 0) & (disc_x < resolution[0]) & (disc_y >= 0) & (disc_y < resolution[1])
+		if not np.any(in_frame):
+			return None
+		disc_idxs = np.ravel_multi_index((disc_y[in_frame], disc_x[in_frame]), (resolution[1], resolution[0]))
+		if pixel_idxs is not None:
+			return np.isin(pixel_idxs, disc_idxs)
+		return disc_idxs
+
+	def _getDiscStamp(self, radius_px:float) -> tuple[np.ndarray, np.ndarray]:
+		key = int(np.round(radius_px/DISC_STAMP_RADIUS_STEP))
+		if key not in self._disc_stamps:
+			if len(self._disc_stamps) >= MAX_DISC_STAMPS:
+				# drop the oldest stamp
+				del self._disc_stamps[next(iter(self._disc_stamps))]
+			radius_px = key * DISC_STAMP_RADIUS_STEP
+			extent = int(np.ceil(radius_px))
+			offsets = np.arange(-extent, extent+1)
+			x_offsets, y_offsets = np.meshgrid(offsets, offsets)
+			in_disc = np.sqrt(x_offsets**2 + y_offsets**2) < radius_px
+			# always include the centre pixel, so bodies are visible at low resolution
+			in_disc[extent, extent] = True
+			self._disc_stamps[key] = (x_offsets[in_disc], y_offsets[in_disc])
+		return self._disc_stamps[key]
+
 	def _lineOfSightToSurface(self, position, rays, atm_height=0):
 		"""
 		Find the intersection of rays from position with the WGS-84 geoid, position and rays in ECEF
@@ -371,17 +623,17 @@ class EarthRayCastData(BaseDataModel):
 
 	def encodeCelestialStringArrays(self, rays_eci:np.ndarray) -> np.ndarray:
 		num_entries = len(rays_eci)
-		out_arr = np.zeros((num_entries,3))
-		out_arr[:,0] = 1
-		out_arr[:,1], out_arr[:,2] = orbviz_conversion.eci2radec(rays_eci)
+		out_arr = np.empty(num_entries, dtype=data_types.MOUSE_OVER_DTYPE)
+		out_arr['type'] = data_types.MouseOverType.CELESTIAL
+		out_arr['val1'], out_arr['val2'] = orbviz_conversion.eci2radec(rays_eci)
 		return out_arr
 
 	def encodeGeodeticStringArrays(self, lat_arr:np.ndarray, lon_arr:np.ndarray) -> np.ndarray:
 		num_entries = len(lat_arr)
-		out_arr = np.empty((num_entries,3))
-		out_arr[:,0] = 0
-		out_arr[:,1] = lat_arr
-		out_arr[:,2] = lon_arr
+		out_arr = np.empty(num_entries, dtype=data_types.MOUSE_OVER_DTYPE)
+		out_arr['type'] = data_types.MouseOverType.GEODETIC
+		out_arr['val1'] = lat_arr
+		out_arr['val2'] = lon_arr
 		return out_arr
 
 	def prepSerialisation(self) -> dict[str, Any]:
@@ -421,4 +673,9 @@ class EarthRayCastData(BaseDataModel):
 		for y,x in new_idxs:
 			if x>=0 and x<shape[1] and y>=0 and y<shape[0]:
 				filtered_idxs.append((y,x))
-		return filtered_idxs
\ No newline at end of file
+		return filtered_idxs
+
+
+def _calcFov(resolution:tuple[int,int], pixels_per_radian:tuple[float,float]) -> tuple[float,float]:
+	'''Field of view of a sensor [deg], from its angular pixel size.'''
+	return (np.rad2deg(resolution[0]/pixels_per_radian[0]), np.rad2deg(resolution[1]/pixels_per_radian[1]))
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+import orbviz.util.array_u as array_u
+
+SMALL_CIRCLE_NUM_LATS = 90
+
 
 def smallCircleRadius(center_lat: float, center_lon:float, radii_end_lat: float, radii_end_lon: float) -> float:
 	'''Calculates the great circle distance between center (lon,lat) and radii_end (lon,lat)
@@ -135,7 +139,7 @@ def genSmallCircleCenterSubtendedAngle(subtended_angle:float, center_lat:float,
 	'''
 	d = np.deg2rad(subtended_angle/2)
 	lat_max, lat_min = findSmallCircleLatRange(subtended_angle, center_lat)
-	nlats = 90
+	nlats = SMALL_CIRCLE_NUM_LATS
 	if center_lat < 0 :
 		lats = np.linspace(lat_min+0.1,lat_max-0.1,nlats)
 	else:
@@ -216,4 +220,163 @@ def splitSmallCirclePatch(center_lon, center_lat, lats, lons1, lons2):
 		if np.any(circle[:,0]<-180):
 			circle1[:,0] = (circle[:,0] + 360)
 
-	return circle1, circle2
\ No newline at end of file
+	return circle1, circle2
+
+def genSmallCirclePatches(subtended_angles:np.ndarray, center_lats:np.ndarray,
+							center_lons:np.ndarray) -> tuple[array_u.PackedRaggedArray, array_u.PackedRaggedArray, np.ndarray]:
+	'''Generate the map patches of many small circles on the surface of a sphere in one pass.
+
+		Batched equivalent of genSmallCircleCenterSubtendedAngle followed by splitSmallCirclePatch, element ii of
+		the outputs matches the scalar functions called with subtended_angles[ii], center_lats[ii], center_lons[ii].
+		Each patch has 2*SMALL_CIRCLE_NUM_LATS vertices, plus 4 if it is closed along the map edge.
+
+	Args:
+		subtended_angles (np.ndarray): angle each circle subtends at the center of the sphere [deg]
+		center_lats (np.ndarray): latitude of each center [deg]
+		center_lons (np.ndarray): longitude of each center [deg]
+
+	Returns:
+		[array_u.PackedRaggedArray, array_u.PackedRaggedArray, np.ndarray]: (lon, lat) vertices of the first and
+			second patch of each circle, and whether the patches of each circle differ
+	'''
+	subtended_angles = np.atleast_1d(subtended_angles).astype(float)
+	center_lats = np.atleast_1d(center_lats).astype(float)
+	center_lons = np.atleast_1d(center_lons).astype(float)
+	num_circles = len(center_lats)
+	nlats = SMALL_CIRCLE_NUM_LATS
+
+	# latitude range, reflected over the pole if the circle covers it
+	lat = np.deg2rad(center_lats)
+	radius = np.deg2rad(subtended_angles/2)
+	lat_min = np.rad2deg(np.where(lat - radius < -np.pi/2, -np.pi - (lat - radius), lat - radius))
+	lat_max = np.rad2deg(np.where(lat + radius > np.pi/2, np.pi - (lat + radius), lat + radius))
+	lats = np.linspace(lat_min+0.1, lat_max-0.1, nlats, axis=1)
+	lats = np.where((center_lats < 0).reshape(-1,1), lats, np.flip(lats, axis=1))
+	lons1, lons2 = getSmallCirclePoint(radius.reshape(-1,1), center_lats.reshape(-1,1), center_lons.reshape(-1,1), lats)
+
+	# which circles are closed along the map edge, and the longitude of the closing edge
+	end_diff1 = np.abs(lons1[:,0] - lons1[:,-1])
+	end_diff2 = np.abs(lons2[:,0] - lons2[:,-1])
+	within_map = np.all((lons1 > -180) & (lons1 < 180) & (lons2 > -180) & (lons2 < 180), axis=1)
+	# gaussian shape which isn't split by map edges
+	closed_within = ~(end_diff1 < 90) | ~(end_diff2 < 90)
+	side1_crossings = np.where(np.all(lons1 > 180, axis=1), 1, np.count_nonzero(np.diff(lons1 > 180, axis=1), axis=1))
+	side2_crossings = np.where(np.all(lons2 < -180, axis=1), 1, np.count_nonzero(np.diff(lons2 < -180, axis=1), axis=1))
+	end_diff_max = np.where(end_diff2 > end_diff1, end_diff2, end_diff1)
+	# saddle shapes which are joined
+	closed_across = (end_diff_max > 1) & ((side1_crossings == 1) | (side2_crossings == 1))
+	closed = np.where(within_map, closed_within, closed_across)
+	half_gap = (360 - np.abs(lons1[:,0] - lons2[:,0]))/2
+	edge_lon1 = np.where(within_map, 180, lons1[:,0] + half_gap)
+	edge_lon2 = np.where(within_map, -180, lons2[:,0] - half_gap)
+
+	# every circle is built with the closing vertices, which are dropped from those that aren't closed
+	hemisphere_boundary = np.sign(center_lats) * 90
+	side_lats = np.column_stack((hemisphere_boundary, lats[:,0], lats))
+	side1 = np.stack((np.column_stack((edge_lon1, edge_lon1, lons1)), side_lats), axis=2)
+	side2 = np.stack((np.column_stack((edge_lon2, edge_lon2, lons2)), side_lats), axis=2)
+	circles = np.concatenate((side1, np.flip(side2, axis=1)), axis=1)
+	keep = np.ones(circles.shape[:2], dtype=bool)
+	keep[~closed,:2] = False
+	keep[~closed,-2:] = False
+
+	num_verts = np.where(closed, 2*nlats+4, 2*nlats)
+	offsets = np.zeros(num_circles+1, dtype=np.int64)
+	offsets[1:] = np.cumsum(num_verts)
+	verts = circles[keep]
+
+	# circles extending past either map edge get a second patch shifted onto the other side of the map
+	edge_lons = np.column_stack((edge_lon1, edge_lon2))
+	over_right = np.any(lons1 > 180, axis=1) | np.any(lons2 > 180, axis=1) | (closed & np.any(edge_lons > 180, axis=1))
+	over_left = np.any(lons1 < -180, axis=1) | np.any(lons2 < -180, axis=1) | (closed & np.any(edge_lons < -180, axis=1))
+	verts1 = verts.copy()
+	verts2 = verts
+	verts1[:,0] += np.repeat(np.where(over_left, 360, 0), num_verts)
+	verts2[:,0] -= np.repeat(np.where(over_right, 360, 0), num_verts)
+	# nan vertices never compare equal, as for the scalar function
+	has_nan = np.any(np.isnan(lons1), axis=1) | np.any(np.isnan(lons2), axis=1) | np.any(np.isnan(lats), axis=1)
+	split = over_left | over_right | has_nan
+
+	return array_u.PackedRaggedArray(verts1, offsets), array_u.PackedRaggedArray(verts2, offsets), split
+
+def padSmallCirclePatches(patches:array_u.PackedRaggedArray) -> np.ndarray:
+	'''Give every small circle patch the same vertex layout.
+
+		Patches from genSmallCirclePatches which aren't closed along the map edge have their first and last
+		vertices repeated in place of the closing vertices. Every patch then has 2*SMALL_CIRCLE_NUM_LATS+4 vertices,
+		and vertices ii and -1-ii of each patch are the two ends of the same span of latitude.
+
+	Args:
+		patches (array_u.PackedRaggedArray): patches, as returned by genSmallCirclePatches
+
+	Returns:
+		np.ndarray: (lon, lat) vertices of each patch, with shape (n,2*SMALL_CIRCLE_NUM_LATS+4,2)
+	'''
+	num_open = 2*SMALL_CIRCLE_NUM_LATS
+	closed_template = np.arange(num_open+4)
+	open_template = np.hstack((0, 0, np.arange(num_open), num_open-1, num_open-1))
+	closed = (patches.lengths() == num_open+4).reshape(-1,1)
+	idxs = patches.offsets[:-1].reshape(-1,1) + np.where(closed, closed_template, open_template)
+	return patches.values[idxs]
+
+def splitLonLatPolygon(lats:np.ndarray, lons:np.ndarray) -> tuple[np.ndarray, np.ndarray, bool]:
+	'''Close a polygon on the sphere, given by its vertices in order, as a patch on an equirectangular map.
+
+		Longitudes are unwrapped so the polygon has no jumps at the antimeridian. A polygon which encircles
+		a pole is closed along the map edge at that pole. Where the unwrapped polygon extends past the
+		antimeridian, the second patch is a copy shifted by 360 degrees, covering the part on the other side of the map.
+
+	Args:
+		lats (np.ndarray): latitude of each vertex [deg]
+		lons (np.ndarray): longitude of each vertex [deg]
+
+	Returns:
+		[np.ndarray, np.ndarray, bool]: (lon, lat) vertices of each patch, whether the patches differ
+	'''
+	# unwrapping keeps the first vertex within the map
+	lons = np.rad2deg(np.unwrap(np.deg2rad(lons)))
+	lon_winding = lons[-1] - lons[0] + wrapToCircleRangeDegrees(lons[0] - lons[-1])
+	if abs(lon_winding) > 180:
+		# polygon encircles a pole, run along the map edge at that pole to close it
+		pole_lat = 90 * np.sign(np.mean(lats))
+		closing_lon = lons[0] + lon_winding
+		lons = np.hstack((lons, closing_lon, closing_lon, lons[0]))
+		lats = np.hstack((lats, lats[0], pole_lat, pole_lat))
+
+	patch1 = np.column_stack((lons, lats))
+	patch2 = patch1.copy()
+	if np.any(lons > 180):
+		patch2[:,0] -= 360
+	elif np.any(lons < -180):
+		patch2[:,0] += 360
+	return patch1, patch2, bool(np.any(patch1 != patch2))
+
+def calcTerminatorOutlines(solar_lats:np.ndarray, solar_lons:np.ndarray) -> np.ndarray:
+	'''Outline of the night side of the earth on an equirectangular map, for each position of the sun.
+
+		The outline follows the terminator at every degree of longitude, then is closed along the map edge
+		at the pole in darkness. All outlines are calculated together, so a whole timespan costs a single pass.
+
+	Args:
+		solar_lats (np.ndarray): latitude of each subsolar point [deg]
+		solar_lons (np.ndarray): longitude of each subsolar point [deg]
+
+	Returns:
+		np.ndarray: (lon, lat) vertices of each outline, with shape (n,364,2)
+	'''
+	solar_lats = np.atleast_1d(solar_lats)
+	solar_lons = np.atleast_1d(solar_lons)
+	lons = np.arange(-180,181,1)
+	ha = np.deg2rad(lons).reshape(1,-1) - np.deg2rad(solar_lons).reshape(-1,1)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		terminator_lats = np.rad2deg(np.arctan(-np.cos(ha)/np.tan(np.deg2rad(solar_lats)).reshape(-1,1)))
+
+	dark_pole_lats = np.where(solar_lats < 0, 90, -90)
+	outlines = np.empty((len(solar_lats),len(lons)+3,2))
+	outlines[:,0,0] = -180
+	outlines[:,1:-2,0] = lons
+	outlines[:,-2,0] = 180
+	outlines[:,-1,0] = -180
+	outlines[:,1:-2,1] = terminator_lats
+	outlines[:,[0,-2,-1],1] = dark_pole_lats.reshape(-1,1)
+	return outlines
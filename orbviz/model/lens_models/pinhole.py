@@ -5,16 +5,19 @@ import numpy as np
 import orbviz.model.geometry.primgeom as primgeom
 
 
-def generatePixelRays(pixels:tuple[int,int], fov:tuple[float,float]) -> np.ndarray:
+def generatePixelRays(pixels:tuple[int,int], fov:tuple[float,float], pixel_idxs:np.ndarray|None=None) -> np.ndarray:
 	res_arr = np.asarray(pixels, dtype=int)
 	# print(f'{res_arr=}')
 	fov_arr = np.deg2rad(np.asarray(fov))
 	frame_centre = res_arr/2
 	w,h = frame_centre
-	x,y = np.meshgrid(range(res_arr[0]), range(res_arr[1]))
-
-	x = x.ravel()
-	y = y.ravel()
+	if pixel_idxs is None:
+		x,y = np.meshgrid(range(res_arr[0]), range(res_arr[1]))
+		x = x.ravel()
+		y = y.ravel()
+	else:
+		# only generate rays for a subset of the (flattened) pixel grid
+		y,x = np.divmod(np.asarray(pixel_idxs), res_arr[0])
 	num_rays = len(x)
 	pixelCoords = np.vstack([x,y]).T
 	offsets = frame_centre - pixelCoords
@@ -30,16 +33,68 @@ def generatePixelRays(pixels:tuple[int,int], fov:tuple[float,float]) -> np.ndarr
 	unit_rays_cf = np.hstack((unit_rays_cf,np.ones((unit_rays_cf.shape[0],1))))
 	return unit_rays_cf
 
+def projectToPixel(rays_cf:np.ndarray, pixels:tuple[int,int], fov:tuple[float,float]) -> tuple[np.ndarray, np.ndarray]:
+	'''Find where rays in the camera frame fall within the frame, the inverse of generatePixelRays.
+
+	Args:
+		rays_cf (np.ndarray[n,>=3]): rays in camera frame, need not be unit length
+		pixels (tuple[int,int]): resolution of the frame
+		fov (tuple[float,float]): field of view [deg]
+
+	Returns:
+		np.ndarray[n]: x coordinate of each ray, pixel x of generatePixelRays is at x, nan if behind the camera
+		np.ndarray[n]: y coordinate of each ray, nan if behind the camera
+	'''
+	rays_cf = np.atleast_2d(rays_cf)
+	w, h = np.asarray(pixels, dtype=float)/2
+	fov_arr = np.deg2rad(np.asarray(fov))
+	in_front = rays_cf[:,2] > 0
+	z = np.where(in_front, rays_cf[:,2], 1)
+	x = w + np.arctan(-rays_cf[:,0]/z) * w/(fov_arr[0]/2)
+	y = h - np.arctan(rays_cf[:,1]/z) * h/(fov_arr[1]/2)
+	x[~in_front] = np.nan
+	y[~in_front] = np.nan
+	return x, y
+
+def calcNestedPixelIdxs(coarse_pixels:tuple[int,int], fine_pixels:tuple[int,int]) -> np.ndarray|None:
+	'''Find the pixels of a finer grid which share a ray with each pixel of a coarser grid
+
+	A pixel (x,y) of the coarse grid points in the same direction as the pixel (kx*x, ky*y) of the
+	fine grid, provided the fine resolution is an integer multiple (kx, ky) of the coarse one.
+
+	Args:
+		coarse_pixels (tuple[int,int]): resolution of the coarse grid
+		fine_pixels (tuple[int,int]): resolution of the fine grid
+
+	Returns:
+		np.ndarray|None: flattened fine grid index of each flattened coarse grid pixel,
+			None if the grids are not nested
+	'''
+	if fine_pixels[0] % coarse_pixels[0] != 0 or fine_pixels[1] % coarse_pixels[1] != 0:
+		return None
+	kx = fine_pixels[0] // coarse_pixels[0]
+	ky = fine_pixels[1] // coarse_pixels[1]
+	x,y = np.meshgrid(np.arange(coarse_pixels[0])*kx, np.arange(coarse_pixels[1])*ky)
+	return np.ravel_multi_index((y.ravel(), x.ravel()), (fine_pixels[1], fine_pixels[0]))
+
 def calcPixelAngularSize(pixels:tuple[int,int], fov:tuple[float, float]) -> tuple[float,float]:
 	px_deg_x = pixels[0]/fov[0]
 	px_deg_y = pixels[1]/fov[1]
 
 	return 1/np.deg2rad(1/px_deg_x), 1/np.deg2rad(1/px_deg_y)
 
-def generateEdgeRays(pixels:tuple[int,int], fov:tuple[float,float]) -> np.ndarray:
-	all_rays = generatePixelRays(pixels, fov)
-	num_rays = len(all_rays)
-	right_range = np.arange(pixels[0]-1,pixels[1]*pixels[0],pixels[0])
-	left_range = np.arange(0,pixels[1]*pixels[0],pixels[0])
-	edge_rays = np.vstack((all_rays[left_range,:],all_rays[right_range,:],all_rays[1:pixels[0]-1,:],all_rays[num_rays-pixels[0]+1:-1,:]))
-	return edge_rays
\ No newline at end of file
+def calcPerimeterPixelIdxs(pixels:tuple[int,int]) -> np.ndarray:
+	'''Flattened indices of the pixels around the edge of the frame, in order around the perimeter.
+
+	Starts at the top left corner and runs along the top row, down the right column, back along the bottom
+	row and up the left column. Each corner appears once.
+	'''
+	w, h = pixels
+	top = np.arange(w)
+	right = np.arange(1, h)*w + w-1
+	bottom = (h-1)*w + np.arange(w-2, -1, -1)
+	left = np.arange(h-2, 0, -1)*w
+	return np.concatenate((top, right, bottom, left))
+
+def generatePerimeterRays(pixels:tuple[int,int], fov:tuple[float,float]) -> np.ndarray:
+	return generatePixelRays(pixels, fov, pixel_idxs=calcPerimeterPixelIdxs(pixels))
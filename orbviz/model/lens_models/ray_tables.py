@@ -0,0 +1,108 @@
+'''Lookup tables of the ray through each pixel of a lens model.
+
+Tables are generated on first request, stored as float32 unit vectors, and shared between every sensor
+with the same lens model, resolution and field of view. The most recently used tables are kept in memory,
+and large tables are written to the cache directory and memory mapped, so later sessions and forked
+processes page them in rather than regenerating them.
+A lens model is any module providing generatePixelRays(resolution, fov, pixel_idxs=None).
+'''
+import collections
+import logging
+import os
+import pathlib
+import threading
+
+from types import ModuleType
+
+import numpy as np
+
+import orbviz.util.paths as orbviz_paths
+
+logger = logging.getLogger(__name__)
+
+# tables smaller than this are quicker to generate than to load, and are only kept in memory
+PERSIST_MIN_PIXELS = 2**18
+# pixels generated at a time when filling a table, bounds the float64 intermediates of the lens model
+GENERATION_CHUNK_PIXELS = 2**20
+# number of tables kept in memory, least recently used are released first
+MAX_CACHED_TABLES = 16
+
+_tables: collections.OrderedDict[tuple[str, tuple[int,int], tuple[float,float]], np.ndarray] = collections.OrderedDict()
+_lock = threading.Lock()
+
+
+def getPixelRays(lens_model:ModuleType, resolution:tuple[int,int], fov:tuple[float,float],
+					pixel_idxs:np.ndarray|None=None) -> np.ndarray:
+	'''Get the sensor frame ray of each pixel, generating the table if this is its first use.
+
+	Args:
+		lens_model (ModuleType): lens model module, i.e. orbviz.model.lens_models.pinhole
+		resolution (tuple[int,int]): sensor resolution
+		fov (tuple[float,float]): sensor field of view [deg]
+		pixel_idxs (np.ndarray|None): flattened indices of the pixels to return, None for every pixel
+
+	Returns:
+		np.ndarray[n,3]: float32 unit ray of each pixel. The full table is read only.
+	'''
+	key = (lens_model.__name__, (int(resolution[0]), int(resolution[1])), (float(fov[0]), float(fov[1])))
+	with _lock:
+		if key in _tables:
+			_tables.move_to_end(key)
+		else:
+			_tables[key] = _loadTable(lens_model, key[1], key[2])
+			while len(_tables) > MAX_CACHED_TABLES:
+				_tables.popitem(last=False)
+		table = _tables[key]
+	if pixel_idxs is None:
+		return table
+	return table[pixel_idxs]
+
+def clearCache() -> None:
+	'''Release tables held in memory, persisted tables are kept on disk.'''
+	with _lock:
+		_tables.clear()
+
+def _tablePath(lens_model:ModuleType, resolution:tuple[int,int], fov:tuple[float,float]) -> pathlib.Path:
+	model_name = lens_model.__name__.rsplit('.', 1)[-1]
+	return orbviz_paths.cache_dir.joinpath(f'rays_{model_name}_{resolution[0]}x{resolution[1]}_{fov[0]:.9g}x{fov[1]:.9g}.npy')
+
+def _loadTable(lens_model:ModuleType, resolution:tuple[int,int], fov:tuple[float,float]) -> np.ndarray:
+	num_pixels = resolution[0]*resolution[1]
+	if num_pixels < PERSIST_MIN_PIXELS:
+		return _generateTable(lens_model, resolution, fov)
+
+	path = _tablePath(lens_model, resolution, fov)
+	if path.exists():
+		try:
+			table = np.load(path, mmap_mode='r')
+			if table.shape == (num_pixels, 3) and table.dtype == np.float32:
+				return table
+			logger.warning("Ray table %s does not match its lens parameters, regenerating", path)
+		except (OSError, ValueError):
+			logger.warning("Could not load ray table %s, regenerating", path)
+
+	logger.debug("Generating %s ray table for %s, fov %s", lens_model.__name__, resolution, fov)
+	try:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# other processes may be generating the same table, only the completed file is ever visible
+		tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npy')
+		table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(num_pixels, 3))
+		_fillTable(table, lens_model, resolution, fov)
+		table.flush()
+		del table
+		tmp_path.replace(path)
+		return np.load(path, mmap_mode='r')
+	except OSError:
+		logger.warning("Could not write ray table to %s, keeping it in memory", path.parent)
+		return _generateTable(lens_model, resolution, fov)
+
+def _generateTable(lens_model:ModuleType, resolution:tuple[int,int], fov:tuple[float,float]) -> np.ndarray:
+	table = np.empty((resolution[0]*resolution[1], 3), dtype=np.float32)
+	_fillTable(table, lens_model, resolution, fov)
+	table.flags.writeable = False
+	return table
+
+def _fillTable(table:np.ndarray, lens_model:ModuleType, resolution:tuple[int,int], fov:tuple[float,float]) -> None:
+	for start in range(0, len(table), GENERATION_CHUNK_PIXELS):
+		stop = min(start+GENERATION_CHUNK_PIXELS, len(table))
+		table[start:stop] = lens_model.generatePixelRays(resolution, fov, pixel_idxs=np.arange(start, stop))[:,:3]
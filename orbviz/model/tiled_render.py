@@ -0,0 +1,206 @@
+'''Raycasting of sensor images too large to hold in memory, one tile of the detector at a time.
+
+Finished tiles are written straight to memory mapped .npy arrays on disk, so peak memory is bounded by
+the tile size rather than the detector size. A downsampled overview of the image is filled in as each
+tile completes, for display while the remaining tiles are raycast.
+'''
+import datetime as dt
+import logging
+import math
+import pathlib
+import shutil
+import struct
+import tempfile
+
+from collections.abc import Callable
+import types
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+import orbviz.model.data_models.data_types as data_types
+import orbviz.model.data_models.earth_raycast_data as earth_raycast_data
+import orbviz.util.paths as orbviz_paths
+
+logger = logging.getLogger(__name__)
+
+DFLT_TILE_SIZE = 1024
+DFLT_OVERVIEW_1D_RESOLUTION = 2048
+# pixels read from disk at a time when saving an image
+SAVE_STRIP_PIXELS = 2**22
+
+
+class TiledSensorImage:
+	'''On disk sensor image, and mouse over data, written one tile at a time.
+
+	Attributes:
+		img (np.memmap[h,w,3]): uint8 pixel colours
+		mo_data (np.memmap[h*w]): mouse over data of each pixel, of dtype data_types.MOUSE_OVER_DTYPE
+		overview (np.ndarray[oh,ow,3]): uint8 image sampled every overview_step pixels
+	'''
+	def __init__(self, resolution:tuple[int,int], output_dir:pathlib.Path|None=None,
+					tile_size:int=DFLT_TILE_SIZE, overview_1D_resolution:int=DFLT_OVERVIEW_1D_RESOLUTION):
+		self.resolution = (int(resolution[0]), int(resolution[1]))
+		self.tile_size = tile_size
+		# a temporary directory is removed with the image
+		self._owns_dir = output_dir is None
+		if output_dir is None:
+			orbviz_paths.cache_dir.mkdir(parents=True, exist_ok=True)
+			output_dir = pathlib.Path(tempfile.mkdtemp(prefix='full_res_', dir=orbviz_paths.cache_dir))
+		else:
+			output_dir.mkdir(parents=True, exist_ok=True)
+		self.output_dir = output_dir
+		self.img_path = output_dir.joinpath('img.npy')
+		self.mo_data_path = output_dir.joinpath('mo_data.npy')
+		width, height = self.resolution
+		self.img = np.lib.format.open_memmap(self.img_path, mode='w+', dtype=np.uint8, shape=(height, width, 3))
+		self.mo_data = np.lib.format.open_memmap(self.mo_data_path, mode='w+', dtype=data_types.MOUSE_OVER_DTYPE, shape=(height*width,))
+
+		self.overview_step = max(1, math.ceil(max(self.resolution)/overview_1D_resolution))
+		self.overview = np.zeros((math.ceil(height/self.overview_step), math.ceil(width/self.overview_step), 3), dtype=np.uint8)
+		self.tiles = calcTiles(self.resolution, tile_size)
+		self.num_complete = 0
+
+	def isComplete(self) -> bool:
+		return self.num_complete == len(self.tiles)
+
+	def writeTile(self, tile:tuple[int,int,int,int], img_tile:np.ndarray, mo_tile:np.ndarray) -> None:
+		'''Store a raycast tile.
+
+		Args:
+			tile (tuple[int,int,int,int]): x, y, width, height of the tile, from calcTiles
+			img_tile (np.ndarray[th,tw,3]): uint8 pixel colours of the tile
+			mo_tile (np.ndarray[th*tw]): mouse over data of the tile, in tilePixelIdxs order
+		'''
+		x, y, tile_w, tile_h = tile
+		self.img[y:y+tile_h, x:x+tile_w] = img_tile
+		self.mo_data.reshape(self.resolution[1], self.resolution[0])[y:y+tile_h, x:x+tile_w] = mo_tile.reshape(tile_h, tile_w)
+
+		# overview pixels are every overview_step'th pixel of the full image
+		step = self.overview_step
+		x_offset = -x % step
+		y_offset = -y % step
+		sampled = img_tile[y_offset::step, x_offset::step]
+		ov_x = (x+x_offset)//step
+		ov_y = (y+y_offset)//step
+		self.overview[ov_y:ov_y+sampled.shape[0], ov_x:ov_x+sampled.shape[1]] = sampled
+		self.num_complete += 1
+
+	def flush(self) -> None:
+		self.img.flush()
+		self.mo_data.flush()
+
+	def save(self, path:pathlib.Path) -> None:
+		'''Save the image to a file, a strip of rows at a time.
+
+		Bitmaps are streamed to disk without ever holding the whole image in memory. Other formats are
+		encoded by PIL, which needs the whole image, but it is still read from disk a strip at a time.
+		'''
+		path = pathlib.Path(path)
+		width, height = self.resolution
+		strip_rows = max(SAVE_STRIP_PIXELS//width, 1)
+		if path.suffix.lower() == '.bmp':
+			_saveBitmap(path, self.img, strip_rows)
+			return
+		im = Image.new('RGB', (width, height))
+		for y in range(0, height, strip_rows):
+			im.paste(Image.fromarray(np.asarray(self.img[y:y+strip_rows])), (0, y))
+		im.save(path)
+
+	def remove(self) -> None:
+		'''Delete the image from disk, if it was written to a temporary directory.'''
+		self.img = None
+		self.mo_data = None
+		if self._owns_dir:
+			shutil.rmtree(self.output_dir, ignore_errors=True)
+
+
+def calcTiles(resolution:tuple[int,int], tile_size:int) -> list[tuple[int,int,int,int]]:
+	'''Split a detector into tiles, row by row.
+
+	Returns:
+		list[tuple[int,int,int,int]]: x, y, width and height of each tile, edge tiles are clipped to the detector
+	'''
+	return [(x, y, min(tile_size, resolution[0]-x), min(tile_size, resolution[1]-y))
+				for y in range(0, resolution[1], tile_size)
+				for x in range(0, resolution[0], tile_size)]
+
+def _saveBitmap(path:pathlib.Path, img:np.ndarray, strip_rows:int) -> None:
+	# 24 bit uncompressed bitmap, rows are stored bottom up as BGR, each padded to a multiple of 4 bytes
+	height, width = img.shape[:2]
+	row_size = (width*3 + 3) & ~3
+	header_size = 14 + 40
+	file_size = header_size + row_size*height
+	if file_size >= 2**32:
+		logger.error("Can't save %sx%s image as a bitmap, it would exceed 4 GB", width, height)
+		raise ValueError(f"Can't save {width}x{height} image as a bitmap, it would exceed 4 GB")
+	with path.open('wb') as fp:
+		fp.write(struct.pack('<2sIHHI', b'BM', file_size, 0, 0, header_size))
+		fp.write(struct.pack('<IiiHHIIiiII', 40, width, height, 1, 24, 0, row_size*height, 2835, 2835, 0, 0))
+		strip = np.zeros((strip_rows, row_size), dtype=np.uint8)
+		for stop in range(height, 0, -strip_rows):
+			start = max(stop-strip_rows, 0)
+			num_rows = stop - start
+			strip[:num_rows, :width*3] = img[start:stop][::-1, :, ::-1].reshape(num_rows, width*3)
+			fp.write(strip[:num_rows].tobytes())
+
+def tilePixelIdxs(resolution:tuple[int,int], tile:tuple[int,int,int,int]) -> np.ndarray:
+	'''Flattened detector index of each pixel of a tile, row by row within the tile.'''
+	x, y, tile_w, tile_h = tile
+	return (np.arange(y, y+tile_h).reshape(-1,1)*resolution[0] + np.arange(x, x+tile_w)).ravel()
+
+def raycastTiled(raycast_src:earth_raycast_data.EarthRayCastData, lens_model:types.ModuleType,
+					resolution:tuple[int,int], fov:tuple[float,float], sens_eci_transform:np.ndarray,
+					curr_dt:dt.datetime, sun_eci:np.ndarray, moon_eci:np.ndarray,
+					tiled_img:TiledSensorImage, raycast_options:dict[str, Any]|None=None,
+					running:Callable[[], bool]|None=None,
+					tile_callback:Callable[[int], None]|None=None) -> TiledSensorImage|None:
+	'''Raycast a sensor image tile by tile into a TiledSensorImage.
+
+	Rays are generated per tile from the lens model, so no full resolution intermediate is ever held.
+
+	Args:
+		raycast_src (earth_raycast_data.EarthRayCastData): loaded raycast data
+		lens_model (types.ModuleType): lens model module, i.e. orbviz.model.lens_models.pinhole
+		resolution (tuple[int,int]): sensor resolution
+		fov (tuple[float,float]): sensor field of view [deg]
+		sens_eci_transform (np.ndarray[4,4]): sensor frame to eci transform
+		curr_dt (dt.datetime): datetime of the image
+		sun_eci (np.ndarray[3]): eci position of the sun
+		moon_eci (np.ndarray[3]): eci position of the moon
+		tiled_img (TiledSensorImage): image to write tiles to, tiles already completed are skipped
+		raycast_options (dict[str, Any]|None): keyword arguments passed to rayCastFromSensor
+		running (Callable[[], bool]|None): checked before each tile, the image is abandoned, and removed, once it returns False
+			or once the image has been removed
+		tile_callback (Callable[[int], None]|None): called with the number of completed tiles after each tile
+
+	Returns:
+		TiledSensorImage|None: the completed image, None if abandoned
+	'''
+	if raycast_options is None:
+		raycast_options = {}
+	pix_per_rad = lens_model.calcPixelAngularSize(resolution, fov)
+	for tile in tiled_img.tiles[tiled_img.num_complete:]:
+		if tiled_img.img is None or (running is not None and not running()):
+			logger.debug("Abandoning tiled raycast after %s of %s tiles", tiled_img.num_complete, len(tiled_img.tiles))
+			tiled_img.remove()
+			return None
+		pixel_idxs = tilePixelIdxs(resolution, tile)
+		rays_sf = lens_model.generatePixelRays(resolution, fov, pixel_idxs=pixel_idxs)
+		img_data, mo_data = raycast_src.rayCastFromSensor(resolution,
+															pix_per_rad,
+															sens_eci_transform,
+															rays_sf,
+															curr_dt,
+															sun_eci,
+															moon_eci,
+															pixel_idxs=pixel_idxs,
+															lens_model=lens_model,
+															**raycast_options)
+		img_tile = np.clip(img_data, 0, 255).astype(np.uint8).reshape(tile[3], tile[2], 3)
+		tiled_img.writeTile(tile, img_tile, mo_data)
+		if tile_callback is not None:
+			tile_callback(tiled_img.num_complete)
+	tiled_img.flush()
+	return tiled_img
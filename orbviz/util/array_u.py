@@ -93,3 +93,37 @@ def nonMonotonicInterpNans(x, y):
 
 	out_y[nans] = new_ys
 	return out_y
+
+class PackedRaggedArray:
+	'''
+	Sequence of arrays of differing lengths, packed end to end into a single array.
+
+	Element ii is values[offsets[ii]:offsets[ii+1]], so indexing returns a view without copying.
+
+	Parameters
+	----------
+	values : (m,...) ndarray
+		All elements, concatenated along the first axis.
+	offsets : (n+1,) ndarray
+		Start of each element within values, followed by the total length.
+	'''
+	def __init__(self, values:nptyping.NDArray, offsets:nptyping.NDArray):
+		if offsets[-1] != len(values):
+			raise ValueError('Last offset must equal the length of values')
+		self.values = values
+		self.offsets = offsets
+
+	@classmethod
+	def fromList(cls, arrays:list[nptyping.NDArray], dtype:nptyping.DTypeLike|None=None) -> 'PackedRaggedArray':
+		offsets = np.zeros(len(arrays)+1, dtype=np.int64)
+		offsets[1:] = np.cumsum([len(arr) for arr in arrays])
+		return cls(np.concatenate(arrays).astype(dtype, copy=False), offsets)
+
+	def lengths(self) -> nptyping.NDArray:
+		return np.diff(self.offsets)
+
+	def __len__(self) -> int:
+		return len(self.offsets) - 1
+
+	def __getitem__(self, idx:int) -> nptyping.NDArray:
+		return self.values[self.offsets[idx]:self.offsets[idx+1]]
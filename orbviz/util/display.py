@@ -0,0 +1,15 @@
+from PyQt5 import QtGui, QtWidgets
+
+# display refresh rate to use if the screen's can't be queried [Hz]
+DFLT_REFRESH_RATE = 60
+
+
+def frameInterval() -> float:
+	'''Time between refreshes of the primary screen [s].'''
+	# QGuiApplication.primaryScreen is only valid within a gui application
+	if not isinstance(QtWidgets.QApplication.instance(), QtGui.QGuiApplication):
+		return 1/DFLT_REFRESH_RATE
+	screen = QtGui.QGuiApplication.primaryScreen()
+	if screen is None or screen.refreshRate() <= 0:
+		return 1/DFLT_REFRESH_RATE
+	return 1/screen.refreshRate()
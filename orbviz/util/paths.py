@@ -5,6 +5,7 @@ resources_dir = orbviz_dir.joinpath('resources')
 actions_dir = resources_dir.joinpath('actions')
 icons_dir = resources_dir.joinpath('icons')
 data_dir = orbviz_dir.joinpath('data')
+cache_dir = data_dir.joinpath('cache')
 credential_dir = data_dir.joinpath('spacetrack')
 constellation_dir = data_dir.joinpath('constellation_configs')
 events_dir = data_dir.joinpath('events')
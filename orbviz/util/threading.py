@@ -143,4 +143,31 @@ class Threadpool(QtCore.QThreadPool):
 		self.start(thread)
 
 	def clearThreadRecord(self, thread:Worker) -> None:
-		self.running_threads.remove(thread)
\ No newline at end of file
+		self.running_threads.remove(thread)
+
+
+class SynchronousThreadpool:
+	'''Stand-in for Threadpool when there is no Qt event loop, e.g. headless batch rendering.
+
+	Workers are run to completion in the calling thread as soon as they are started, so their
+	signals are delivered directly to connected slots.
+	'''
+	def __init__(self):
+		self.running_threads = []
+
+	def getRunningThreads(self) -> list[Worker]:
+		return self.running_threads
+
+	def maxThreadCount(self) -> int:
+		return 1
+
+	def killAll(self) -> None:
+		for thread in self.running_threads:
+			thread.terminate()
+
+	def logStart(self, thread:Worker) -> None:
+		self.running_threads.append(thread)
+		try:
+			thread.run()
+		finally:
+			self.running_threads.remove(thread)
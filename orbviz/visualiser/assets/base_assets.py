@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
 import logging
+import weakref
 
+from collections.abc import Callable, Hashable
 from typing import Any
 from typing_extensions import Self
 
@@ -11,6 +14,68 @@ from vispy.scene.widgets.viewbox import ViewBox
 
 logger = logging.getLogger(__name__)
 
+# maximum number of released visuals kept for reuse, per pool key
+MAX_POOLED_PER_KEY = 32
+
+class VisualPool:
+	'''Recycles vispy visuals between assets which are torn down and rebuilt.
+
+	Visuals are pooled by a key describing their type and size, e.g. ('sensor_cone', num_vertices, num_faces).
+	Reusing a released visual keeps its compiled shader program and GPU buffers, so reloading a configuration
+	only updates the data of existing visuals instead of allocating and compiling new ones.
+	'''
+	def __init__(self, max_pooled_per_key:int=MAX_POOLED_PER_KEY):
+		self.max_pooled_per_key = max_pooled_per_key
+		self._pooled = defaultdict(list)
+		# visuals handed out and not yet released, live visuals aren't kept alive by the pool
+		self._live = weakref.WeakKeyDictionary()
+
+	def acquire(self, pool_key:Hashable, factory:Callable[[], Any]) -> tuple[Any, bool]:
+		'''Get a visual from the pool, or create one if none are pooled under the key.
+
+		Args:
+			pool_key (Hashable): type and size of the visual
+			factory (Callable[[], Any]): creates a new visual if there are none to reuse
+
+		Returns:
+			tuple[Any, bool]: the visual, and whether it is newly created. A reused visual still holds the data
+				it was last given, which the caller must overwrite
+		'''
+		if self._pooled[pool_key]:
+			visual = self._pooled[pool_key].pop()
+			is_new = False
+		else:
+			visual = factory()
+			is_new = True
+		self._live[visual] = pool_key
+		return visual, is_new
+
+	def release(self, visual:Any) -> None:
+		'''Stop drawing a visual and return it to the pool.'''
+		if visual not in self._live:
+			logger.error("Visual %s was not acquired from this pool", visual)
+			raise ValueError(f"Visual {visual} was not acquired from this pool")
+		pool_key = self._live.pop(visual)
+		visual.parent = None
+		visual.visible = True
+		if len(self._pooled[pool_key]) < self.max_pooled_per_key:
+			self._pooled[pool_key].append(visual)
+
+	def isPooled(self, visual:Any) -> bool:
+		'''Whether a visual was acquired from this pool and is still in use.'''
+		return visual in self._live
+
+	def counts(self) -> dict[str, int]:
+		'''Number of visuals in use, and waiting for reuse.'''
+		return {'live': len(self._live),
+				'pooled': sum(len(visuals) for visuals in self._pooled.values())}
+
+	def clear(self) -> None:
+		'''Drop all visuals waiting for reuse, freeing their GPU resources once they are garbage collected.'''
+		self._pooled.clear()
+
+visual_pool = VisualPool()
+
 class AbstractSimpleVispyAsset(ABC):
 
 	# name_str: str
@@ -65,6 +130,23 @@ class AbstractSimpleVispyAsset(ABC):
 	def detachFromParentViewRecursive(self) -> None:
 		self._detachFromParentView()
 
+	def _acquireVisual(self, visual_key:str, pool_key:Hashable, factory:Callable[[], Any]) -> bool:
+		'''Store a visual from the visual pool under visual_key, returns whether the visual is newly created.'''
+		self.visuals[visual_key], is_new = visual_pool.acquire(pool_key, factory)
+		return is_new
+
+	def _releaseVisuals(self) -> None:
+		'''Detach all visuals, returning those acquired from the visual pool to it.'''
+		self._detachFromParentView()
+		for visual_key, visual in list(self.visuals.items()):
+			if visual is not None and not isinstance(visual, list) and visual_pool.isPooled(visual):
+				visual_pool.release(visual)
+				del self.visuals[visual_key]
+
+	def releaseVisualsRecursive(self) -> None:
+		'''Detach all nested visuals, returning those acquired from the visual pool to it.'''
+		self._releaseVisuals()
+
 	def setParentView(self, view:ViewBox) -> None:
 		'''Stores the v_parent to the vispy view to use'''
 		self.data['v_parent'] = view
@@ -296,6 +378,26 @@ class AbstractCompoundVispyAsset(ABC):
 		for asset in self.assets.values():
 			asset.detachFromParentViewRecursive()
 
+	def _acquireVisual(self, visual_key:str, pool_key:Hashable, factory:Callable[[], Any]) -> bool:
+		'''Store a visual from the visual pool under visual_key, returns whether the visual is newly created.'''
+		self.visuals[visual_key], is_new = visual_pool.acquire(pool_key, factory)
+		return is_new
+
+	def _releaseVisuals(self) -> None:
+		'''Detach all visuals, returning those acquired from the visual pool to it.'''
+		self._detachFromParentView()
+		for visual_key, visual in list(self.visuals.items()):
+			if visual is not None and not isinstance(visual, list) and visual_pool.isPooled(visual):
+				visual_pool.release(visual)
+				del self.visuals[visual_key]
+
+	def releaseVisualsRecursive(self) -> None:
+		'''Detach all nested visuals, returning those acquired from the visual pool to it.'''
+		self._releaseVisuals()
+		for asset in self.assets.values():
+			if asset is not None:
+				asset.releaseVisualsRecursive()
+
 	def setParentView(self, view:ViewBox) -> None:
 		'''Stores the v_parent to the vispy view to use'''
 		self.data['v_parent'] = view
@@ -574,6 +676,26 @@ class AbstractVispyAsset(ABC):
 		for asset in self.assets.values():
 			asset.detachFromParentViewRecursive()
 
+	def _acquireVisual(self, visual_key:str, pool_key:Hashable, factory:Callable[[], Any]) -> bool:
+		'''Store a visual from the visual pool under visual_key, returns whether the visual is newly created.'''
+		self.visuals[visual_key], is_new = visual_pool.acquire(pool_key, factory)
+		return is_new
+
+	def _releaseVisuals(self) -> None:
+		'''Detach all visuals, returning those acquired from the visual pool to it.'''
+		self._detachFromParentView()
+		for visual_key, visual in list(self.visuals.items()):
+			if visual is not None and not isinstance(visual, list) and visual_pool.isPooled(visual):
+				visual_pool.release(visual)
+				del self.visuals[visual_key]
+
+	def releaseVisualsRecursive(self) -> None:
+		'''Detach all nested visuals, returning those acquired from the visual pool to it.'''
+		self._releaseVisuals()
+		for asset in self.assets.values():
+			if asset is not None:
+				asset.releaseVisualsRecursive()
+
 	def setParentView(self, view:ViewBox) -> None:
 		'''Stores the v_parent to the vispy view to use'''
 		self.data['v_parent'] = view
@@ -4,24 +4,19 @@ from typing import Any
 from typing_extensions import Self
 
 import numpy as np
-import numpy.typing as nptyping
-from scipy.spatial.transform import Rotation
 import spherapy.orbit as orbit
 
-import vispy.color.color_array as vcolor_array
-import vispy.scene as scene
-import vispy.scene.visuals as vVisuals
 from vispy.scene.widgets.viewbox import ViewBox
 import vispy.visuals.filters as vFilters
-import vispy.visuals.transforms as vTransforms
 
 import orbviz
 import orbviz.model.geometry.polyhedra as polyhedra
-import orbviz.model.geometry.primgeom as pg
 import orbviz.util.constants as c
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.colours as colours
 import orbviz.visualiser.interface.console as console
+import orbviz.visualiser.visuals.trajectory_beams as trajectory_beams
+import orbviz.visualiser.visuals.trajectory_markers as trajectory_visuals
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +70,9 @@ class Constellation(base_assets.AbstractVispyAsset):
 			self.data['coords'][ii,:,:] = list(sats_dict.values())[ii].pos
 		self.data['beam_height'] = self._calcBeamHeight(self.data['beam_angle_deg']/2,
 												   			np.linalg.norm(list(sats_dict.values())[0].pos[0,:]))
+		# trajectories are uploaded once, redraws only select the timestep
+		self.visuals['markers'].set_trajectories(self.data['coords'])
+		self._updateMarkers()
 
 		if self.assets['beams'] is not None:
 			self.assets['beams'].setSource(self.data['num_sats'],
@@ -98,46 +96,36 @@ class Constellation(base_assets.AbstractVispyAsset):
 			self.assets['beams'] = ConstellationBeams(name=f'{self.data["name"]}_beams', v_parent=self.data['v_parent'])
 
 	def _createVisuals(self) -> None:
-		self.visuals['markers'] = scene.visuals.Markers(scaling=True,
-														edge_color='white',
-														symbol='o',
-														antialias=0,
-														parent=None)
+		self.visuals['markers'] = trajectory_visuals.TrajectoryMarkers(scaling=True,
+																		edge_color='white',
+																		symbol='o',
+																		antialias=0,
+																		parent=None)
 
 	# Use AbstractVispyAsset.updateIndex()
 
 	def recomputeRedraw(self) -> None:
 		if self.isFirstDraw():
+			# markers visual persists across sources, only needs re-parenting
 			self._detachFromParentView()
-			# if self.visuals['markers'] is not None:
-			# 	# Must do this to clear old visuals before creating a new one
-			# 	# TODO: not clear if this is actually deleting or just removing the reference (memory leak?)
-			# 	self.visuals['markers'].parent = None
 			self._attachToParentView()
-			# self._createVisuals()
-			# self._attachToParentView()
-			# self.first_draw = False
 			self._clearFirstDrawFlag()
 
 		if self.isStale():
-			self._updateMarkers()
+			self.visuals['markers'].set_index(self.data['curr_index'])
 			# recomputeRedraw child assets
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
 	def getScreenMouseOverInfo(self) -> dict[str,Any]:
-		canvas_poss = []
-		world_poss = []
-		for ii in range(self.data['num_sats']):
-			curr_world_pos = (self.data['coords'][ii,self.data['curr_index']]).reshape(1,3)
-			canvas_pos = self.visuals['markers'].get_transform('visual','canvas').map(curr_world_pos)
-			canvas_pos /= canvas_pos[:,3:]
-			canvas_poss.append((canvas_pos[0,0], canvas_pos[0,1]))
-			world_poss.append(curr_world_pos)
+		# all satellites mapped to the canvas in one transform
+		curr_world_pos = self.data['coords'][:,self.data['curr_index']]
+		canvas_pos = self.visuals['markers'].get_transform('visual','canvas').map(curr_world_pos)
+		canvas_pos /= canvas_pos[:,3:]
 
 		mo_info = {'screen_pos':[], 'world_pos':[], 'strings':[], 'objects':[]}
-		mo_info['screen_pos'] = canvas_poss
-		mo_info['world_pos'] = world_poss
+		mo_info['screen_pos'] = canvas_pos[:,:2]
+		mo_info['world_pos'] = curr_world_pos
 		mo_info['strings'] = self.data['strings']
 		mo_info['objects'] = [self]*self.data['num_sats']
 		return mo_info
@@ -259,7 +247,7 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 		self.data['curr_index'] = 0
 		self.data['num_sats'] = 0
 		self.data['start_beam_vec'] = np.array((0,0,1)).reshape(1,3)
-		self.data['c_conn'] = None
+		self.data['traj_buffer'] = None
 
 	def setSource(self, *args, **kwargs) -> None:
 		# args[0] = num_sats
@@ -307,6 +295,11 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 			self._detachFromParentView()
 			self._createVisuals()
 			self._first_creation = False
+		else:
+			# trajectories are uploaded once per source, redraws only select the timestep
+			self.data['traj_buffer'] = trajectory_beams.TrajectoryBuffer(self.data['coords'])
+			for visual in self.visuals.values():
+				visual.set_trajectories(self.data['traj_buffer'])
 
 	def _instantiateAssets(self) -> None:
 		pass
@@ -317,14 +310,9 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 			self.visuals[name] = None
 
 	def _createVisuals(self) -> None:
-		instance_colours = np.tile(colours.normaliseColour(self.opts['beams_colour']['value']),(self.data['num_sats'],1))
-		instance_positions = self.data['coords'][:,self.data['curr_index'],:].reshape(-1,3)
+		# beams are instanced at the satellite positions held on the GPU, and pointed to nadir in the vertex shader
+		self.data['traj_buffer'] = trajectory_beams.TrajectoryBuffer(self.data['coords'])
 
-		instance_transforms = np.zeros((self.data['num_sats'],3,3))
-		for ii in range(self.data['num_sats']):
-			beam_axis = -1 * pg.unitVector(self.data['coords'][ii,self.data['curr_index'],:]).reshape(1,3)
-			instance_transforms[ii,:,:] = np.linalg.inv(Rotation.align_vectors(self.data['start_beam_vec'],beam_axis)[0].as_matrix())
-		
 		vertices, faces = polyhedra.calcConeMesh((0,0,0),
 												self.data['beam_height'],
 												self.data['start_beam_vec'],
@@ -340,32 +328,30 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 													sort_output=False)
 		self.data['generic_circle_points'] = generic_cone_points[(generic_cone_points != np.asarray((0,0,0))).all(axis=1),:]
 		self.data['generic_circle_points'] = np.vstack((self.data['generic_circle_points'],self.data['generic_circle_points'][0,:]))
-		circles = self._genBeamCircles(instance_transforms, instance_positions)
-		self.visuals['circles'] = vVisuals.Line(circles,
-										  		connect=self.data['c_conn'],
-								 				color=colours.normaliseColour((self.opts['beams_colour']['value'][0]/2,
+		circle_colour = colours.normaliseColour((self.opts['beams_colour']['value'][0]/2,
 												self.opts['beams_colour']['value'][1]/2,
-												self.opts['beams_colour']['value'][2]/2)),
-												width=self.opts['circle_width']['value'],
-												parent=None)
-		self.data['num_generic_circle_points'] = len(self.data['generic_circle_points'])
+												self.opts['beams_colour']['value'][2]/2))
+		self.visuals['circles'] = trajectory_beams.TrajectoryCircles(self.data['generic_circle_points'],
+																	self.data['traj_buffer'],
+																	color=circle_colour,
+																	width=self.opts['circle_width']['value'],
+																	parent=None)
 		# scircle is selected beam circle
-		self.data['s_c_conn'] = np.array((0,0)).reshape(-1,2)
-		self.visuals['scircle'] = vVisuals.Line(circles,
-												connect=self.data['s_c_conn'],
-								 				color=colours.normaliseColour((self.opts['beams_colour']['value'][0]/2,
-												self.opts['beams_colour']['value'][1]/2,
-												self.opts['beams_colour']['value'][2]/2)),
-												width=5.0,
-												parent=None)
-		self.visuals['beams'] = vVisuals.InstancedMesh(vertices,
-													faces,
-													instance_colors=instance_colours,
-													instance_positions=instance_positions,
-													instance_transforms=instance_transforms,
-													parent=None)
+		self.visuals['scircle'] = trajectory_beams.TrajectoryCircles(self.data['generic_circle_points'],
+																	self.data['traj_buffer'],
+																	color=circle_colour,
+																	width=5.0,
+																	selectable=True,
+																	parent=None)
+		self.visuals['beams'] = trajectory_beams.TrajectoryBeams(vertices,
+																faces,
+																self.data['traj_buffer'],
+																color=colours.normaliseColour(self.opts['beams_colour']['value']),
+																parent=None)
 		self.data['beams_alpha_filter'] = vFilters.Alpha(self.opts['beams_alpha']['value'])
 		self.visuals['beams'].attach(self.data['beams_alpha_filter'])
+		for visual in self.visuals.values():
+			visual.set_index(self.data['curr_index'])
 
 
 	# Use AbstractVispyAsset.updateIndex()
@@ -383,31 +369,18 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 			self._clearFirstDrawFlag()
 		
 		if self.isStale():
-			instance_transforms = np.zeros((self.data['num_sats'],3,3))
-			for ii in range(self.data['num_sats']):
-				beam_axis = -1 * pg.unitVector(self.data['coords'][ii,self.data['curr_index'],:]).reshape(1,3)
-				instance_transforms[ii,:,:] = np.linalg.inv(Rotation.align_vectors(self.data['start_beam_vec'],beam_axis)[0].as_matrix())
-			instance_positions = self.data['coords'][:,self.data['curr_index'],:].reshape(-1,3)
-
-			self.visuals['beams'].instance_transforms = instance_transforms
-			self.visuals['beams'].instance_positions = instance_positions
-			circles = self._genBeamCircles(instance_transforms,instance_positions)
-			self.visuals['circles'].set_data(circles)
-			self.data['s_c_conn'] = np.array((0,0)).reshape(-1,2)
-			self.visuals['scircle'].set_data(pos=circles, connect=self.data['s_c_conn'])
+			for visual in self.visuals.values():
+				visual.set_index(self.data['curr_index'])
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
 	def mouseOver(self, index:int) -> Self:
-		self.data['s_c_conn'] = np.array([np.arange(self.data['num_generic_circle_points']-1),
-											np.arange(1,self.data['num_generic_circle_points'])]).T + index * self.data['num_generic_circle_points']
-		self.visuals['scircle'].set_data(connect=self.data['s_c_conn'])
+		self.visuals['scircle'].set_selected(index)
 		return self
 
 
 	def restoreMouseOver(self) -> None:
-		self.data['s_c_conn'] = np.array((0,0)).reshape(-1,2)
-		self.visuals['scircle'].set_data(connect=self.data['s_c_conn'])
+		self.visuals['scircle'].set_selected(None)
 		return
 
 	def _setDefaultOptions(self) -> None:
@@ -436,9 +409,8 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 	def setBeamsColour(self, new_colour:tuple[int,int,int]) -> None:
 		logger.debug("Changing instanced beams colour %s -> %s", self.opts['beams_colour']['value'], new_colour)
 		self.opts['beams_colour']['value'] = new_colour
-		if self.data['num_sats'] > 0:
-			new_cols_array = vcolor_array.ColorArray([colours.normaliseColour(self.opts['beams_colour']['value'])]*self.data['num_sats'])
-			self.visuals['beams'].instance_colors = new_cols_array
+		if self.visuals['beams'] is not None:
+			self.visuals['beams'].color = colours.normaliseColour(self.opts['beams_colour']['value'])
 			self._updateLineVisualsOptions()
 
 	def setBeamsAlpha(self, alpha:float) -> None:
@@ -452,33 +424,8 @@ class InstancedConstellationBeams(base_assets.AbstractVispyAsset):
 
 	def _updateLineVisualsOptions(self) -> None:
 		if self.visuals['circles'] is not None:
-			self.visuals['circles'].set_data(width=self.opts['circle_width']['value'],
-											 color=colours.normaliseColour(self.opts['beams_colour']['value']))
-
-	def _genBeamCircles(self, instance_transforms:list[nptyping.NDArray]|nptyping.NDArray,
-							 instance_positions:list[nptyping.NDArray]|nptyping.NDArray) -> nptyping.NDArray | None:
-		total_len = 0
-		gen_conn = False
-		circles = None
-		if self.data['c_conn'] is None:
-			gen_conn = True
-
-		for ii in range(len(instance_transforms)):
-			circle = np.dot(instance_transforms[ii],self.data['generic_circle_points'].T).T + instance_positions[ii]
-			poly_len = len(circle)
-			new_conn = np.array([np.arange(poly_len-1),np.arange(1,poly_len)]).T + total_len
-			if gen_conn:
-				if self.data['c_conn'] is not None:
-					self.data['c_conn'] = np.vstack((self.data['c_conn'],new_conn))
-				else:
-					self.data['c_conn'] = new_conn
-			total_len += poly_len
-			if circles is not None:
-				circles = np.vstack((circles, circle))
-			else:
-				circles = circle
-
-		return circles
+			self.visuals['circles'].set_width(self.opts['circle_width']['value'])
+			self.visuals['circles'].set_color(colours.normaliseColour(self.opts['beams_colour']['value']))
 
 class ConstellationBeams(base_assets.AbstractVispyAsset):
 	def __init__(self, name:str|None=None, v_parent:ViewBox|None=None):
@@ -486,7 +433,8 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 		self._setDefaultOptions()
 		self._initData()
 		self._instantiateAssets()
-		self._createVisuals()
+		# Can't create merged mesh until source set, -> _createVisuals must be called after first time source set
+		self._first_creation = True
 		self.visuals['beams'] = None
 		self._attachToParentView()
 
@@ -496,7 +444,7 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 		self.data['coords'] = None
 		self.data['curr_index'] = 0
 		self.data['num_sats'] = 0
-		self.data['start_beam_vec'] = np.array((0,0,1)).reshape(1,3)		
+		self.data['start_beam_vec'] = np.array((0,0,1)).reshape(1,3)
 
 	def setSource(self, *args, **kwargs) -> None:
 		# args[0] = num_sats
@@ -507,6 +455,7 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 		
 		if type(args[0]) is not int:
 			raise TypeError("args[0]:num_sats is not an int -> %s", args[0])
+		require_beam_reinstantiation = self.data['num_sats'] != args[0]
 		self.data['num_sats'] = args[0]
 
 		if type(args[1]) is not np.ndarray:
@@ -525,38 +474,33 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 			raise TypeError("args[4]:beam_angle_deg is not a float -> %s", args[4])
 		self.data['beam_angle_deg'] = args[4]
 
+		if self._first_creation or require_beam_reinstantiation:
+			self._detachFromParentView()
+			self._createVisuals()
+			self._first_creation = False
+		else:
+			self.visuals['beams'].set_trajectories(self.data['coords'])
+
 	def _instantiateAssets(self) -> None:
 		pass
 
 	def _createVisuals(self) -> None:
-		self.visuals['beams'] = []
-		instance_colours = np.tile(colours.normaliseColour(self.opts['beams_colour']['value']),(self.data['num_sats'],1))
-		instance_positions = self.data['coords'][:,self.data['curr_index'],:].reshape(-1,3)
-
-		instance_transforms = np.zeros((self.data['num_sats'],3,3))
-		for ii in range(self.data['num_sats']):
-			beam_axis = -1 * pg.unitVector(self.data['coords'][ii,self.data['curr_index'],:]).reshape(1,3)
-			instance_transforms[ii,:,:] = np.linalg.inv(Rotation.align_vectors(self.data['start_beam_vec'], beam_axis)[0].as_matrix())
-
+		# All beams are merged into a single mesh, so there is one draw call without needing instancing.
+		# Beams are pointed to nadir in the vertex shader, so only their positions are uploaded each timestep
+		vertices, faces = polyhedra.calcConeMesh((0,0,0),
+												self.data['beam_height'],
+												self.data['start_beam_vec'],
+												self.data['beam_angle_deg'],
+												theta_sample = 60)
+		self.visuals['beams'] = trajectory_beams.TrajectoryBeams(vertices,
+																faces,
+																self.data['coords'],
+																instanced=False,
+																color=colours.normaliseColour(self.opts['beams_colour']['value']),
+																parent=None)
+		self.visuals['beams'].set_index(self.data['curr_index'])
 		self.data['beams_alpha_filter'] = vFilters.Alpha(self.opts['beams_alpha']['value'])
-
-		for ii in range(self.data['num_sats']):
-			vertices, faces = polyhedra.calcConeMesh((0,0,0),
-													self.data['beam_height'],
-													self.data['start_beam_vec'],
-													self.data['beam_angle_deg'],
-													theta_sample = 60)
-			self.visuals['beams'].append(vVisuals.Mesh(vertices,
-													faces,
-													color=instance_colours[ii,:],
-													parent=None))
-			T = np.eye(4)
-			T[0:3,0:3] = instance_transforms[ii]
-			T[3,0:3] = instance_positions[ii]
-			transform = vTransforms.linear.MatrixTransform(T)
-			self.visuals['beams'][ii].transform = transform
-			self.visuals['beams'][ii].attach(self.data['beams_alpha_filter'])
-
+		self.visuals['beams'].attach(self.data['beams_alpha_filter'])
 
 	# Use AbstractVispyAsset.updateIndex()
 
@@ -564,26 +508,18 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 		if self.isFirstDraw():
 			self._detachFromParentView()
 			self._attachToParentView()
-			self._clearStaleFlag()
-		
-		if self.isStale():
+			self._clearFirstDrawFlag()
 
-			instance_transforms = np.zeros((self.data['num_sats'],3,3))
-			for ii in range(self.data['num_sats']):
-				beam_axis = -1 * pg.unitVector(self.data['coords'][ii,self.data['curr_index'],:]).reshape(1,3)
-				instance_transforms[ii,:,:] = np.linalg.inv(Rotation.align_vectors(self.data['start_beam_vec'], beam_axis)[0].as_matrix())
-			instance_positions = self.data['coords'][:,self.data['curr_index'],:].reshape(-1,3)
-
-			for ii in range(self.data['num_sats']):
-				T = np.eye(4)
-				T[0:3,0:3] = instance_transforms[ii,:,:]
-				T[3,0:3] = instance_positions[ii,:]
-				transform = vTransforms.linear.MatrixTransform(T)
-				self.visuals['beams'][ii].transform = transform
-			
+		if self.isStale():
+			self.visuals['beams'].set_index(self.data['curr_index'])
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
+	def mouseOver(self, index:int) -> Self:
+		return self
+
+	def restoreMouseOver(self) -> None:
+		return
 
 	def _setDefaultOptions(self) -> None:
 		self._dflt_opts = {}
@@ -605,13 +541,8 @@ class ConstellationBeams(base_assets.AbstractVispyAsset):
 	def setBeamsColour(self, new_colour:tuple[float,float,float]) -> None:
 		logger.debug("Changing beams colour %s -> %s", self.opts['beams_colour']['value'], new_colour)
 		self.opts['beams_colour']['value'] = new_colour
-		if self.data['num_sats'] > 0:
-			for ii in range(self.data['num_sats']):
-				n_faces = self.visuals['beams']._meshdata.n_faces
-				n_verts = self.visuals['beams']._meshdata.n_vertices
-				self.visuals['beams']._meshdata.set_face_colors(np.tile(colours.normaliseColour(new_colour),(n_faces,1)))
-				self.visuals['beams']._meshdata.set_vertex_colors(np.tile(colours.normaliseColour(new_colour),(n_verts,1)))
-			self.visuals['beams'].mesh_data_changed()
+		if self.visuals['beams'] is not None:
+			self.visuals['beams'].color = colours.normaliseColour(new_colour)
 		# self.visuals['circles'].set_data(color=colours.normaliseColour(new_colour))
 
 	def setBeamsAlpha(self, alpha:float) -> None:
@@ -54,6 +54,9 @@ class Earth3DAsset(base_assets.AbstractVispyAsset):
 		# rotation data
 		self.data['nullisland_topos'] = wgs84.latlon(0,0)
 		self.old_rot_rad = 0
+		# earth fixed visuals are children of this node, so rotating the earth only updates its transform
+		self.data['earth_frame'] = scene.Node(parent=self.data['v_parent'], name='Earth fixed frame')
+		self.data['earth_frame'].transform = vTransforms.MatrixTransform()
 
 	def setSource(self, *args, **kwargs) -> None:
 		if type(args[0]) is not timespan.TimeSpan:
@@ -65,8 +68,8 @@ class Earth3DAsset(base_assets.AbstractVispyAsset):
 			asset.setSource(self.data['datetimes'])
 
 	def _instantiateAssets(self) -> None:
-		self.assets['parallels'] = ParallelsGrid3DAsset(v_parent=self.data['v_parent'])
-		self.assets['meridians'] = MeridiansGrid3DAsset(v_parent=self.data['v_parent'])
+		self.assets['parallels'] = ParallelsGrid3DAsset(v_parent=self.data['earth_frame'])
+		self.assets['meridians'] = MeridiansGrid3DAsset(v_parent=self.data['earth_frame'])
 
 	def _createVisuals(self) -> None:
 		# Earth Sphere
@@ -86,21 +89,26 @@ class Earth3DAsset(base_assets.AbstractVispyAsset):
 													parent=None)
 	# Use AbstractVispyAsset.updateIndex()
 
+	def _attachToParentView(self) -> None:
+		super()._attachToParentView()
+		self.data['earth_frame'].parent = self.data['v_parent']
+		self.visuals['landmass'].parent = self.data['earth_frame']
+
 	def recomputeRedraw(self) -> None:
 		if self.isFirstDraw():
 			self._clearFirstDrawFlag()
 		if self.isStale():
 			# calculate rotation of earth
 			self.data['ecef_rads'] = pymap3d.sidereal.greenwichsrt(pymap3d.sidereal.juliandate(self.data['datetimes'][self.data['curr_index']]))
-			R = transforms.rotAround(self.data['ecef_rads'], pg.Z)
-			new_coords = R.dot(self.data['landmass'].T).T
+			T = np.eye(4)
+			T[0:3,0:3] = transforms.rotAround(self.data['ecef_rads'], pg.Z)
 
-			# redraw necessary visuals
-			# only need to rotate landmass. axis and sphere don't need to rotate
-			self.visuals['landmass'].set_data(new_coords)
+			# only the earth fixed frame rotates, axis and sphere don't need to rotate
+			# landmass, parallels and meridians inherit the rotation on the GPU
+			self.data['earth_frame'].transform.matrix = T.T
 
 			# recomputeRedraw child assets
-			self._recomputeRedrawChildren(rotation=R)
+			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
 	
@@ -408,17 +416,13 @@ class MeridiansGrid3DAsset(base_assets.AbstractSimpleVispyAsset):
 								antialias=True,
 								connect=self.data['m_conn'],
 								parent=None)
-		self.setTransform()
 
 	def setTransform(self, pos:tuple[float,float,float]|nptyping.NDArray=(0,0,0),
 						 rotation:nptyping.NDArray=np.eye(3)) -> None:
+		# rotation of the earth is applied by the parent earth fixed frame
 		if self.isFirstDraw():
 			self._clearFirstDrawFlag()
 		if self.isStale():
-			T = np.eye(4)
-			T[0:3,0:3] = rotation
-			T[0:3,3] = np.asarray(pos).reshape(-1,3)
-			self.visuals['meridians'].transform = vTransforms.linear.MatrixTransform(T.T)
 			self._clearStaleFlag()
 
 	def _setDefaultOptions(self) -> None:
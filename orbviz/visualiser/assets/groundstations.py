@@ -12,10 +12,13 @@ import orbviz.model.geometry.spherical as spherical_geom
 import orbviz.util.constants as c
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.colours as colours
-import orbviz.visualiser.visuals.polygons as polygon_visuals
+import orbviz.visualiser.visuals.small_circle_patches as small_circle_visuals
 
 logger = logging.getLogger(__name__)
 
+# change in central angle of an over the horizon circle before it is recomputed [deg]
+OTH_RECOMPUTE_THRESHOLD = 0.05
+
 class GroundStation3DAsset(base_assets.AbstractVispyAsset):
 	def __init__(self, name=None, v_parent=None):
 		super().__init__(name, v_parent)
@@ -181,12 +184,11 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 
 		self.data['strings'] = []
 
-		self.data['oth_edge1'] = -1*np.ones((364,2))
-		# need to create a valid polygon for instantiation (but before valid data exists)
-		self.data['oth_edge1'][:363,0] = np.arange(0,363)
-		self.data['oth_edge1'][-1,1] = -1
-		self.data['oth_edge1'][-2,1] = -2
-		self.data['oth_edge2'] = self.data['oth_edge1'].copy()
+		self.data['oth_phis'] = np.zeros(0)
+		self.data['oth_patches'] = np.zeros((0,2*spherical_geom.SMALL_CIRCLE_NUM_LATS+4,2))
+		self.data['oth_circle_splits'] = np.zeros(0, dtype=bool)
+		self.data['oth_colours'] = np.zeros((0,4))
+		self.data['oth_visible'] = np.zeros(0, dtype=bool)
 
 	def _instantiateAssets(self):
 		pass
@@ -204,43 +206,15 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 										symbol=self.opts['groundstation_marker_style']['value'])
 		self.visuals['marker'].order = -1
 
-	def _removeVisuals(self):
-		if 'oth_circles1' in self.visuals.keys():
-			for visual in self.visuals['oth_circles1']:
-				visual.parent=None
-			del self.visuals['oth_circles1']
-
-		if 'oth_circles2' in self.visuals.keys():
-			for visual in self.visuals['oth_circles2']:
-				visual.parent=None
-			del self.visuals['oth_circles2']
+		# every station's coverage region, in a single mesh
+		self.visuals['oth_circles'] = small_circle_visuals.SmallCirclePatches(border_width=2, parent=None)
+		self.visuals['oth_circles'].order = 1
+		self.visuals['oth_circles'].set_gl_state('translucent', depth_test=False)
+		self.visuals['oth_circles'].visible = self.opts['plot_over_the_horizon_circle']['value']
 
+	def _removeVisuals(self):
+		self.visuals['oth_circles'].parent = None
 		self.visuals['marker'].parent = None
-	def _recreateOTHCircleVisuals(self):
-
-		self._removeVisuals()
-
-		self.visuals['oth_circles1'] = []
-		self.visuals['oth_circles2'] = []
-		for ii in range(len(self.data['oth_edges1'])):
-			v = polygon_visuals.FastPolygon(self.data['oth_edges1'][ii],
-												color=colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value']),
-												border_color=colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value']),
-												border_width=2,
-												parent=None)
-			v.opacity = self.opts['over_the_horizon_circle_alpha']['value']
-			v.order = 1
-			v.set_gl_state('translucent', depth_test=False)
-			self.visuals['oth_circles1'].append(v)
-			v2 = polygon_visuals.FastPolygon(self.data['oth_edges2'][ii],
-												color=colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value']),
-												border_color=colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value']),
-												border_width=2,
-												parent=None)
-			v2.opacity = self.opts['over_the_horizon_circle_alpha']['value']
-			v2.order = 1
-			v2.set_gl_state('translucent', depth_test=False)
-			self.visuals['oth_circles2'].append(v2)
 
 	def setSource(self, *args, **kwargs):
 		# args[0] groundstation data
@@ -257,9 +231,6 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 
 		self.data['strings'] = []
 		self.data['min_elevations'] = []
-		self.data['oth_edges1'] = []
-		self.data['oth_edges2'] = []
-		self.data['oth_circle_splits'] = []
 
 		if self.data['groundstations'].isEnabled():
 			self.groundstations_enabled = True
@@ -277,19 +248,12 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 				self.data['strings'].append(station.name)
 				self.data['min_elevations'].append(station.min_elevation)
 
-				edge1_data, edge2_data, split = self.calcOTHCircle(self.data['min_elevations'][ii], self.data['coords'][ii])
-				self.data['oth_edges1'].append(edge1_data)
-				self.data['oth_edges2'].append(edge2_data)
-				self.data['oth_circle_splits'].append(split)
-
-			self._recreateOTHCircleVisuals()
-			for ii in range(len(stations.values())):
-				if self.data['oth_circle_splits'][ii]:
-					self.visuals['oth_circles1'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']
-					self.visuals['oth_circles2'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']
-				else:
-					self.visuals['oth_circles1'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']/2
-					self.visuals['oth_circles2'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']/2
+			self.data['min_elevations'] = np.asarray(self.data['min_elevations'])
+			self.data['oth_colours'] = np.tile(np.hstack((colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value']),
+															self.opts['over_the_horizon_circle_alpha']['value'])),
+												(num_stations,1))
+			self.data['oth_visible'] = np.ones(num_stations, dtype=bool)
+			self._updateOTHCircles(force=True)
 
 		else:
 			# groundstations not enabled
@@ -317,6 +281,8 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 			self._clearFirstDrawFlag()
 		if self.isStale():
 			self._updateMarkers()
+			if self.groundstations_enabled:
+				self._updateOTHCircles()
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
@@ -402,48 +368,89 @@ class GroundStation2DAsset(base_assets.AbstractVispyAsset):
 		self._updateMarkers()
 
 	def setOTHCircleAlpha(self, alpha):
-		# Takes a little while to take effect.
 		logger.debug("Changing groundstation OTH alpha %s -> %s",  self.opts['over_the_horizon_circle_alpha']['value'], alpha)
 		self.opts['over_the_horizon_circle_alpha']['value'] = alpha
-		for ii in range(len(self.visuals['oth_circles1'])):
-			if self.data['oth_circle_splits'][ii]:
-				self.visuals['oth_circles1'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']
-				self.visuals['oth_circles2'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']
-			else:
-				self.visuals['oth_circles1'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']/2
-				self.visuals['oth_circles2'][ii].opacity = self.opts['over_the_horizon_circle_alpha']['value']/2
+		self.data['oth_colours'][:,3] = alpha
+		self._updateOTHCircleColours()
 
 	def setOTHCircleColour(self, new_colour):
 		logger.debug("Changing groundstation OTH colour %s -> %s", self.opts['over_the_horizon_circle_colour']['value'], new_colour)
 		self.opts['over_the_horizon_circle_colour']['value'] = new_colour
-		for ii in range(len(self.visuals['oth_circles1'])):
-			self.visuals['oth_circles1'][ii].color = colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value'])
-			self.visuals['oth_circles2'][ii].color = colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value'])
-			self.visuals['oth_circles1'][ii].border_color = colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value'])
-			self.visuals['oth_circles2'][ii].border_color = colours.normaliseColour(self.opts['over_the_horizon_circle_colour']['value'])
+		self.data['oth_colours'][:,:3] = colours.normaliseColour(new_colour)
+		self._updateOTHCircleColours()
 
 	def setOTHCircleVisibility(self, state):
 		self.opts['plot_over_the_horizon_circle']['value'] = state
-		for ii in range(len(self.visuals['oth_circles1'])):
-			self.visuals['oth_circles1'][ii].visible = self.opts['plot_over_the_horizon_circle']['value']
-			self.visuals['oth_circles2'][ii].visible = self.opts['plot_over_the_horizon_circle']['value']
-
-	def calcOTHCircle(self, min_elevation:float, center:np.ndarray[tuple[int],np.dtype[np.float64]]):
+		self.visuals['oth_circles'].visible = state
+
+	def setStationOTHCircleColour(self, station_idx:int, new_colour:tuple[int,int,int]) -> None:
+		'''Set the colour of a single station's over the horizon circle.'''
+		self.data['oth_colours'][station_idx,:3] = colours.normaliseColour(new_colour)
+		self._updateOTHCircleColours()
+
+	def setStationOTHCircleVisibility(self, station_idx:int, state:bool) -> None:
+		'''Set whether a single station's over the horizon circle is drawn.'''
+		self.data['oth_visible'][station_idx] = state
+		self._updateOTHCircleColours()
+
+	def _updateOTHCircles(self, force:bool=False) -> None:
+		# circles only move with the primary's altitude, so only recompute stations whose
+		# central angle has changed noticeably since they were last computed
+		phis = self._calcOTHCentralAngles(self.data['min_elevations'])
+		if force or len(self.data['oth_phis']) != len(phis):
+			changed = np.ones(len(phis), dtype=bool)
+			self.data['oth_phis'] = phis.copy()
+			self.data['oth_patches'] = np.zeros((len(phis),2,2*spherical_geom.SMALL_CIRCLE_NUM_LATS+4,2))
+			self.data['oth_circle_splits'] = np.zeros(len(phis), dtype=bool)
+		else:
+			changed = np.abs(phis - self.data['oth_phis']) > OTH_RECOMPUTE_THRESHOLD
+			if not np.any(changed):
+				return
+		self.data['oth_phis'][changed] = phis[changed]
+		self.data['oth_patches'][changed], self.data['oth_circle_splits'][changed] = \
+			self.calcOTHCircles(phis[changed], self.data['coords'][changed])
+		# all first patches, then all second patches
+		patches = np.concatenate((self.data['oth_patches'][:,0], self.data['oth_patches'][:,1]))
+		self.visuals['oth_circles'].set_patches(patches, colors=self._calcOTHPatchColours())
+
+	def _updateOTHCircleColours(self) -> None:
+		if len(self.data['oth_colours']) == 0:
+			return
+		self.visuals['oth_circles'].set_colors(self._calcOTHPatchColours())
+
+	def _calcOTHPatchColours(self) -> np.ndarray:
+		colours1 = self.data['oth_colours'].copy()
+		colours1[~self.data['oth_visible'],3] = 0
+		colours2 = colours1.copy()
+		# second patch only exists when the circle is split across the map edge
+		colours2[~self.data['oth_circle_splits'],3] = 0
+		return np.vstack((colours1, colours2))
+
+	def _calcOTHCentralAngles(self, min_elevations:np.ndarray) -> np.ndarray:
 		prim_orbit = list(self.data['history_src'].getOrbits().values())[0]
 		eci_pos = prim_orbit.pos[self.data['curr_index']]
 		alt = np.linalg.norm(eci_pos)
-		phi = np.rad2deg(self._calcCentralAngle(alt, min_elevation))
-		lats, lons1, lons2 = spherical_geom.genSmallCircleCenterSubtendedAngle(phi*2, center[1], center[0])
-		circle1, circle2 = spherical_geom.splitSmallCirclePatch(center[0], center[1], lats, lons1, lons2)
-
-		if np.all(circle1 == circle2):
-			split = False
-		else:
-			split = True
-
-		return self._scale(circle1), self._scale(circle2), split
-
-	def _calcCentralAngle(self, alt:float, min_elevation:float) -> float:
+		return np.rad2deg(self._calcCentralAngle(alt, min_elevations))
+
+	def calcOTHCircles(self, phis:np.ndarray, centers:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+		'''Calculate the scaled over the horizon circle patches of each station.
+
+		Args:
+			phis (np.ndarray): central angle to the edge of each station's circle [deg]
+			centers (np.ndarray): (lon, lat) of each station [deg]
+
+		Returns:
+			tuple[np.ndarray, np.ndarray]: (n,2,num_vertices,2) scaled vertices of the two patches of each circle,
+				and whether each circle is split across the map edge
+		'''
+		circles1, circles2, splits = spherical_geom.genSmallCirclePatches(phis*2, centers[:,1], centers[:,0])
+		patches = np.stack((spherical_geom.padSmallCirclePatches(circles1),
+							spherical_geom.padSmallCirclePatches(circles2)), axis=1)
+		patches[...,0] = (patches[...,0] + 180) * self.data['horiz_pixel_scale']
+		patches[...,1] = (patches[...,1] + 90) * self.data['vert_pixel_scale']
+		return patches, splits
+
+	def _calcCentralAngle(self, alt:float, min_elevation:float|np.ndarray) -> float|np.ndarray:
 		central_el = np.deg2rad(min_elevation)+np.pi/2
 		alpha = np.arcsin(c.R_EARTH*np.sin(central_el)/(alt))
 		return np.pi-alpha-central_el
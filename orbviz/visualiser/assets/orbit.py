@@ -5,13 +5,13 @@ from typing import Any
 import numpy as np
 import spherapy.orbit as orbit
 
-from vispy import scene
 from vispy.scene.widgets.viewbox import ViewBox
 
 import orbviz.model.data_models.history_data as history_data
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.colours as colours
 import orbviz.visualiser.interface.console as console
+import orbviz.visualiser.visuals.orbit_path as orbit_path_visuals
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +29,8 @@ class Orbit3DAsset(base_assets.AbstractVispyAsset):
 	def _initData(self) -> None:
 		if self.data['name'] is None:
 			self.data['name'] = 'Primary Orbit'
-		self.data['past'] = None
-		self.data['future'] = None
-		self.data['past_coords'] = None
-		self.data['future_coords'] = None
-		self.data['future_conn'] = None
 		self.data['coords'] = np.zeros((4,3))
 		self.data['curr_index'] = 2
-		self._sliceData()
 
 	def setSource(self, *args, **kwargs) -> None:
 		sats_dict = args[0]
@@ -46,6 +40,8 @@ class Orbit3DAsset(base_assets.AbstractVispyAsset):
 			raise TypeError
 		if hasattr(first_sat_orbit,'pos'):
 			self.data['coords'] = first_sat_orbit.pos
+			# whole orbit is uploaded once, the past/future split is applied by the visual
+			self.visuals['path'].set_data(pos=self.data['coords'])
 			logger.debug('Setting source:coordinates for %s', self)
 		else:
 			console.sendErr('Orbit has no position data')
@@ -57,30 +53,24 @@ class Orbit3DAsset(base_assets.AbstractVispyAsset):
 		pass
 		
 	def _createVisuals(self) -> None:
-		self.visuals['past'] = scene.visuals.Line(self.data['past_coords'],
-													color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
-													antialias=True,
-													width = self.opts['orbital_path_width']['value'],
-													parent=None)
-		self.visuals['future'] = scene.visuals.Line(self.data['future_coords'],
-													color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
-													antialias=True,
-													width = self.opts['orbital_path_width']['value'],
-													parent=None)
+		self.visuals['path'] = orbit_path_visuals.OrbitPath(self.data['coords'],
+															color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
+															antialias=True,
+															width=self.opts['orbital_path_width']['value'],
+															dash_size=self.opts['orbital_path_future_dash_size']['value'],
+															parent=None)
 
 	# Override AbstractVispyAsset.updateIndex()
 	def updateIndex(self, index:int) -> None:
 		self.data['curr_index'] = index
 		self.setStaleFlagRecursive()
-		self._sliceData()
 		self._updateIndexChildren(index)
 
 	def recomputeRedraw(self) -> None:
 		if self.isFirstDraw():
 			self._clearFirstDrawFlag()
 		if self.isStale():
-			self.visuals['past'].set_data(pos=self.data['past_coords'])
-			self.visuals['future'].set_data(pos=self.data['future_coords'], connect=self.data['future_conn'])
+			self.visuals['path'].set_index(self.data['curr_index'])
 
 			# recomputeRedraw child assets
 			self._recomputeRedrawChildren()
@@ -144,41 +134,30 @@ class Orbit3DAsset(base_assets.AbstractVispyAsset):
 	#----- OPTIONS CALLBACKS -----#	
 	def setOrbitColour(self, new_colour:tuple[float,float,float]) -> None:
 		self.opts['orbital_path_colour']['value'] = colours.normaliseColour(new_colour)
-		self.visuals['past'].set_data(color=colours.normaliseColour(new_colour))
-		self.visuals['future'].set_data(color=colours.normaliseColour(new_colour))
+		self.visuals['path'].set_data(color=colours.normaliseColour(new_colour))
 
 	def setFutureDashSize(self, value:int) -> None:
 		self.opts['orbital_path_future_dash_size']['value'] = value
-		self.updateIndex(self.data['curr_index'])
-		self.recomputeRedraw()
+		self.visuals['path'].set_dash(value)
 
 	def setOrbitalPathWidth(self, value:int) -> None:
 		self.opts['orbital_path_width']['value'] = value
-		self.visuals['past'].set_data(pos=self.data['past_coords'], width=value)
-		self.visuals['future'].set_data(pos=self.data['future_coords'], connect=self.data['future_conn'], width=value)
+		self.visuals['path'].set_data(width=value)
 
 	def setOrbitalPathFutureVisibility(self, state:bool) -> None:
 		self.opts['plot_orbital_path_future']['value'] = state
-		self.visuals['future'].visible = self.opts['plot_orbital_path_future']['value']
+		self._updatePathPartsVisibility()
 
 	def setOrbitalPathPastVisibility(self, state:bool) -> None:
 		self.opts['plot_orbital_path_past']['value'] = state
-		self.visuals['past'].visible = self.opts['plot_orbital_path_past']['value']
+		self._updatePathPartsVisibility()
 
 	
 
 	#----- HELPER FUNCTIONS -----#
-	def _sliceData(self) -> None:
-		self.data['past_coords'] = self.data['coords'][:self.data['curr_index']]
-		self.data['future_coords'] = self.data['coords'][self.data['curr_index']:]
-
-		coords_len = len(self.data['coords'])
-		dash_size = self.opts['orbital_path_future_dash_size']['value']
-		padded_len = coords_len - coords_len%(2*dash_size)
-
-		conn = np.arange(padded_len-1,-1,-1).reshape(-1,dash_size*2)[:,:dash_size].reshape(1,-1)[0]
-		conn = conn[np.where(conn > self.data['curr_index'])]
-		self.data['future_conn'] = np.vstack((conn,conn-1)).T - self.data['curr_index']
+	def _updatePathPartsVisibility(self) -> None:
+		self.visuals['path'].set_parts_visible(past=self.opts['plot_orbital_path_past']['value'],
+												future=self.opts['plot_orbital_path_future']['value'])
 
 
 class Orbit2DAsset(base_assets.AbstractVispyAsset):
@@ -195,18 +174,11 @@ class Orbit2DAsset(base_assets.AbstractVispyAsset):
 	def _initData(self) -> None:
 		if self.data['name'] is None:
 			self.data['name'] = 'Primary Orbit'
-		self.data['past'] = None
-		self.data['future'] = None
 		self.data['trans_idx'] = None
-		self.data['past_coords'] = None
-		self.data['past_conn'] = None
-		self.data['future_coords'] = None
-		self.data['future_conn'] = None
 		self.data['coords'] = np.zeros((4,2))
 		self.data['scaled_coords'] = np.zeros((4,2))
 		self.data['curr_index'] = 2
 		self._findLongitudinalTransitions()
-		self._sliceData()
 
 	def setSource(self, *args, **kwargs) -> None:
 		# args[0] history data
@@ -223,6 +195,8 @@ class Orbit2DAsset(base_assets.AbstractVispyAsset):
 			lon = ((first_sat_orbit.lon + 180) * self.data['horiz_pixel_scale']).reshape(-1,1)
 			self.data['scaled_coords'] = np.hstack((lon,lat))
 			self._findLongitudinalTransitions()
+			# whole orbit is uploaded once, the past/future split is applied by the visual
+			self.visuals['path'].set_data(pos=self.data['scaled_coords'], cut_idxs=self.data['trans_idx'])
 			logger.debug('Setting source:coordinates for %s', self)
 		else:
 			console.sendErr('Orbit has no position data')
@@ -243,33 +217,26 @@ class Orbit2DAsset(base_assets.AbstractVispyAsset):
 		pass
 
 	def _createVisuals(self) -> None:
-		self.visuals['past'] = scene.visuals.Line(self.data['past_coords'],
-													color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
-													antialias=False,
-													width = self.opts['orbital_path_width']['value'],
-													parent=None)
-		self.visuals['past'].antialias=1
-		self.visuals['future'] = scene.visuals.Line(self.data['future_coords'],
-													color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
-													antialias=True,
-													width = self.opts['orbital_path_width']['value'],
-													parent=None)
-		self.visuals['future'].antialias=1
+		self.visuals['path'] = orbit_path_visuals.OrbitPath(self.data['scaled_coords'],
+															color=colours.normaliseColour(self.opts['orbital_path_colour']['value']),
+															antialias=True,
+															width=self.opts['orbital_path_width']['value'],
+															dash_size=self.opts['orbital_path_future_dash_size']['value'],
+															cut_idxs=self.data['trans_idx'],
+															parent=None)
 
 
 	# Override AbstractVispyAsset.updateIndex()
 	def updateIndex(self, index:int) -> None:
 		self.data['curr_index'] = index
 		self.setStaleFlagRecursive()
-		self._sliceData()
 		self._updateIndexChildren(index)
 
 	def recomputeRedraw(self) -> None:
 		if self.isFirstDraw():
 			self._clearFirstDrawFlag()
 		if self.isStale():
-			self.visuals['past'].set_data(pos=self.data['past_coords'], connect=self.data['past_conn'])
-			self.visuals['future'].set_data(pos=self.data['future_coords'], connect=self.data['future_conn'])
+			self.visuals['path'].set_index(self.data['curr_index'])
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
@@ -335,45 +302,28 @@ class Orbit2DAsset(base_assets.AbstractVispyAsset):
 	#----- OPTIONS CALLBACKS -----#
 	def setOrbitColour(self, new_colour:tuple[float,float,float]) -> None:
 		self.opts['orbital_path_colour']['value'] = colours.normaliseColour(new_colour)
-		self.visuals['past'].set_data(color=colours.normaliseColour(new_colour))
-		self.visuals['future'].set_data(color=colours.normaliseColour(new_colour))
+		self.visuals['path'].set_data(color=colours.normaliseColour(new_colour))
 
 	def setFutureDashSize(self, value:int) -> None:
 		self.opts['orbital_path_future_dash_size']['value'] = value
-		self.updateIndex(self.data['curr_index'])
-		self.recomputeRedraw()
+		self.visuals['path'].set_dash(value)
 
 	def setOrbitalPathWidth(self, value:int) -> None:
 		self.opts['orbital_path_width']['value'] = value
-		self.visuals['past'].set_data(pos=self.data['past_coords'], connect=self.data['past_conn'], width=value)
-		self.visuals['future'].set_data(pos=self.data['future_coords'], connect=self.data['future_conn'], width=value)
+		self.visuals['path'].set_data(width=value)
 
 	def setOrbitalPathFutureVisibility(self, state:bool) -> None:
 		self.opts['plot_orbital_path_future']['value'] = state
-		self.visuals['future'].visible = self.opts['plot_orbital_path_future']['value']
+		self._updatePathPartsVisibility()
 
 	def setOrbitalPathPastVisibility(self, state:bool) -> None:
 		self.opts['plot_orbital_path_past']['value'] = state
-		self.visuals['past'].visible = self.opts['plot_orbital_path_past']['value']
+		self._updatePathPartsVisibility()
 
 	def _findLongitudinalTransitions(self) -> None:
 		self.data['trans_idx'] = np.where(np.abs(np.diff(self.data['coords'][:,0]))>300)[0]
 
 	#----- HELPER FUNCTIONS -----#
-	def _sliceData(self) -> None:
-		self.data['past_coords'] = self.data['scaled_coords'][:self.data['curr_index']]
-		self.data['future_coords'] = self.data['scaled_coords'][self.data['curr_index']:]
-		self.data['future_unscaled_coords'] = self.data['coords'][self.data['curr_index']:]
-
-		coords_len = len(self.data['coords'])
-		dash_size = self.opts['orbital_path_future_dash_size']['value']
-		padded_len = coords_len - coords_len%(2*dash_size)
-
-		conn = np.arange(padded_len-1,-1,-1).reshape(-1,dash_size*2)[:,:dash_size].reshape(1,-1)[0]
-		conn = conn[np.where(conn > self.data['curr_index'])]
-		conn = conn[~np.isin(conn, self.data['trans_idx']+1)]
-		self.data['future_conn'] = np.vstack((conn,conn-1)).T - self.data['curr_index']
-
-		conn = np.arange(0,len(self.data['past_coords'])-1,1)
-		conn = conn[~np.isin(conn, self.data['trans_idx'])]
-		self.data['past_conn'] = np.vstack((conn,conn+1)).T
\ No newline at end of file
+	def _updatePathPartsVisibility(self) -> None:
+		self.visuals['path'].set_parts_visible(past=self.opts['plot_orbital_path_past']['value'],
+												future=self.opts['plot_orbital_path_future']['value'])
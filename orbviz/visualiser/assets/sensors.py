@@ -1,5 +1,7 @@
+import collections
 import datetime as dt
 import logging
+import time
 
 from typing import Any
 
@@ -7,20 +9,45 @@ import numpy as np
 import numpy.typing as nptyping
 from scipy.spatial.transform import Rotation
 
+from PyQt5 import QtCore
+
 import vispy.scene.visuals as vVisuals
 from vispy.scene.widgets.viewbox import ViewBox
 import vispy.visuals.filters as vFilters
 import vispy.visuals.transforms as vTransforms
 
+import orbviz
 import orbviz.model.data_models.data_types as orbviz_data_types
 import orbviz.model.geometry.polyhedra as polyhedra
+import orbviz.model.geometry.spherical as spherical_geom
 import orbviz.model.lens_models.pinhole as pinhole
+import orbviz.model.lens_models.ray_tables as ray_tables
+import orbviz.model.tiled_render as tiled_render
 import orbviz.util.conversion as orbviz_conversion
+import orbviz.util.threading as threading
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.colours as colours
+import orbviz.visualiser.visuals.polygons as polygon_visuals
 
 logger = logging.getLogger(__name__)
 
+# time the index must be held still before refining a sensor image [ms]
+REFINEMENT_DELAY = 250
+# default size of the longest side of a sensor image preview [px]
+DFLT_PREVIEW_1D_RESOLUTION = 480
+# default target time to raycast the previews of all displayed sensor views [ms]
+DFLT_PREVIEW_FRAME_TIME_BUDGET = 30
+# sensors are raycast together up to this many rays, above which the larger arrays cost more
+# in cache misses than is saved by sharing the per timestep setup
+MAX_BATCHED_RAYS = 50000
+# full resolution images with more pixels than this are raycast tile by tile to disk,
+# and are not reached by progressive refinement
+TILED_FULL_RES_MIN_PIXELS = 2**23
+# refinement levels are raycast in blocks of about this many pixels, checking for cancellation between blocks
+REFINEMENT_BLOCK_PIXELS = 2**16
+# preview images raycast ahead of playback are kept for at most this many indices
+MAX_PREFETCHED_PREVIEWS = 32
+
 class SensorSuite3DAsset(base_assets.AbstractCompoundVispyAsset):
 	def __init__(self, sc_id:int, sens_suite_dict:dict[str,Any], name:str|None=None, v_parent:ViewBox|None=None):
 		super().__init__(name, v_parent)
@@ -156,15 +183,25 @@ class Sensor3DAsset(base_assets.AbstractSimpleVispyAsset):
 		self.data['history_src'] = args[0]
 
 	def _createVisuals(self) -> None:
-		self.visuals['sensor_cone'] = vVisuals.Mesh(self.data['mesh_vertices'],
-    											self.data['mesh_faces'],
-    											color=colours.normaliseColour(self.opts['sensor_cone_colour']['value']),
-    											parent=None)
+		# filters stay attached to a pooled visual, so only reuse one with the same alpha
+		pool_key = ('sensor_cone', self.data['mesh_vertices'].shape, self.data['mesh_faces'].shape,
+					self.opts['sensor_cone_alpha']['value'])
+		if self._acquireVisual('sensor_cone', pool_key, self._newSensorConeVisual):
+			wireframe_filter = vFilters.WireframeFilter(width=1)
+			alpha_filter = vFilters.Alpha(self.opts['sensor_cone_alpha']['value'])
+			self.visuals['sensor_cone'].attach(alpha_filter)
+			self.visuals['sensor_cone'].attach(wireframe_filter)
+		else:
+			self.visuals['sensor_cone'].set_data(vertices=self.data['mesh_vertices'],
+													faces=self.data['mesh_faces'],
+													color=colours.normaliseColour(self.opts['sensor_cone_colour']['value']))
 		self.setTransform(rotation=Rotation.from_quat(self.data['bf_quat']).as_matrix().reshape(3,3))
-		wireframe_filter = vFilters.WireframeFilter(width=1)
-		alpha_filter = vFilters.Alpha(self.opts['sensor_cone_alpha']['value'])
-		self.visuals['sensor_cone'].attach(alpha_filter)
-		self.visuals['sensor_cone'].attach(wireframe_filter)
+
+	def _newSensorConeVisual(self) -> vVisuals.Mesh:
+		return vVisuals.Mesh(self.data['mesh_vertices'],
+								self.data['mesh_faces'],
+								color=colours.normaliseColour(self.opts['sensor_cone_colour']['value']),
+								parent=None)
 
 	def setTransform(self, pos:tuple[float,float,float]|nptyping.NDArray=(0,0,0),
 							 rotation:nptyping.NDArray|None=None, quat:nptyping.NDArray|None=None) -> None:
@@ -374,12 +411,15 @@ class Sensor2DAsset(base_assets.AbstractSimpleVispyAsset):
 		self.data['lowres'] = self._calcLowRes(self.data['res'])
 		self.data['fov'] = fov
 		self.data['lens_model'] = pinhole
-		# rays from each pixel in sensor frame
-		self.data['lowres_rays_sf'] = self.data['lens_model'].generatePixelRays(self.data['lowres'], self.data['fov'])
+		self.data['lowres_pix_per_rad'] = self.data['lens_model'].calcPixelAngularSize(self.data['lowres'], self.data['fov'])
+		# rays around the edge of the sensor frame, in order, the footprint is the projection of these alone
+		self.data['perimeter_rays_sf'] = self.data['lens_model'].generatePerimeterRays(self.data['lowres'], self.data['fov'])
 		# need to create a valid polygon for instantiation (but before valid data exists)
-		self.data['point_cloud'] = np.zeros((364,2))
-		self.data['point_cloud'][:363,0] = np.arange(0,363)
-		self.data['point_cloud'][-1,0] = -1
+		self.data['footprint_edge1'] = -1*np.ones((364,2))
+		self.data['footprint_edge1'][:363,0] = np.arange(0,363)
+		self.data['footprint_edge1'][-1,1] = -1
+		self.data['footprint_edge1'][-2,1] = -2
+		self.data['footprint_edge2'] = self.data['footprint_edge1'].copy()
 		self.data['last_transform'] = np.eye(4)
 		self.data['history_src'] = None
 		self.data['raycast_src'] = None
@@ -417,15 +457,22 @@ class Sensor2DAsset(base_assets.AbstractSimpleVispyAsset):
 		pass
 
 	def _createVisuals(self) -> None:
-		self.visuals['pixel_projection'] = vVisuals.Markers(parent=None,
-															scaling=False,
-															antialias=False)
-		self.visuals['pixel_projection'].set_data(pos=self.data['point_cloud'],
-													edge_width=1e-9,
-													face_color=colours.normaliseColour(self.opts['sensor_colour']['value']),
-													edge_color=colours.normaliseColour(self.opts['sensor_colour']['value']),
-													size=self.opts['sensor_pixel_size']['value'],
-													symbol='o')
+		for key in ('footprint1', 'footprint2'):
+			if not self._acquireVisual(key, ('sensor_footprint',), self._newFootprintVisual):
+				self.visuals[key].pos = self.data[f'footprint_edge{key[-1]}']
+				self.visuals[key].color = colours.normaliseColour(self.opts['sensor_colour']['value'])
+				self.visuals[key].border_color = colours.normaliseColour(self.opts['sensor_colour']['value'])
+			self.visuals[key].opacity = self.opts['sensor_footprint_alpha']['value']
+			self.visuals[key].order = 1
+			self.visuals[key].set_gl_state('translucent', depth_test=False)
+		self.data['footprint_split'] = False
+
+	def _newFootprintVisual(self) -> polygon_visuals.FastPolygon:
+		return polygon_visuals.FastPolygon(self.data['footprint_edge1'],
+											color=colours.normaliseColour(self.opts['sensor_colour']['value']),
+											border_color=colours.normaliseColour(self.opts['sensor_colour']['value']),
+											border_width=2,
+											parent=None)
 
 	def getDimensions(self) -> tuple[int, int]:
 		return self.data['lowres']
@@ -447,22 +494,29 @@ class Sensor2DAsset(base_assets.AbstractSimpleVispyAsset):
 			T[0:3,3] = np.asarray(pos).reshape(-1,3)
 
 			self.data['last_transform'] = T
-			lats,lons = self.data['raycast_src'].rayCastFromSensorFor2D(self.data['lowres'],
+			lats,lons = self.data['raycast_src'].rayCastFootprintFor2D(self.data['lowres'],
+																		self.data['lowres_pix_per_rad'],
 																		T,
-																		self.data['lowres_rays_sf'],
-																		self.data['curr_datetime'])
-			self._generatePolyLatLons(lats, lons)
-			self._updateMarkers()
+																		self.data['perimeter_rays_sf'],
+																		self.data['curr_datetime'],
+																		lens_model=self.data['lens_model'])
+			if len(lats) < 3:
+				# Earth not in view
+				for visual in self.visuals.values():
+					visual.visible = False
+			else:
+				self._generateFootprintPolygons(lats, lons)
+				for visual in self.visuals.values():
+					visual.visible = True
+				self._updateFootprints()
 			self._clearStaleFlag()
 
-	def _generatePolyLatLons(self, lats, lons):
-
-		surface_coords = np.hstack((lons.reshape(-1,1),lats.reshape(-1,1)))
-		surface_coords[:,0] = (surface_coords[:,0]+180) * self.data['horiz_pixel_scale']
-		surface_coords[:,1] = (surface_coords[:,1]+90) * self.data['vert_pixel_scale']
-		self.data['point_cloud'] = surface_coords
-
-		return
+	def _generateFootprintPolygons(self, lats:np.ndarray, lons:np.ndarray) -> None:
+		edge1, edge2, self.data['footprint_split'] = spherical_geom.splitLonLatPolygon(lats, lons)
+		for key, edge in (('footprint_edge1', edge1), ('footprint_edge2', edge2)):
+			edge[:,0] = (edge[:,0]+180) * self.data['horiz_pixel_scale']
+			edge[:,1] = (edge[:,1]+90) * self.data['vert_pixel_scale']
+			self.data[key] = edge
 
 	def _setDefaultOptions(self) -> None:
 		self._dflt_opts = {}
@@ -473,28 +527,34 @@ class Sensor2DAsset(base_assets.AbstractSimpleVispyAsset):
 												'static': True,
 												'callback': self.setSensorConeColour,
 												'widget_data': None}
-		self._dflt_opts['sensor_pixel_size'] = {'value': 1,
-												'type': 'number',
+		self._dflt_opts['sensor_footprint_alpha'] = {'value': 0.4,
+												'type': 'fraction',
 												'help': '',
 												'static': True,
-												'callback': self.setPixelSize,
-											'widget_data': None}
+												'callback': self.setFootprintAlpha,
+												'widget_data': None}
 		self.opts = self._dflt_opts.copy()
 
 	#----- OPTIONS CALLBACKS -----#
-	def _updateMarkers(self):
-		self.visuals['pixel_projection'].set_data(pos=self.data['point_cloud'],
-											size=self.opts['sensor_pixel_size']['value'],
-											face_color=colours.normaliseColour(self.opts['sensor_colour']['value']),
-											edge_color=colours.normaliseColour(self.opts['sensor_colour']['value']))
+	def _updateFootprints(self):
+		# an unsplit footprint is drawn by both patches on top of each other
+		if self.data['footprint_split']:
+			alpha = self.opts['sensor_footprint_alpha']['value']
+		else:
+			alpha = self.opts['sensor_footprint_alpha']['value']/2
+		for key in ('footprint1', 'footprint2'):
+			self.visuals[key].pos = self.data[f'footprint_edge{key[-1]}']
+			self.visuals[key].opacity = alpha
 
 	def setSensorConeColour(self, new_colour:tuple[float,float,float]) -> None:
 		self.opts['sensor_colour']['value'] = new_colour
-		self._updateMarkers()
+		for key in ('footprint1', 'footprint2'):
+			self.visuals[key].color = colours.normaliseColour(new_colour)
+			self.visuals[key].border_color = colours.normaliseColour(new_colour)
 
-	def setPixelSize(self, size):
-		self.opts['sensor_pixel_size']['value'] = size
-		self._updateMarkers()
+	def setFootprintAlpha(self, alpha:float) -> None:
+		self.opts['sensor_footprint_alpha']['value'] = alpha
+		self._updateFootprints()
 
 	def setSensorVisibility(self, state):
 		for visual in self.visuals.values():
@@ -547,7 +607,7 @@ class SensorSuiteImageAsset(base_assets.AbstractCompoundVispyAsset):
 			asset.setCurrentSunECI(sun_eci_pos)
 
 	def setCurrentMoonECI(self, moon_eci_pos:np.ndarray) -> None:
-		self.data['curr_sun_eci'] = moon_eci_pos
+		self.data['curr_moon_eci'] = moon_eci_pos
 		for asset in self.assets.values():
 			asset.setCurrentMoonECI(moon_eci_pos)
 
@@ -583,8 +643,35 @@ class SensorSuiteImageAsset(base_assets.AbstractCompoundVispyAsset):
 				logger.warning("Both rotation and quaternion passed to sensor suite: %s, don't know which one to use", self.data['name'])
 				raise ValueError("Both rotation and quaternion passed to sensor suite: %s, don't know which one to use", self.data['name'])
 
+			# sensors on the same spacecraft with the same settings are raycast together in one pass
+			raycast_groups:list[tuple[dict[str, Any], list[SensorImageAsset], list[dict[str, Any]]]] = []
 			for asset in self.assets.values():
-				asset.setTransform(pos=pos, rotation=rotation, quat=quat)
+				raycast_request = asset.prepareRaycast()
+				if raycast_request is None:
+					continue
+				raycast_options = asset.getRaycastOptions()
+				num_rays = len(raycast_request['sens_rays_cf'])
+				for group_options, group_assets, group_requests in raycast_groups:
+					if group_options == raycast_options and \
+							sum(len(request['sens_rays_cf']) for request in group_requests) + num_rays <= MAX_BATCHED_RAYS:
+						group_assets.append(asset)
+						group_requests.append(raycast_request)
+						break
+				else:
+					raycast_groups.append((raycast_options, [asset], [raycast_request]))
+
+			for raycast_options, group_assets, group_requests in raycast_groups:
+				start_time = time.perf_counter()
+				results = group_assets[0].data['raycast_src'].rayCastFromSensors(group_requests,
+																				self.data['curr_datetime'],
+																				self.data['curr_sun_eci'],
+																				self.data['curr_moon_eci'],
+																				**raycast_options)
+				raycast_time = time.perf_counter() - start_time
+				num_rays = max(sum(len(request['sens_rays_cf']) for request in group_requests), 1)
+				for asset, request, (img_data, mo_data) in zip(group_assets, group_requests, results, strict=True):
+					# attribute raycast time to each sensor by its share of the rays
+					asset.applyRaycast(img_data, mo_data, raycast_time*len(request['sens_rays_cf'])/num_rays)
 			self._clearStaleFlag()
 
 	def _setDefaultOptions(self) -> None:
@@ -612,6 +699,9 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 		self._instantiateAssets()
 		self._createVisuals()
 		self.counter = 0
+		self.refine_timer = QtCore.QTimer()
+		self.refine_timer.setSingleShot(True)
+		self.refine_timer.timeout.connect(self._startRefinement)
 		self._attachToParentView()
 
 	def _initData(self, sc_id:int, parent_suite_name:str, bf_quat:tuple[float, float, float, float], resolution:tuple[int,int], fov:tuple[float,float]) -> None:
@@ -621,13 +711,15 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 		self.data['parent_suite_name'] = parent_suite_name
 		self.data['bf_quat'] = bf_quat
 		self.data['res'] = resolution
-		self.data['lowres'] = self._calcLowRes(self.data['res'])
 		self.data['fov'] = fov
 		self.data['lens_model'] = pinhole
-		# rays from each pixel in sensor frame
-		self.data['lowres_rays_sf'] = self.data['lens_model'].generatePixelRays(self.data['lowres'], self.data['fov'])
-		self.data['lowres_pix_per_rad'] = self.data['lens_model'].calcPixelAngularSize(self.data['lowres'], self.data['fov'])
-		self.data['rays_sf'] = self.data['lens_model'].generatePixelRays(self.data['res'], self.data['fov'])
+		# size of the image within the view, independent of the preview resolution
+		self.data['view_dims'] = self._calcLowRes(self.data['res'])
+		self.data['preview_1D_res'] = DFLT_PREVIEW_1D_RESOLUTION
+		# time taken by the last preview raycast [s], None if no preview has been raycast since last read
+		self.data['preview_raycast_time'] = None
+		self._setLowResData(self._calcLowRes(self.data['res']))
+		# full resolution rays are only loaded from the ray tables when a full resolution image is raycast
 		self.data['pix_per_rad'] = self.data['lens_model'].calcPixelAngularSize(self.data['res'], self.data['fov'])
 		self.data['last_transform'] = np.eye(4)
 		self.data['history_src'] = None
@@ -637,12 +729,26 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 		self.data['curr_moon_eci'] = None
 		self.data['curr_quat'] = None
 		self.data['mo_data'] = None
+		# progressive refinement state
+		self.data['refine_level'] = 0
+		self.data['refine_generation'] = 0
+		self.data['refine_worker'] = None
+		self.data['disp_res'] = self.data['lowres']
+		self.data['disp_img'] = None
+		# temporal reprojection state
+		self.data['reproj_src'] = None
+		self.data['reproj_frame'] = None
+		self.data['reproj_time'] = 0
+		# previews raycast ahead of playback, by index
+		self.data['prefetched'] = collections.OrderedDict()
+		self.data['prefetch_worker'] = None
 
 	def setSource(self, *args, **kwargs) -> None:
 		# args[0] = history_src
 		# args[1] = raycast_src
 		self.data['history_src'] = args[0]
 		self.data['raycast_src'] = args[1]
+		self._clearPrefetchedPreviews()
 
 	def setCurrentDatetime(self, dt:dt.datetime) -> None:
 		self.data['curr_datetime'] = dt
@@ -653,9 +759,43 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 	def setCurrentMoonECI(self, moon_eci_pos:np.ndarray) -> None:
 		self.data['curr_moon_eci'] = moon_eci_pos
 
-	def _calcLowRes(self, true_resolution:tuple[int,int]) -> tuple[int,int]:
+	def _setLowResData(self, lowres:tuple[int,int]) -> None:
+		self.data['lowres'] = lowres
+		# rays from each pixel in sensor frame
+		self.data['lowres_rays_sf'] = ray_tables.getPixelRays(self.data['lens_model'], self.data['lowres'], self.data['fov'])
+		self.data['lowres_pix_per_rad'] = self.data['lens_model'].calcPixelAngularSize(self.data['lowres'], self.data['fov'])
+		self.data['refine_levels'] = self._calcRefinementLevels(self.data['lowres'], self.data['res'])
+
+	def getPreviewResolution(self) -> int:
+		return self.data['preview_1D_res']
+
+	def setPreviewResolution(self, max_1D_resolution:int) -> None:
+		''' Set the size of the longest side of the low resolution preview image, used from the next redraw'''
+		if max_1D_resolution == self.data['preview_1D_res']:
+			return
+		logger.debug("Setting preview resolution of %s to %s", self.data['name'], max_1D_resolution)
+		self.data['preview_1D_res'] = max_1D_resolution
+		self._setLowResData(self._calcLowRes(self.data['res'], max_1D_resolution=max_1D_resolution))
+
+	def popPreviewRaycastTime(self) -> float|None:
+		raycast_time = self.data['preview_raycast_time']
+		self.data['preview_raycast_time'] = None
+		return raycast_time
+
+	def _calcRefinementLevels(self, lowres:tuple[int,int], true_resolution:tuple[int,int]) -> list[tuple[int,int]]:
+		# 2x and 4x the preview resolution, then the native resolution
+		levels = []
+		for scale in (2,4):
+			level = (lowres[0]*scale, lowres[1]*scale)
+			if level[0] < true_resolution[0] and level[1] < true_resolution[1]:
+				levels.append(level)
+		if tuple(true_resolution) != tuple(lowres):
+			levels.append(tuple(true_resolution))
+		# large images are only held in memory as tiles
+		return [level for level in levels if level[0]*level[1] <= TILED_FULL_RES_MIN_PIXELS]
+
+	def _calcLowRes(self, true_resolution:tuple[int,int], max_1D_resolution:int=DFLT_PREVIEW_1D_RESOLUTION) -> tuple[int,int]:
 		lowres = [0,0]
-		max_1D_resolution = 480
 		aspect_ratio = true_resolution[0]/true_resolution[1]
 		if aspect_ratio > 1:
 			lowres = (max_1D_resolution, int(max_1D_resolution/aspect_ratio))
@@ -671,92 +811,407 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 	def _createVisuals(self) -> None:
 		# Earth Sphere
 		img_data = _generateRandomSensorData((self.data['lowres'][1], self.data['lowres'][0]))
-		self.data['mo_data'] = np.zeros((self.data['lowres'][1]*self.data['lowres'][0],3))
-		self.data['mo_data'][:,0] = -1
-		self.visuals['image'] = vVisuals.Image(
-			img_data,
-			# interpolation = 'nearest',
-			# texture_format="auto",
-			parent=None,
-		)
-		self.visuals['text'] = vVisuals.Text(f"Sensor: {self.data['name']}", color='red', anchor_x='left', anchor_y='bottom')
+		self.data['mo_data'] = np.zeros(self.data['lowres'][1]*self.data['lowres'][0], dtype=orbviz_data_types.MOUSE_OVER_DTYPE)
+		self.data['mo_data']['type'] = orbviz_data_types.MouseOverType.DUMMY
+		if not self._acquireVisual('image', ('sensor_image', img_data.shape), lambda: vVisuals.Image(img_data, parent=None)):
+			self.visuals['image'].set_data(img_data)
+			self.visuals['image'].transform = vTransforms.NullTransform()
+		self._acquireVisual('text', ('sensor_text',), lambda: vVisuals.Text(color='red', anchor_x='left', anchor_y='bottom'))
+		self.visuals['text'].text = f"Sensor: {self.data['name']}"
 		self.visuals['text'].pos = 5,5
 		self.visuals['text'].visible = self.opts['show_sensor_name']['value']
 
+	def _releaseVisuals(self) -> None:
+		# stop background raycasts, which would otherwise draw into visuals returned to the pool
+		self._cancelRefinement()
+		self._clearPrefetchedPreviews()
+		super()._releaseVisuals()
+
 	def getDimensions(self) -> tuple[int, int]:
-		return self.data['lowres']
+		return self.data['view_dims']
 
 	def setTransform(self, pos:tuple[float,float,float]|nptyping.NDArray=(0,0,0),
 							 rotation:nptyping.NDArray|None=None, quat:nptyping.NDArray|None=None) -> None:
+		raycast_request = self.prepareRaycast()
+		if raycast_request is not None:
+			start_time = time.perf_counter()
+			img_data, mo_data = self.data['raycast_src'].rayCastFromSensors([raycast_request],
+																self.data['curr_datetime'],
+																self.data['curr_sun_eci'],
+																self.data['curr_moon_eci'],
+																**self.getRaycastOptions())[0]
+			self.applyRaycast(img_data, mo_data, time.perf_counter() - start_time)
+
+	def prepareRaycast(self) -> dict[str, Any]|None:
+		'''Update the sensor transform for the current index.
+
+		Returns:
+			dict[str, Any]|None: sensor entry for EarthRayCastData.rayCastFromSensors to raycast
+				the preview image, None if the image does not need raycasting
+		'''
 		if self.isFirstDraw():
 			self._clearFirstDrawFlag()
 
-		if self.isStale() and self.isActive():
-			T = np.eye(4)
-			rot_mat = self.data['history_src'].getSCAttitude(self.data['sc_id']).getSensorAttitudeMatrix(self.data['parent_suite_name'],
-																												self.data['name'],
-																												self.data['curr_index'])
-			pos = self.data['history_src'].getOrbits()[self.data['sc_id']].pos[self.data['curr_index']]
-			self.data['curr_quat'] = self.data['history_src'].getSCAttitude(self.data['sc_id']).getSensorAttitudeQuat(self.data['parent_suite_name'],
-																												self.data['name'],
-																												self.data['curr_index'])
-			T[0:3,0:3] = rot_mat
-			T[0:3,3] = np.asarray(pos).reshape(-1,3)
-
-			self.data['last_transform'] = T
-			img_data, mo_data = self.data['raycast_src'].rayCastFromSensor(self.data['lowres'],
+		if not (self.isStale() and self.isActive()):
+			return None
+
+		T = np.eye(4)
+		rot_mat = self.data['history_src'].getSCAttitude(self.data['sc_id']).getSensorAttitudeMatrix(self.data['parent_suite_name'],
+																											self.data['name'],
+																											self.data['curr_index'])
+		pos = self.data['history_src'].getOrbits()[self.data['sc_id']].pos[self.data['curr_index']]
+		self.data['curr_quat'] = self.data['history_src'].getSCAttitude(self.data['sc_id']).getSensorAttitudeQuat(self.data['parent_suite_name'],
+																											self.data['name'],
+																											self.data['curr_index'])
+		T[0:3,0:3] = rot_mat
+		T[0:3,3] = np.asarray(pos).reshape(-1,3)
+
+		self.data['last_transform'] = T
+		self._cancelRefinement()
+		self.data['reproj_frame'] = None
+		self.data['reproj_time'] = 0
+		prefetched = self._popPrefetchedPreview(self.data['curr_index'])
+		if prefetched is not None:
+			self.applyRaycast(*prefetched)
+			return None
+		if self.opts['temporal_reprojection']['value'] and self.data['reproj_src'] is not None:
+			# only raycast the pixels which can't be reused from the previous preview
+			start_time = time.perf_counter()
+			img_data, mo_data, raycast_idxs = self.data['raycast_src'].reprojectSensorFrame(self.data['lowres'],
 																self.data['lowres_pix_per_rad'],
 																T,
-																self.data['lowres_rays_sf'],
 																self.data['curr_datetime'],
 																self.data['curr_sun_eci'],
-																self.data['curr_moon_eci'],
+																self.data['reproj_src'],
 																draw_eclipse=self.opts['solar_lighting']['value'],
-																draw_atm=self.opts['plot_atmosphere']['value'],
-																atm_height=self.opts['atmosphere_height']['value'],
-																atm_lit_colour=self.opts['atmosphere_lit_colour']['value'],
-																atm_eclipsed_colour=self.opts['atmosphere_eclipsed_colour']['value'],
-																draw_sun=self.opts['plot_sun']['value'],
-																sun_colour=self.opts['sun_colour']['value'],
-																draw_moon=self.opts['plot_moon']['value'],
-																moon_colour=self.opts['moon_colour']['value'],
-																highlight_edge=self.opts['highlight_limb']['value'],
-																highlight_height=self.opts['highlight_height']['value'],
-																highlight_colour=self.opts['highlight_colour']['value'])
-			self.data['mo_data'] = mo_data
-			data_reshaped = img_data.reshape(self.data['lowres'][1],self.data['lowres'][0],3)/255
-			self.visuals['image'].set_data(data_reshaped)
-			# setting data of ImageVisual doesn't refresh canvas, use text visual to refresh instead
-			self.visuals['text'].text = f"Sensor: {self.data['name']}"
-			self._clearStaleFlag()
+																max_error_px=self.opts['temporal_reprojection_error']['value'],
+																lens_model=self.data['lens_model'])
+			self.data['reproj_frame'] = (img_data, mo_data, raycast_idxs)
+			self.data['reproj_time'] = time.perf_counter() - start_time
+			return {'resolution':self.data['lowres'],
+					'pixels_per_radian':self.data['lowres_pix_per_rad'],
+					'sens_eci_transform':T,
+					'sens_rays_cf':self.data['lowres_rays_sf'][raycast_idxs],
+					'pixel_idxs':raycast_idxs,
+					'lens_model':self.data['lens_model']}
+		return {'resolution':self.data['lowres'],
+				'pixels_per_radian':self.data['lowres_pix_per_rad'],
+				'sens_eci_transform':T,
+				'sens_rays_cf':self.data['lowres_rays_sf'],
+				'lens_model':self.data['lens_model']}
+
+	def applyRaycast(self, img_data:np.ndarray, mo_data:np.ndarray, raycast_time:float) -> None:
+		'''Display a preview image raycast from the request returned by prepareRaycast.'''
+		if self.data['reproj_frame'] is not None:
+			reproj_img, reproj_mo_data, raycast_idxs = self.data['reproj_frame']
+			reproj_img[raycast_idxs] = img_data
+			reproj_mo_data[raycast_idxs] = mo_data
+			img_data, mo_data = reproj_img, reproj_mo_data
+			self.data['reproj_frame'] = None
+		self.data['preview_raycast_time'] = raycast_time + self.data['reproj_time']
+		self._setDisplayedImage(self.data['lowres'], img_data, mo_data)
+		self._storeReprojectionSource(img_data, mo_data)
+		self._scheduleRefinement()
+		self._clearStaleFlag()
+
+	def _storeReprojectionSource(self, img_data:np.ndarray, mo_data:np.ndarray) -> None:
+		if not self.opts['temporal_reprojection']['value']:
+			self.data['reproj_src'] = None
+			return
+		self.data['reproj_src'] = {'img':img_data,
+									'mo_data':mo_data,
+									'datetime':self.data['curr_datetime'],
+									'sun_eci':self.data['curr_sun_eci']}
+
+	#----- PREFETCHING -----#
+	def prefetchPreviews(self, indices:np.ndarray) -> None:
+		'''Start raycasting the preview images of upcoming indices, soonest first.
+
+		Previews are raycast on a worker at the current preview resolution and settings, and are
+		used in place of raycasting when their index is displayed, if neither has changed since.
+		'''
+		if orbviz.threadpool is None or not self.isActive() or self.data['history_src'] is None:
+			return
+		worker = self.data['prefetch_worker']
+		if worker is not None and (not worker.hasStarted() or worker.isRunning()):
+			return
+		history = self.data['history_src']
+		attitude = history.getSCAttitude(self.data['sc_id'])
+		orbit = history.getOrbits()[self.data['sc_id']]
+		jobs = []
+		for index in indices[:MAX_PREFETCHED_PREVIEWS]:
+			index = int(index)
+			if index in self.data['prefetched'] or not attitude.isAttitudeValid(index):
+				continue
+			T = np.eye(4)
+			T[0:3,0:3] = attitude.getSensorAttitudeMatrix(self.data['parent_suite_name'], self.data['name'], index)
+			T[0:3,3] = orbit.pos[index]
+			jobs.append((index, T, history.timespan[index], orbit.sun_pos[index], orbit.moon_pos[index]))
+		if len(jobs) == 0:
+			return
+		worker = threading.Worker(self._raycastPreviews,
+									jobs,
+									self.data['lowres'],
+									self.data['lowres_pix_per_rad'],
+									self.data['lowres_rays_sf'],
+									self.getRaycastOptions())
+		worker.signals.result.connect(self._storePrefetchedPreviews)
+		worker.setAutoDelete(True)
+		self.data['prefetch_worker'] = worker
+		orbviz.threadpool.logStart(worker)
+
+	def _raycastPreviews(self, jobs:list[tuple[int, np.ndarray, dt.datetime, np.ndarray, np.ndarray]],
+							lowres:tuple[int,int], pix_per_rad:float, rays_sf:np.ndarray,
+							raycast_options:dict[str,Any],
+							running:threading.Flag) -> list[tuple[int, tuple[int,int], dict[str,Any], np.ndarray, np.ndarray, float]]:
+		previews = []
+		for index, transform, curr_dt, sun_eci, moon_eci in jobs:
+			if not running:
+				break
+			start_time = time.perf_counter()
+			img_data, mo_data = self.data['raycast_src'].rayCastFromSensor(lowres,
+																pix_per_rad,
+																transform,
+																rays_sf,
+																curr_dt,
+																sun_eci,
+																moon_eci,
+																lens_model=self.data['lens_model'],
+																**raycast_options)
+			previews.append((index, lowres, raycast_options, img_data, mo_data, time.perf_counter() - start_time))
+		return previews
+
+	def _storePrefetchedPreviews(self, previews:list[tuple[int, tuple[int,int], dict[str,Any], np.ndarray, np.ndarray, float]]) -> None:
+		for preview in previews:
+			self.data['prefetched'][preview[0]] = preview[1:]
+			self.data['prefetched'].move_to_end(preview[0])
+		while len(self.data['prefetched']) > MAX_PREFETCHED_PREVIEWS:
+			self.data['prefetched'].popitem(last=False)
+
+	def _popPrefetchedPreview(self, index:int) -> tuple[np.ndarray, np.ndarray, float]|None:
+		preview = self.data['prefetched'].pop(index, None)
+		if preview is None:
+			return None
+		lowres, raycast_options, img_data, mo_data, raycast_time = preview
+		if tuple(lowres) != tuple(self.data['lowres']) or raycast_options != self.getRaycastOptions():
+			# preview resolution or settings changed since it was raycast
+			return None
+		# the governor is given the time the preview took to raycast, not the time saved
+		return img_data, mo_data, raycast_time
+
+	def _clearPrefetchedPreviews(self) -> None:
+		if self.data['prefetch_worker'] is not None:
+			self.data['prefetch_worker'].terminate()
+			# results of the running worker are discarded with the old source
+			self.data['prefetch_worker'].signals.result.disconnect(self._storePrefetchedPreviews)
+		self.data['prefetch_worker'] = None
+		self.data['prefetched'].clear()
 
 	def generateFullRes(self) -> tuple[np.ndarray, np.ndarray, object]:
+		if tuple(self.data['disp_res']) == tuple(self.data['res']):
+			# progressive refinement has already reached native resolution
+			logger.debug("\tUsing refined full resolution image for %s", self.data['name'])
+			data_reshaped = self.data['disp_img'].reshape(self.data['res'][1],self.data['res'][0],3)/255
+			return data_reshaped, self.data['mo_data'], self.getFullResMOString
 		logger.debug("\tGenerating full resolution image for %s", self.data['name'])
 		img_data, mo_data = self.data['raycast_src'].rayCastFromSensor(self.data['res'],
 															self.data['pix_per_rad'],
 															self.data['last_transform'],
-															self.data['rays_sf'],
+															ray_tables.getPixelRays(self.data['lens_model'], self.data['res'], self.data['fov']),
 															self.data['curr_datetime'],
 															self.data['curr_sun_eci'],
 															self.data['curr_moon_eci'],
-															draw_eclipse=self.opts['solar_lighting']['value'],
-															draw_atm=self.opts['plot_atmosphere']['value'],
-															atm_height=self.opts['atmosphere_height']['value'],
-															atm_lit_colour=self.opts['atmosphere_lit_colour']['value'],
-															atm_eclipsed_colour=self.opts['atmosphere_eclipsed_colour']['value'],
-															draw_sun=self.opts['plot_sun']['value'],
-															sun_colour=self.opts['sun_colour']['value'],
-															draw_moon=self.opts['plot_moon']['value'],
-															moon_colour=self.opts['moon_colour']['value'],
-															highlight_edge=self.opts['highlight_limb']['value'],
-															highlight_height=self.opts['highlight_height']['value'],
-															highlight_colour=self.opts['highlight_colour']['value'])
+															lens_model=self.data['lens_model'],
+															**self.getRaycastOptions())
 		data_reshaped = img_data.reshape(self.data['res'][1],self.data['res'][0],3)/255
 		return data_reshaped, mo_data, self.getFullResMOString
 
+	def isFullResTiled(self) -> bool:
+		return self.opts['tiled_full_res']['value'] and self.data['res'][0]*self.data['res'][1] > TILED_FULL_RES_MIN_PIXELS
+
+	def generateTiledFullRes(self) -> tuple[tiled_render.TiledSensorImage, threading.Worker, object]:
+		'''Start raycasting the full resolution image tile by tile to disk.
+
+		Returns:
+			tiled_render.TiledSensorImage: image being written, its overview is filled in as tiles complete
+			threading.Worker: worker raycasting the tiles, emits progress with the number of completed tiles
+			object: mouse over string function, as for generateFullRes
+		'''
+		logger.debug("\tGenerating tiled full resolution image for %s", self.data['name'])
+		tiled_img = tiled_render.TiledSensorImage(self.data['res'])
+		worker = threading.Worker(self._raycastTiledFullRes,
+									tiled_img,
+									self.data['last_transform'],
+									self.data['curr_datetime'],
+									self.data['curr_sun_eci'],
+									self.data['curr_moon_eci'],
+									self.getRaycastOptions())
+		worker.kwargs['tile_callback'] = worker.signals.progress.emit
+		worker.setAutoDelete(True)
+		orbviz.threadpool.logStart(worker)
+		return tiled_img, worker, self.getFullResMOString
+
+	def _raycastTiledFullRes(self, tiled_img:tiled_render.TiledSensorImage, transform:np.ndarray,
+								curr_dt:dt.datetime, sun_eci:np.ndarray, moon_eci:np.ndarray,
+								raycast_options:dict[str,Any], running:threading.Flag,
+								tile_callback=None) -> tiled_render.TiledSensorImage|None:
+		return tiled_render.raycastTiled(self.data['raycast_src'],
+											self.data['lens_model'],
+											self.data['res'],
+											self.data['fov'],
+											transform,
+											curr_dt,
+											sun_eci,
+											moon_eci,
+											tiled_img,
+											raycast_options=raycast_options,
+											running=running.getState,
+											tile_callback=tile_callback)
+
+	def getRaycastOptions(self) -> dict[str, Any]:
+		return {'draw_eclipse':self.opts['solar_lighting']['value'],
+				'draw_atm':self.opts['plot_atmosphere']['value'],
+				'atm_height':self.opts['atmosphere_height']['value'],
+				'atm_lit_colour':self.opts['atmosphere_lit_colour']['value'],
+				'atm_eclipsed_colour':self.opts['atmosphere_eclipsed_colour']['value'],
+				'draw_sun':self.opts['plot_sun']['value'],
+				'sun_colour':self.opts['sun_colour']['value'],
+				'draw_moon':self.opts['plot_moon']['value'],
+				'moon_colour':self.opts['moon_colour']['value'],
+				'highlight_edge':self.opts['highlight_limb']['value'],
+				'highlight_height':self.opts['highlight_height']['value'],
+				'highlight_colour':self.opts['highlight_colour']['value']}
+
+	def _setDisplayedImage(self, resolution:tuple[int,int], img_data:np.ndarray, mo_data:np.ndarray) -> None:
+		self.data['disp_res'] = resolution
+		self.data['disp_img'] = img_data
+		self.data['mo_data'] = mo_data
+		data_reshaped = img_data.reshape(resolution[1],resolution[0],3)/255
+		self.visuals['image'].set_data(data_reshaped)
+		# keep images the same size within the view, whatever resolution they were raycast at
+		self.visuals['image'].transform = vTransforms.STTransform(scale=(self.data['view_dims'][0]/resolution[0],
+																		self.data['view_dims'][1]/resolution[1]))
+		# setting data of ImageVisual doesn't refresh canvas, use text visual to refresh instead
+		self.visuals['text'].text = f"Sensor: {self.data['name']}"
+
+	#----- PROGRESSIVE REFINEMENT -----#
+	def _scheduleRefinement(self) -> None:
+		if not self.opts['progressive_refinement']['value'] or len(self.data['refine_levels']) == 0:
+			return
+		if orbviz.threadpool is None:
+			return
+		self.refine_timer.start(REFINEMENT_DELAY)
+
+	def _cancelRefinement(self) -> None:
+		self.refine_timer.stop()
+		# any level still being raycast belongs to an old generation, and will be discarded
+		self.data['refine_generation'] += 1
+		self.data['refine_level'] = 0
+		if self.data['refine_worker'] is not None and self.data['refine_worker'].isRunning():
+			self.data['refine_worker'].terminate()
+		self.data['refine_worker'] = None
+
+	def _startRefinement(self) -> None:
+		if not self.isActive() or self.data['refine_level'] >= len(self.data['refine_levels']):
+			return
+		fine_res = self.data['refine_levels'][self.data['refine_level']]
+		logger.debug("Refining sensor image %s to %s", self.data['name'], fine_res)
+		worker = threading.Worker(self._raycastRefinementLevel,
+									self.data['refine_generation'],
+									fine_res,
+									self.data['disp_res'],
+									self.data['disp_img'],
+									self.data['mo_data'],
+									self.data['last_transform'],
+									self.data['curr_datetime'],
+									self.data['curr_sun_eci'],
+									self.data['curr_moon_eci'],
+									self.getRaycastOptions())
+		worker.signals.result.connect(self._storeRefinementLevel)
+		worker.setAutoDelete(True)
+		self.data['refine_worker'] = worker
+		orbviz.threadpool.logStart(worker)
+
+	def _raycastRefinementLevel(self, generation:int, fine_res:tuple[int,int], coarse_res:tuple[int,int],
+									coarse_img:np.ndarray, coarse_mo_data:np.ndarray, transform:np.ndarray,
+									curr_dt:dt.datetime, sun_eci:np.ndarray, moon_eci:np.ndarray,
+									raycast_options:dict[str,Any],
+									running:threading.Flag) -> tuple[int, tuple[int,int], np.ndarray, np.ndarray]|None:
+		num_pixels = fine_res[0]*fine_res[1]
+		pix_per_rad = self.data['lens_model'].calcPixelAngularSize(fine_res, self.data['fov'])
+		reused_idxs = self.data['lens_model'].calcNestedPixelIdxs(coarse_res, fine_res)
+		if reused_idxs is None:
+			# coarse pixels don't line up with this level, raycast every pixel
+			new_idxs = None
+		else:
+			new_mask = np.ones(num_pixels, dtype=bool)
+			new_mask[reused_idxs] = False
+			new_idxs = np.flatnonzero(new_mask)
+
+		if tuple(fine_res) == tuple(self.data['res']):
+			rays_sf = ray_tables.getPixelRays(self.data['lens_model'], fine_res, self.data['fov'], pixel_idxs=new_idxs)
+		else:
+			rays_sf = self.data['lens_model'].generatePixelRays(fine_res, self.data['fov'], pixel_idxs=new_idxs)
+		if not running:
+			return None
+
+		# raycast whole rows at a time, so a superseded level stops part way through
+		block_idxs = np.arange(num_pixels) if new_idxs is None else new_idxs
+		block_size = max(REFINEMENT_BLOCK_PIXELS // fine_res[0], 1) * fine_res[0]
+		img_blocks = []
+		mo_blocks = []
+		for start in range(0, len(block_idxs), block_size):
+			if not running:
+				logger.debug("Abandoning refinement of %s to %s", self.data['name'], fine_res)
+				return None
+			block = slice(start, start+block_size)
+			img_block, mo_block = self.data['raycast_src'].rayCastFromSensor(fine_res,
+																pix_per_rad,
+																transform,
+																rays_sf[block],
+																curr_dt,
+																sun_eci,
+																moon_eci,
+																pixel_idxs=block_idxs[block],
+																lens_model=self.data['lens_model'],
+																**raycast_options)
+			img_blocks.append(img_block)
+			mo_blocks.append(mo_block)
+		if not running:
+			return None
+		img_data = np.concatenate(img_blocks)
+		mo_data = np.concatenate(mo_blocks)
+
+		if new_idxs is not None:
+			# interleave the newly raycast pixels with those already computed at the coarser level
+			fine_img = np.empty((num_pixels,3), dtype=img_data.dtype)
+			fine_img[reused_idxs] = coarse_img
+			fine_img[new_idxs] = img_data
+			fine_mo_data = np.empty((num_pixels,)+mo_data.shape[1:], dtype=mo_data.dtype)
+			fine_mo_data[reused_idxs] = coarse_mo_data
+			fine_mo_data[new_idxs] = mo_data
+			img_data, mo_data = fine_img, fine_mo_data
+
+		return generation, fine_res, img_data, mo_data
+
+	def _storeRefinementLevel(self, result:tuple[int, tuple[int,int], np.ndarray, np.ndarray]|None) -> None:
+		if result is None:
+			return
+		generation, fine_res, img_data, mo_data = result
+		if generation != self.data['refine_generation']:
+			# index or settings changed while this level was being raycast
+			return
+		self.data['refine_worker'] = None
+		self._setDisplayedImage(fine_res, img_data, mo_data)
+		self.data['refine_level'] += 1
+		if self.data['refine_level'] < len(self.data['refine_levels']):
+			self._startRefinement()
+
 	def getLowResMOString(self, fractional_pos:tuple[float, float]) -> str:
-		pix_pos = int(round(fractional_pos[0]*self.data['lowres'][0])), int(round(fractional_pos[1]*self.data['lowres'][1]))
-		pos_idx = np.ravel_multi_index((pix_pos[1],pix_pos[0]),(self.data['lowres'][1], self.data['lowres'][0]))
+		# mouse over data is for the currently displayed (possibly refined) image
+		disp_res = self.data['disp_res']
+		pix_pos = min(int(fractional_pos[0]*disp_res[0]), disp_res[0]-1), min(int(fractional_pos[1]*disp_res[1]), disp_res[1]-1)
+		pos_idx = np.ravel_multi_index((pix_pos[1],pix_pos[0]),(disp_res[1], disp_res[0]))
 		return self._decodeLabelData(self.data['mo_data'][pos_idx])
 
 	def getFullResMOString(self, mo_data, fractional_pos:tuple[float, float]) -> str:
@@ -764,32 +1219,33 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 		pos_idx = np.ravel_multi_index((pix_pos[1],pix_pos[0]),(self.data['res'][1], self.data['res'][0]))
 		return self._decodeLabelData(mo_data[pos_idx])
 
-	def _decodeLabelData(self, data:np.ndarray) -> str:
-		if data[0] == 0:
-			# geodetic
-			if data[1] < 0:
+	def _decodeLabelData(self, data:np.void) -> str:
+		label_type = data['type']
+		val1 = float(data['val1'])
+		val2 = float(data['val2'])
+		if label_type == orbviz_data_types.MouseOverType.GEODETIC:
+			if val1 < 0:
 				lat_hemisphere = 'S'
-			elif data[1] > 0:
+			elif val1 > 0:
 				lat_hemisphere = 'N'
 			else:
 				lat_hemisphere = ''
-			if data[2] < 0:
+			if val2 < 0:
 				lon_hemisphere = 'W'
-			elif data[2] > 0:
+			elif val2 > 0:
 				lon_hemisphere = 'E'
 			else:
 				lon_hemisphere = ''
-			out_str = f'Geodetic:\n{abs(data[1]):.1f}{lat_hemisphere}, \x1D{abs(data[2]):.1f}{lon_hemisphere}'
-		elif data[0] == 1:
-			# celestial
-			raH,raM,raS = orbviz_conversion.decimal2hhmmss(data[1])
-			decD,decM,decS = orbviz_conversion.decimal2degmmss(data[2])
+			out_str = f'Geodetic:\n{abs(val1):.1f}{lat_hemisphere}, \x1D{abs(val2):.1f}{lon_hemisphere}'
+		elif label_type == orbviz_data_types.MouseOverType.CELESTIAL:
+			raH,raM,raS = orbviz_conversion.decimal2hhmmss(val1)
+			decD,decM,decS = orbviz_conversion.decimal2degmmss(val2)
 			out_str = f'Celestial:\n{raH}h {raM}m {raS:.2f}s, \x1D{decD}° {decM}\' {decS:.2f}"'
-		elif data[0] == 2:
-			# direct str
-			out_str = data[1]
-		elif data[0] == -1:
-			# dummy data
+		elif label_type == orbviz_data_types.MouseOverType.SUN:
+			out_str = 'Sun'
+		elif label_type == orbviz_data_types.MouseOverType.MOON:
+			out_str = 'Moon'
+		elif label_type == orbviz_data_types.MouseOverType.DUMMY:
 			out_str = 'Dummy Data'
 		else:
 			out_str = ''
@@ -888,10 +1344,35 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 												'static': True,
 												'callback': self.setHighlightColour,
 												'widget_data': None}
+		self._dflt_opts['progressive_refinement'] = {'value': True,
+										  		'type': 'boolean',
+												'help': '',
+												'static': True,
+												'callback': self.setProgressiveRefinement,
+												'widget_data': None}
+		self._dflt_opts['temporal_reprojection'] = {'value': False,
+										  		'type': 'boolean',
+												'help': '',
+												'static': True,
+												'callback': self.setTemporalReprojection,
+												'widget_data': None}
+		self._dflt_opts['temporal_reprojection_error'] = {'value': 0.5,
+										  		'type': 'float',
+												'help': '',
+												'static': True,
+												'callback': self.setTemporalReprojectionError,
+												'widget_data': None}
+		self._dflt_opts['tiled_full_res'] = {'value': True,
+										  		'type': 'boolean',
+												'help': '',
+												'static': True,
+												'callback': self.setTiledFullRes,
+												'widget_data': None}
 
 		self.opts = self._dflt_opts.copy()
 
 	def redrawWithNewSettings(self) -> None:
+		self._cancelRefinement()
 		img_data, mo_data = self.data['raycast_src'].rayCastFromSensor(self.data['lowres'],
 															self.data['lowres_pix_per_rad'],
 															self.data['last_transform'],
@@ -899,23 +1380,11 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 															self.data['curr_datetime'],
 															self.data['curr_sun_eci'],
 															self.data['curr_moon_eci'],
-															draw_eclipse=self.opts['solar_lighting']['value'],
-															draw_atm=self.opts['plot_atmosphere']['value'],
-															atm_height=self.opts['atmosphere_height']['value'],
-															atm_lit_colour=self.opts['atmosphere_lit_colour']['value'],
-															atm_eclipsed_colour=self.opts['atmosphere_eclipsed_colour']['value'],
-															draw_sun=self.opts['plot_sun']['value'],
-															sun_colour=self.opts['sun_colour']['value'],
-															draw_moon=self.opts['plot_moon']['value'],
-															moon_colour=self.opts['moon_colour']['value'],
-															highlight_edge=self.opts['highlight_limb']['value'],
-															highlight_height=self.opts['highlight_height']['value'],
-															highlight_colour=self.opts['highlight_colour']['value'])
-		self.data['mo_data'] = mo_data
-		data_reshaped = img_data.reshape(self.data['lowres'][1],self.data['lowres'][0],3)/255
-		self.visuals['image'].set_data(data_reshaped)
-		# setting data of ImageVisual doesn't refresh canvas, use text visual to refresh instead
-		self.visuals['text'].text = f"Sensor: {self.data['name']}"
+															lens_model=self.data['lens_model'],
+															**self.getRaycastOptions())
+		self._setDisplayedImage(self.data['lowres'], img_data, mo_data)
+		self._storeReprojectionSource(img_data, mo_data)
+		self._scheduleRefinement()
 
 	#----- OPTIONS CALLBACKS -----#
 	def drawSensorName(self, state:bool) -> None:
@@ -971,6 +1440,24 @@ class SensorImageAsset(base_assets.AbstractSimpleVispyAsset):
 		self.opts['atmosphere_eclipsed_colour']['value'] = new_colour
 		self.redrawWithNewSettings()
 
+	def setProgressiveRefinement(self, state:bool) -> None:
+		self.opts['progressive_refinement']['value'] = state
+		if not state:
+			self._cancelRefinement()
+		elif self.data['disp_img'] is not None and self.data['refine_level'] == 0:
+			self._scheduleRefinement()
+
+	def setTemporalReprojection(self, state:bool) -> None:
+		self.opts['temporal_reprojection']['value'] = state
+		if not state:
+			self.data['reproj_src'] = None
+
+	def setTemporalReprojectionError(self, max_error_px:float) -> None:
+		self.opts['temporal_reprojection_error']['value'] = max_error_px
+
+	def setTiledFullRes(self, state:bool) -> None:
+		self.opts['tiled_full_res']['value'] = state
+
 	def removePlotOptions(self) -> None:
 		for opt_key, opt in self.opts.items():
 			if opt['widget_data'] is not None:
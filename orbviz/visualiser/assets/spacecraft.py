@@ -132,7 +132,7 @@ class Spacecraft3DAsset(base_assets.AbstractVispyAsset):
 		self._removeOldSensorSuitePlotOptions(old_suite_names)
 		for suite_name in old_suite_names:
 				self.assets[f'sensor_suite_{suite_name}'].removePlotOptions()
-				self.assets[f'sensor_suite_{suite_name}'].detachFromParentViewRecursive()
+				self.assets[f'sensor_suite_{suite_name}'].releaseVisualsRecursive()
 				del(self.assets[f'sensor_suite_{suite_name}'])
 
 	def _instantiateSensorAssets(self) -> None:
@@ -425,7 +425,7 @@ class Spacecraft2DAsset(base_assets.AbstractVispyAsset):
 		self._removeOldSensorSuitePlotOptions(old_suite_names)
 		for suite_name in old_suite_names:
 			self.assets[f'sensor_suite_{suite_name}'].removePlotOptions()
-			self.assets[f'sensor_suite_{suite_name}'].detachFromParentViewRecursive()
+			self.assets[f'sensor_suite_{suite_name}'].releaseVisualsRecursive()
 			del(self.assets[f'sensor_suite_{suite_name}'])
 
 	def _instantiateSensorAssets(self) -> None:
@@ -761,7 +761,7 @@ class SpacecraftViewsAsset(base_assets.AbstractVispyAsset):
 	def _removeSensorAssets(self, old_suite_names:list[str]) -> None:
 		for suite_name in old_suite_names:
 			self.assets[f'sensor_suite_{suite_name}'].removePlotOptions()
-			self.assets[f'sensor_suite_{suite_name}'].detachFromParentViewRecursive()
+			self.assets[f'sensor_suite_{suite_name}'].releaseVisualsRecursive()
 			del(self.assets[f'sensor_suite_{suite_name}'])
 
 	def _instantiateSensorAssets(self) -> None:
@@ -812,7 +812,25 @@ class SpacecraftViewsAsset(base_assets.AbstractVispyAsset):
 
 	def _setDefaultOptions(self) -> None:
 		self._dflt_opts = {}
+		self._dflt_opts['adaptive_preview_resolution'] = {'value': True,
+										  		'type': 'boolean',
+												'help': '',
+												'static': True,
+												'callback': self.setAdaptivePreviewResolution,
+												'widget_data': None}
+		self._dflt_opts['preview_frame_time_budget'] = {'value': sensors.DFLT_PREVIEW_FRAME_TIME_BUDGET,
+										  		'type': 'integer',
+												'help': 'Target time to raycast all displayed sensor previews [ms]',
+												'static': True,
+												'callback': self.setPreviewFrameTimeBudget,
+												'widget_data': None}
 		self.opts = self._dflt_opts.copy()
 
 	#----- OPTIONS CALLBACKS -----#
+	def setAdaptivePreviewResolution(self, state:bool) -> None:
+		self.opts['adaptive_preview_resolution']['value'] = state
+
+	def setPreviewFrameTimeBudget(self, budget:int) -> None:
+		self.opts['preview_frame_time_budget']['value'] = budget
+
 	#----- HELPER FUNCTIONS -----#
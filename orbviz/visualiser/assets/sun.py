@@ -13,11 +13,14 @@ from vispy.scene import visuals as vVisuals
 from vispy.visuals import filters as vFilters
 from vispy.visuals import transforms as vTransforms
 
+import orbviz
 import orbviz.model.data_models.history_data as history_data
 import orbviz.model.geometry.polyhedra as polyhedra
 import orbviz.model.geometry.primgeom as pg
 import orbviz.model.geometry.spherical as spherical_geom
+import orbviz.util.array_u as array_u
 import orbviz.util.constants as c
+import orbviz.util.threading as threading
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.colours as colours
 import orbviz.visualiser.visuals.polygons as polygon_visuals
@@ -376,6 +379,11 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 		self.data['eclipse_edge2'] = self.data['eclipse_edge'].copy()
 		self.data['strings'] = [self.data['name']]
 
+		# terminator and eclipse outlines of every timestep, calculated in the background after setSource
+		self.data['outline_cache'] = None
+		self.data['outline_generation'] = 0
+		self.data['outline_worker'] = None
+
 	def _instantiateAssets(self):
 		pass
 
@@ -430,6 +438,7 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 		scaled_lat = ((lat + 90) * self.data['vert_pixel_scale']).reshape(-1,1)
 		scaled_lon = ((lon + 180) * self.data['horiz_pixel_scale']).reshape(-1,1)
 		self.data['scaled_coords'] = np.hstack((scaled_lon,scaled_lat))
+		self._startOutlineCache()
 
 	def setScale(self, horizontal_size, vertical_size):
 		self.data['horiz_pixel_scale'] = horizontal_size/360
@@ -450,14 +459,15 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 		if self.isStale():
 			# move the sun
 			self._updateMarkers()
-			terminator_boundary = self.calcTerminatorOutline(self.data['coords'][self.data['curr_index']])
+			terminator_boundary, eclipse_edge1, eclipse_edge2, split = self._getOutlines(self.data['curr_index'])
 
 			self.data['terminator_edge'][:,0] = (terminator_boundary[:,0]+180) * self.data['horiz_pixel_scale']
 			self.data['terminator_edge'][:,1] = (terminator_boundary[:,1]+90) * self.data['vert_pixel_scale']
 
 			self.visuals['terminator'].pos = self.data['terminator_edge']
 
-			self.data['eclipse_edge1'], self.data['eclipse_edge2'], split = self.calcEclipseOutline(self.data['coords'][self.data['curr_index']], np.linalg.norm(self.data['coords'][self.data['curr_index']]))
+			self.data['eclipse_edge1'] = self._scale(eclipse_edge1)
+			self.data['eclipse_edge2'] = self._scale(eclipse_edge2)
 
 			self.visuals['eclipse_patch1'].pos = self.data['eclipse_edge1']
 			self.visuals['eclipse_patch2'].pos = self.data['eclipse_edge2']
@@ -472,6 +482,60 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 			self._recomputeRedrawChildren()
 			self._clearStaleFlag()
 
+	def _getOutlines(self, index:int) -> tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+		# unscaled (lon, lat) outlines, from the cache once it is complete
+		cache = self.data['outline_cache']
+		if cache is not None:
+			return cache['terminator'][index], cache['eclipse1'][index], cache['eclipse2'][index], cache['eclipse_split'][index]
+		solar_lonlat = self.data['coords'][index]
+		terminator_boundary = self.calcTerminatorOutline(solar_lonlat)
+		eclipse_edge1, eclipse_edge2, split = self.calcEclipsePatches(solar_lonlat, np.linalg.norm(solar_lonlat))
+		return terminator_boundary, eclipse_edge1, eclipse_edge2, split
+
+	def _startOutlineCache(self) -> None:
+		# results of any previous source are discarded
+		self.data['outline_cache'] = None
+		self.data['outline_generation'] += 1
+		if self.data['outline_worker'] is not None and self.data['outline_worker'].isRunning():
+			self.data['outline_worker'].terminate()
+		worker = threading.Worker(self._calcOutlineCache,
+									self.data['outline_generation'],
+									self.data['coords'])
+		worker.signals.result.connect(self._storeOutlineCache)
+		worker.setAutoDelete(True)
+		self.data['outline_worker'] = worker
+		if orbviz.threadpool is None:
+			# no threadpool when used without the Qt application, build the cache now
+			worker.run()
+		else:
+			orbviz.threadpool.logStart(worker)
+
+	def _calcOutlineCache(self, generation:int, coords:np.ndarray, running:threading.Flag) -> tuple[int, dict[str, Any]]|None:
+		if not running:
+			return None
+		terminators = spherical_geom.calcTerminatorOutlines(coords[:,1], coords[:,0]).astype(np.float32)
+		# eclipse is centered on the antisolar point
+		eclipse_center_lats = -coords[:,1]
+		eclipse_center_lons = np.rad2deg(spherical_geom.wrapToCircleRange(np.deg2rad(coords[:,0] + 180)))
+		phi_h = np.rad2deg(np.arcsin(c.R_EARTH/(c.R_EARTH+np.linalg.norm(coords, axis=1))))
+		eclipse1, eclipse2, eclipse_split = spherical_geom.genSmallCirclePatches(phi_h*2, eclipse_center_lats, eclipse_center_lons)
+
+		cache = {'terminator': terminators,
+					'eclipse1': array_u.PackedRaggedArray(eclipse1.values.astype(np.float32), eclipse1.offsets),
+					'eclipse2': array_u.PackedRaggedArray(eclipse2.values.astype(np.float32), eclipse2.offsets),
+					'eclipse_split': eclipse_split}
+		return generation, cache
+
+	def _storeOutlineCache(self, result:tuple[int, dict[str, Any]]|None) -> None:
+		if result is None:
+			return
+		generation, cache = result
+		if generation != self.data['outline_generation']:
+			return
+		logger.debug("Terminator and eclipse outlines cached for %s timesteps", len(cache['terminator']))
+		self.data['outline_cache'] = cache
+		self.data['outline_worker'] = None
+
 	def getScreenMouseOverInfo(self) -> dict[str, Any]:
 		curr_world_pos = (self.data['coords'][self.data['curr_index']]).reshape(1,2)
 		mo_info = {'screen_pos':[], 'world_pos':[], 'strings':[], 'objects':[]}
@@ -601,33 +665,10 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 		self.visuals['eclipse_patch1'].visible = self.opts['plot_eclipse']['value']
 		self.visuals['eclipse_patch2'].visible = self.opts['plot_eclipse']['value']
 
-	def getTerminatorPoint(self, earth_lon:float|np.ndarray, solar_lat:float, solar_lon:float) -> float:
-		ha = earth_lon - solar_lon
-		return np.arctan(-np.cos(ha)/np.tan(solar_lat))
-
 	def calcTerminatorOutline(self, solar_lonlat) -> np.ndarray:
-		terminator_boundary = np.zeros((361,2))
-		solar_lat = solar_lonlat[1]
-		solar_lon = solar_lonlat[0]
-		terminator_boundary[:,0] = np.arange(-180,181,1)
-		terminator_boundary[:,1] = np.rad2deg(self.getTerminatorPoint(np.deg2rad(terminator_boundary[:,0]), np.deg2rad(solar_lat), np.deg2rad(solar_lon)))
-
-		if solar_lat > 0:
-			terminator_boundary = np.vstack((np.array((-180,-90)),terminator_boundary))
-			terminator_boundary = np.vstack((terminator_boundary, np.array((180,-90))))
-			terminator_boundary = np.vstack((terminator_boundary, np.array((-180,-90))))
-
-		elif solar_lat < 0:
-			terminator_boundary = np.vstack((np.array((-180,90)),terminator_boundary))
-			terminator_boundary = np.vstack((terminator_boundary, np.array((180,90))))
-			terminator_boundary = np.vstack((terminator_boundary, np.array((-180,90))))
-
-		else:
-			pass
-
-		return terminator_boundary
+		return spherical_geom.calcTerminatorOutlines(solar_lonlat[1], solar_lonlat[0])[0]
 
-	def calcEclipseOutline(self, solar_lonlat, sat_altitude) -> tuple[np.ndarray, np.ndarray, bool]:
+	def calcEclipsePatches(self, solar_lonlat, sat_altitude) -> tuple[np.ndarray, np.ndarray, bool]:
 		# sat altitude in km
 		# half subtended angle = phi_h
 		eclipse_center_lat = -solar_lonlat[1]
@@ -641,7 +682,7 @@ class Sun2DAsset(base_assets.AbstractVispyAsset):
 		else:
 			split = True
 
-		return self._scale(circle1), self._scale(circle2), split
+		return circle1, circle2, split
 
 	def _scale(self, coords):
 		out_arr = coords.copy()
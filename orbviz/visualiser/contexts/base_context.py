@@ -3,6 +3,7 @@ import datetime as dt
 import json
 import pathlib
 
+from collections.abc import Callable, Sequence
 from typing import Any
 
 import imageio
@@ -10,11 +11,14 @@ import matplotlib.pyplot as plt
 
 from PyQt5 import QtCore, QtWidgets
 
+import vispy.app as app
 from vispy.gloo.util import _screenshot
 
 import orbviz.util.paths as orbviz_paths
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
 from orbviz.visualiser.contexts.figure_wrappers.base_fw import BaseFigureWrapper
+from orbviz.visualiser.contexts.frame_scheduler import FrameScheduler
+import orbviz.visualiser.contexts.video_export as video_export
 import orbviz.visualiser.interface.console as console
 
 
@@ -40,6 +44,8 @@ class BaseContext(ABC):
 		self.load_worker_thread = None
 		self.save_worker = None
 		self.save_worker_thread = None
+		# index changes are drawn at most once per display refresh, and only while this context is active
+		self.frame_scheduler = FrameScheduler(self._updateDisplayedIndex)
 
 	@abstractmethod
 	def saveState(self) -> None:
@@ -61,6 +67,17 @@ class BaseContext(ABC):
 	def setIndex(self, idx:int) -> None:
 		raise NotImplementedError()
 
+	def _updateDisplayedIndex(self, index:int) -> None:
+		pass
+
+	def requestDisplayedIndex(self, index:int) -> None:
+		'''Schedule index to be displayed on the next frame, connect the time slider to this.'''
+		self.frame_scheduler.requestIndex(index)
+
+	def flushDisplayedIndex(self) -> None:
+		'''Display the latest requested index immediately.'''
+		self.frame_scheduler.flush()
+
 	@abstractmethod
 	def _procDataUpdated(self) -> None:
 		# Use this function to collate all functions which should be called when the data model is updated.
@@ -95,6 +112,63 @@ class BaseContext(ABC):
 
 		console.send(f"Saved {self.config['name']} screenshot to {file}")
 
+	def exportFrames(self, file:pathlib.Path, indices:Sequence[int], prepare_frame:Callable[[int], None],
+						resolution:tuple[int,int]|None=None, fps:float=video_export.DFLT_EXPORT_FPS, loop=True) -> bool:
+		'''Render the canvas offscreen at each index, and export the frames as a GIF or video.
+
+		The window doesn't need to stay visible, and is locked by a progress dialog which can cancel the export.
+
+		Args:
+			file (pathlib.Path): output file, .gif, .mp4 or .webm
+			indices (Sequence[int]): time slider indices to export
+			prepare_frame (Callable[[int], None]): sets the time slider and camera for an index
+			resolution (tuple[int,int]|None): width and height of the exported frames, the canvas size if None [pixels]
+			fps (float): frame rate of the exported file
+			loop (bool): whether a GIF loops
+
+		Returns:
+			bool: True if the file was written, False if the export was cancelled or failed
+		'''
+		if self.canvas_wrapper is None:
+			raise AttributeError(f'{self} has no canvas to export')
+		canvas = self.canvas_wrapper.canvas
+		if resolution is None:
+			resolution = canvas.physical_size
+		try:
+			exporter = video_export.VideoExporter(file, resolution, fps=fps, loop=loop)
+		except ValueError as e:
+			console.sendErr(f"Error: {e}")
+			return False
+
+		progress = QtWidgets.QProgressDialog(f'Exporting {pathlib.Path(file).name}', 'Cancel', 0, len(indices), self.window)
+		progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+		progress.setMinimumDuration(0)
+		progress.canceled.connect(exporter.cancel)
+
+		def renderFrame(index:int):
+			prepare_frame(index)
+			self.flushDisplayedIndex()
+			return canvas.render(size=exporter.resolution, alpha=False)
+
+		def updateProgress(num_rendered:int, num_frames:int):
+			progress.setValue(num_rendered)
+			# service the cancel button
+			app.process_events()
+
+		try:
+			saved = exporter.run(renderFrame, indices, progress_callback=updateProgress)
+		except (RuntimeError, FileNotFoundError, ValueError) as e:
+			# missing ffmpeg, or the encoder failed part way
+			console.sendErr(f"Error: {e}")
+			return False
+		finally:
+			progress.close()
+		if saved:
+			console.send(f"Saved {self.config['name']} {exporter.format.upper()} to {file}")
+		else:
+			console.send(f"Cancelled saving {self.config['name']} {exporter.format.upper()}")
+		return saved
+
 	@abstractmethod
 	def saveGif(self, file:pathlib.Path, loop=True, *args, **kwargs):
 		raise NotImplementedError
@@ -116,12 +190,17 @@ class BaseContext(ABC):
 		if self.controls is not None and self.controls.shortcuts is not None:
 			for shortcut in self.controls.shortcuts.values():
 				shortcut.blockSignals(False)
+		# catch up on any index change made while dormant
+		self.frame_scheduler.setVisible(True)
 
 	def makeDormant(self) -> None:
 		self.active = False
 		if self.controls is not None and self.controls.shortcuts is not None:
 			for shortcut in self.controls.shortcuts.values():
 				shortcut.blockSignals(True)
+		if self.controls is not None and hasattr(self.controls, 'time_slider'):
+			self.controls.time_slider.pausePlayback()
+		self.frame_scheduler.setVisible(False)
 	
 class BaseControls:
 	@abstractmethod
@@ -3,6 +3,8 @@ import time
 
 from typing import Any
 
+import numpy as np
+
 from PyQt5 import QtCore, QtGui
 
 from vispy import scene
@@ -25,6 +27,7 @@ from orbviz.visualiser.assets import (
 )
 import orbviz.visualiser.cameras.RestrictedPanZoom as RestrictedPanZoom
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
+from orbviz.visualiser.contexts.canvas_wrappers.picking import ScreenPickingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +72,7 @@ class History2DCanvasWrapper(BaseCanvas):
 		self.mouseOverTimer = QtCore.QTimer()
 		self.mouseOverTimer.timeout.connect(self._setMouseOverVisible)
 		self.mouseOverObject = None
+		self.picking_index = ScreenPickingIndex()
 
 	def _buildAssets(self) -> None:
 		self.assets['earth'] = earth.Earth2DAsset(v_parent=self.view_box.scene)
@@ -96,6 +100,8 @@ class History2DCanvasWrapper(BaseCanvas):
 			logger.error('canvas wrapper: %s does not have a history data model yet', self)
 			raise exceptions.InvalidDataError
 
+		self.picking_index.invalidate()
+
 		if self.data_models['history'].timespan is not None:
 			self.assets['earth'].makeActive()
 
@@ -198,12 +204,23 @@ class History2DCanvasWrapper(BaseCanvas):
 		mo_infos = []
 		for asset in self.assets.values():
 			if asset.isActive():
-				mo_infos.append(asset.getScreenMouseOverInfo())
-				for ii, world_pos in enumerate(mo_infos[-1]['world_pos']):
-					mo_infos[-1]['screen_pos'][ii] = self.mapWorldPosToScreen(world_pos)
+				mo_info = asset.getScreenMouseOverInfo()
+				if len(mo_info['world_pos']) > 0:
+					# all positions of an asset mapped in one go
+					world_pos = np.asarray(mo_info['world_pos'], dtype=float).reshape(-1,2)
+					mo_info['screen_pos'] = np.column_stack(self.mapWorldPosToScreen(world_pos))
+				mo_infos.append(mo_info)
 
 		return mo_infos
 
+	def _mouseOverStateKey(self) -> tuple:
+		# screen positions are valid until the camera, canvas or any asset's index changes
+		rect = self.view_box.camera.rect
+		cam_state = (rect.left, rect.bottom, rect.width, rect.height)
+		canvas_size = (self.canvas.native.width(), self.canvas.native.height())
+		asset_state = tuple((asset_name, asset.data.get('curr_index')) for asset_name, asset in self.assets.items() if asset.isActive())
+		return (cam_state, canvas_size, asset_state)
+
 	def mapScreenPosToWorld(self, screen_pos):
 		curr_screen_rect = self.view_box.camera.rect
 		canvas_height = self.canvas.native.height()
@@ -213,13 +230,15 @@ class History2DCanvasWrapper(BaseCanvas):
 		return world_x, world_y
 
 	def mapWorldPosToScreen(self, world_pos):
+		# world_pos is a single (lon, lat), or an array of them with shape (N,2)
 		if len(world_pos) == 0:
 			return (None, None)
+		world_pos = np.asarray(world_pos, dtype=float)
 		curr_screen_rect = self.view_box.camera.rect
 		canvas_height = self.canvas.native.height()
 		canvas_width = self.canvas.native.width()
-		world_pixels_x = (world_pos[0]+180)*self.horiz_pixel_scale
-		world_pixels_y = (world_pos[1]+90)*self.vert_pixel_scale
+		world_pixels_x = (world_pos[...,0]+180)*self.horiz_pixel_scale
+		world_pixels_y = (world_pos[...,1]+90)*self.vert_pixel_scale
 		screen_pos_x = (world_pixels_x - curr_screen_rect.left)*canvas_width/curr_screen_rect.width
 		screen_pos_y = ((self.vb_max_extents[1] - world_pixels_y) - (self.vb_max_extents[1]-curr_screen_rect.top))*canvas_height/curr_screen_rect.height
 
@@ -243,24 +262,25 @@ class History2DCanvasWrapper(BaseCanvas):
 		# reset mouseOver
 		self.mouseOverTimer.stop()
 
-		mo_infos = self.mapAssetPositionsToScreen()
+		state_key = self._mouseOverStateKey()
+		if self.picking_index.isStale(state_key):
+			self.picking_index.rebuild(state_key, self.mapAssetPositionsToScreen())
 		pp = event.pos
 		event_world_x, event_world_y = self.mapScreenPosToWorld(pp)
 		event_lon = (event_world_x/self.horiz_pixel_scale - 180)
 		event_lat = (event_world_y/self.vert_pixel_scale - 90)
 		text = self._formatLatLong(event_lat, event_lon)
 
-		for jj, mo_info in enumerate(mo_infos):
-			for ii, pos in enumerate(mo_info['screen_pos']):
-				if ((abs(pos[0] - pp[0]) < MOUSEOVER_DIST_THRESHOLD) and \
-					(abs(pos[1] - pp[1]) < MOUSEOVER_DIST_THRESHOLD)):
-					last_mevnt_time = time.monotonic()
-					self.mouseOverText.setText(mo_info['strings'][ii].lower().capitalize())
-					self.mouseOverText.setAnchorPosWithinCanvas(pp, self.canvas)
-					self.mouseOverObject = mo_info['objects'][ii].mouseOver(ii)
-					self.mouseOverTimer.start(300)
-					mouse_over_is_highlighting = True
-					return
+		picked = self.picking_index.query(pp, MOUSEOVER_DIST_THRESHOLD)
+		if picked is not None:
+			mo_info, ii = picked
+			last_mevnt_time = time.monotonic()
+			self.mouseOverText.setText(mo_info['strings'][ii].lower().capitalize())
+			self.mouseOverText.setAnchorPosWithinCanvas(pp, self.canvas)
+			self.mouseOverObject = mo_info['objects'][ii].mouseOver(ii)
+			self.mouseOverTimer.start(300)
+			mouse_over_is_highlighting = True
+			return
 
 		self.mouseOverText.setText(text)
 		self.mouseOverText.setAnchorPosWithinCanvas(pp, self.canvas)
@@ -12,7 +12,6 @@ from vispy.app.canvas import MouseEvent, ResizeEvent
 
 from orbviz.model.data_models.groundstation_data import GroundStationCollection
 from orbviz.model.data_models.history_data import HistoryData
-import orbviz.model.geometry.primgeom as pg
 import orbviz.util.constants as c
 import orbviz.util.exceptions as exceptions
 
@@ -31,6 +30,7 @@ from orbviz.visualiser.assets import (
 	widgets,
 )
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
+from orbviz.visualiser.contexts.canvas_wrappers.picking import ScreenPickingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +62,7 @@ class History3DCanvasWrapper(BaseCanvas):
 											border_colour=(186,186,186),
 											font_size=10)
 		self.mouseOverObject = None
+		self.picking_index = ScreenPickingIndex()
 
 	def _buildAssets(self) -> None:
 		self.assets['earth'] = earth.Earth3DAsset(v_parent=self.view_box.scene)
@@ -113,6 +114,8 @@ class History3DCanvasWrapper(BaseCanvas):
 			logger.error('canvas wrapper: %s does not have a history data model yet', self)
 			raise exceptions.InvalidDataError
 
+		self.picking_index.invalidate()
+
 		if self.data_models['history'].timespan is not None:
 			self.assets['earth'].setSource(self.data_models['history'].timespan)
 			self.assets['earth'].makeActive()
@@ -232,6 +235,24 @@ class History3DCanvasWrapper(BaseCanvas):
 		mo_infos = [asset.getScreenMouseOverInfo() for asset in self.assets.values() if asset.isActive()]
 		return mo_infos
 
+	def _mouseOverStateKey(self) -> tuple:
+		# screen positions are valid until the camera, canvas or any asset's index changes
+		cam = self.view_box.camera
+		cam_state = (tuple(cam.center), cam.scale_factor, cam.fov, cam.azimuth, cam.elevation, cam.roll)
+		asset_state = tuple((asset_name, asset.data.get('curr_index')) for asset_name, asset in self.assets.items() if asset.isActive())
+		return (cam_state, tuple(self.canvas.size), asset_state)
+
+	def _rebuildPickingIndex(self) -> None:
+		mo_infos = self.mapAssetPositionsToScreen()
+
+		# cull if behind center of camera plane
+		az = np.deg2rad(self.view_box.camera.azimuth+179)
+		el = np.deg2rad(self.view_box.camera.elevation)
+		acamv = np.array([np.sin(-az)*np.cos(el),np.cos(-az)*np.cos(el),np.sin(el)])
+		facing_masks = [np.asarray(mo_info['world_pos'], dtype=float).reshape(-1,3) @ acamv >= 0 for mo_info in mo_infos]
+
+		self.picking_index.rebuild(self._mouseOverStateKey(), mo_infos, facing_masks)
+
 	def onMouseMove(self, event:MouseEvent) -> None:
 		global last_mevnt_time
 		global mouse_over_is_highlighting
@@ -240,30 +261,24 @@ class History3DCanvasWrapper(BaseCanvas):
 		# 		asset.onMouseMove(event)
 		self.assets['ECI_gizmo'].onMouseMove(event)
 
-		# cull if behind center of camera plane
-		az = np.deg2rad(self.view_box.camera.azimuth+179)
-		el = np.deg2rad(self.view_box.camera.elevation)
-		acamv = np.array([[0,0,0],[np.sin(-az)*np.cos(el),np.cos(-az)*np.cos(el),np.sin(el)]])
-
 		# throttle mouse events to 100ms
 		if time.monotonic() - last_mevnt_time < 0.1:
 			return
-		mo_infos = self.mapAssetPositionsToScreen()
+		if self.picking_index.isStale(self._mouseOverStateKey()):
+			self._rebuildPickingIndex()
 		pp = event.pos
 
-		for jj, mo_info in enumerate(mo_infos):
-			for ii, pos in enumerate(mo_info['screen_pos']):
-				if ((abs(pos[0] - pp[0]) < MOUSEOVER_DIST_THRESHOLD) and \
-					(abs(pos[1] - pp[1]) < MOUSEOVER_DIST_THRESHOLD)):
-					dot = np.dot(pg.unitVector(mo_info['world_pos'][ii].reshape(1,3)),acamv[1,:])[0]
-					if dot >=0:
-						last_mevnt_time = time.monotonic()
-						self.mouseOverText.setVisible(True)
-						self.mouseOverText.setText(mo_info['strings'][ii].lower().capitalize())
-						self.mouseOverText.setPos((pos[0]+5, pos[1]))
-						self.mouseOverObject = mo_info['objects'][ii].mouseOver(ii)
-						mouse_over_is_highlighting = True
-						return
+		picked = self.picking_index.query(pp, MOUSEOVER_DIST_THRESHOLD)
+		if picked is not None:
+			mo_info, ii = picked
+			pos = mo_info['screen_pos'][ii]
+			last_mevnt_time = time.monotonic()
+			self.mouseOverText.setVisible(True)
+			self.mouseOverText.setText(mo_info['strings'][ii].lower().capitalize())
+			self.mouseOverText.setPos((pos[0]+5, pos[1]))
+			self.mouseOverObject = mo_info['objects'][ii].mouseOver(ii)
+			mouse_over_is_highlighting = True
+			return
 
 		self.mouseOverText.setVisible(False)
 		if mouse_over_is_highlighting:
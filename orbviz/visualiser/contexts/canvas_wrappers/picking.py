@@ -0,0 +1,85 @@
+'''Screen space index of asset positions, for finding the object under the mouse.
+
+The screen positions of all assets are gathered into a single KD-tree, which is only rebuilt when
+the state it was built for (camera, canvas size, current index) changes, so each mouse move is a
+single nearest neighbour query.
+'''
+import logging
+
+from typing import Any
+
+import numpy as np
+import scipy.spatial
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenPickingIndex:
+	def __init__(self):
+		self._state_key = None
+		self._tree = None
+		self._mo_infos = []
+		self._info_idxs = np.zeros(0, dtype=int)
+		self._point_idxs = np.zeros(0, dtype=int)
+
+	def isStale(self, state_key:tuple) -> bool:
+		'''Whether the index was built for a different state.'''
+		return self._state_key is None or state_key != self._state_key
+
+	def invalidate(self) -> None:
+		self._state_key = None
+		self._tree = None
+
+	def rebuild(self, state_key:tuple, mo_infos:list[dict[str, Any]], masks:list[np.ndarray]|None=None) -> None:
+		'''Build the index from the mouse over info of each asset.
+
+		Args:
+			state_key (tuple): hashable state the screen positions are valid for
+			mo_infos (list[dict[str, Any]]): mouse over info of each asset, as returned by getScreenMouseOverInfo
+			masks (list[np.ndarray]|None): boolean array per asset, points set to False can't be picked
+		'''
+		screen_poss = []
+		info_idxs = []
+		point_idxs = []
+		for jj, mo_info in enumerate(mo_infos):
+			if len(mo_info['screen_pos']) == 0:
+				continue
+			# unmapped positions are None, which become nan
+			screen_pos = np.asarray(mo_info['screen_pos'], dtype=float).reshape(-1,2)
+			valid = np.all(np.isfinite(screen_pos), axis=1)
+			if masks is not None:
+				valid &= masks[jj]
+			valid_idxs = np.flatnonzero(valid)
+			screen_poss.append(screen_pos[valid_idxs])
+			info_idxs.append(np.full(len(valid_idxs), jj))
+			point_idxs.append(valid_idxs)
+
+		self._state_key = state_key
+		self._mo_infos = mo_infos
+		if sum(len(idxs) for idxs in point_idxs) == 0:
+			self._tree = None
+			self._info_idxs = np.zeros(0, dtype=int)
+			self._point_idxs = np.zeros(0, dtype=int)
+			return
+		self._tree = scipy.spatial.cKDTree(np.vstack(screen_poss))
+		self._info_idxs = np.concatenate(info_idxs)
+		self._point_idxs = np.concatenate(point_idxs)
+
+	def query(self, screen_pos:tuple[float,float], threshold:float) -> tuple[dict[str, Any], int]|None:
+		'''Find the nearest point to a screen position.
+
+		Args:
+			screen_pos (tuple[float,float]): canvas position, i.e. of the mouse
+			threshold (float): maximum horizontal and vertical distance to a point [pixels]
+
+		Returns:
+			tuple[dict[str, Any], int]|None: mouse over info of the asset owning the nearest point, and the
+				index of the point within it. None if there is no point within the threshold
+		'''
+		if self._tree is None:
+			return None
+		# chebyshev distance, so the pick region is a square around the point
+		dist, idx = self._tree.query(np.asarray(screen_pos, dtype=float)[:2], p=np.inf, distance_upper_bound=threshold)
+		if not np.isfinite(dist):
+			return None
+		return self._mo_infos[self._info_idxs[idx]], int(self._point_idxs[idx])
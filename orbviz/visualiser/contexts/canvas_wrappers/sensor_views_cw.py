@@ -13,7 +13,9 @@ from vispy.app.canvas import MouseEvent
 from orbviz.model.data_models.data_types import SensorImgMetadata
 from orbviz.model.data_models.earth_raycast_data import EarthRayCastData
 from orbviz.model.data_models.history_data import HistoryData
+import orbviz.model.tiled_render as tiled_render
 import orbviz.util.exceptions as exceptions
+import orbviz.util.threading as threading
 import orbviz.visualiser.assets.base_assets as base_assets
 import orbviz.visualiser.assets.sensors as sensors
 import orbviz.visualiser.assets.spacecraft as spacecraft
@@ -29,6 +31,108 @@ MOUSEOVER_DIST_THRESHOLD = 5
 last_mevnt_time = time.monotonic()
 mouse_over_is_highlighting = False
 
+# target time to raycast the previews of all displayed sensor views [s]
+DFLT_FRAME_TIME_BUDGET = sensors.DFLT_PREVIEW_FRAME_TIME_BUDGET/1000
+# allowed sizes of the longest side of a sensor preview image [px]
+PREVIEW_RESOLUTION_STEPS = (120, 160, 240, 320, 400, 480, 640, 800, 960)
+
+
+class PreviewResolutionGovernor:
+	'''Adjusts the preview resolution of each displayed sensor view to keep the total time taken
+		to raycast all previews within a frame time budget.
+
+		The budget is split evenly between the displayed views. Raycast times are smoothed, a view
+		must be over budget for several consecutive frames before its resolution is lowered, and it
+		is only raised when the predicted cost at the next step up is comfortably within budget,
+		so that the resolution does not oscillate between two steps.
+	'''
+	# fraction of a view's budget which the predicted time at the next step up must be under
+	UPSCALE_THRESHOLD = 0.7
+	# number of consecutive frames a view must be over/under budget before changing resolution
+	DOWNSCALE_FRAMES = 2
+	UPSCALE_FRAMES = 6
+	# exponential smoothing factor of measured raycast times
+	SMOOTHING = 0.5
+
+	def __init__(self, frame_time_budget:float=DFLT_FRAME_TIME_BUDGET,
+						resolution_steps:tuple[int,...]=PREVIEW_RESOLUTION_STEPS):
+		self.frame_time_budget = frame_time_budget
+		self.resolution_steps = resolution_steps
+		self.enabled = True
+		self._view_stats: dict[int, dict[str,Any]] = {}
+		self._held_resolutions: list[tuple[sensors.SensorImageAsset, int]]|None = None
+
+	def setFrameTimeBudget(self, frame_time_budget:float) -> None:
+		self.frame_time_budget = frame_time_budget
+		self.reset()
+
+	def setEnabled(self, state:bool) -> None:
+		self.enabled = state
+		self.reset()
+
+	def reset(self) -> None:
+		self._view_stats = {}
+
+	def hold(self, sensor_assets:list[sensors.SensorImageAsset], resolution:int) -> None:
+		'''Set every view to one preview resolution, and keep it there until released.'''
+		if self._held_resolutions is None:
+			self._held_resolutions = [(sensor_asset, sensor_asset.getPreviewResolution()) for sensor_asset in sensor_assets]
+		for sensor_asset in sensor_assets:
+			sensor_asset.setPreviewResolution(resolution)
+
+	def release(self) -> None:
+		'''Return each held view to the preview resolution it had before being held.'''
+		if self._held_resolutions is None:
+			return
+		for sensor_asset, resolution in self._held_resolutions:
+			sensor_asset.setPreviewResolution(resolution)
+		self._held_resolutions = None
+		self.reset()
+
+	def isHeld(self) -> bool:
+		return self._held_resolutions is not None
+
+	def update(self, sensor_assets:list[sensors.SensorImageAsset]) -> None:
+		if not self.enabled or self.isHeld() or len(sensor_assets) == 0:
+			return
+		view_budget = self.frame_time_budget/len(sensor_assets)
+		for sensor_asset in sensor_assets:
+			raycast_time = sensor_asset.popPreviewRaycastTime()
+			if raycast_time is None:
+				continue
+			stats = self._view_stats.setdefault(id(sensor_asset), {'time':raycast_time, 'over':0, 'under':0})
+			stats['time'] = self.SMOOTHING*raycast_time + (1-self.SMOOTHING)*stats['time']
+
+			curr_res = sensor_asset.getPreviewResolution()
+			step_idx = self._nearestStepIdx(curr_res)
+			max_res = max(sensor_asset.data['res'])
+
+			if stats['time'] > view_budget and step_idx > 0:
+				stats['over'] += 1
+				stats['under'] = 0
+				if stats['over'] >= self.DOWNSCALE_FRAMES:
+					self._changeResolution(sensor_asset, stats, curr_res, self.resolution_steps[step_idx-1])
+			elif step_idx < len(self.resolution_steps)-1 and self.resolution_steps[step_idx+1] <= max_res \
+					and stats['time']*(self.resolution_steps[step_idx+1]/curr_res)**2 < self.UPSCALE_THRESHOLD*view_budget:
+				stats['under'] += 1
+				stats['over'] = 0
+				if stats['under'] >= self.UPSCALE_FRAMES:
+					self._changeResolution(sensor_asset, stats, curr_res, self.resolution_steps[step_idx+1])
+			else:
+				stats['over'] = 0
+				stats['under'] = 0
+
+	def _nearestStepIdx(self, resolution:int) -> int:
+		return min(range(len(self.resolution_steps)), key=lambda ii: abs(self.resolution_steps[ii]-resolution))
+
+	def _changeResolution(self, sensor_asset:sensors.SensorImageAsset, stats:dict[str,Any],
+							old_res:int, new_res:int) -> None:
+		sensor_asset.setPreviewResolution(new_res)
+		# raycast cost scales with the number of pixels
+		stats['time'] *= (new_res/old_res)**2
+		stats['over'] = 0
+		stats['under'] = 0
+
 
 class SensorViewsCanvasWrapper(BaseCanvas):
 	def __init__(self, w:int=800, h:int=600, keys:str='interactive', bgcolor:str='white'):
@@ -70,6 +174,7 @@ class SensorViewsCanvasWrapper(BaseCanvas):
 		self.mouseOverTimer = QtCore.QTimer()
 		self.mouseOverTimer.timeout.connect(self._setMouseOverVisible)
 		self.mouseOverObject = None
+		self.resolution_governor = PreviewResolutionGovernor()
 
 	def _buildAssets(self) -> None:
 		self.assets['spacecraft'] = spacecraft.SpacecraftViewsAsset(v_parent=None)
@@ -77,16 +182,32 @@ class SensorViewsCanvasWrapper(BaseCanvas):
 	def _getCurrentDisplayedSensor(self, view:int) -> sensors.SensorImageAsset | None:
 		return self.displayed_sensors[view]
 
+	def isSensorFullResTiled(self, sc_id: int, sens_suite_key: str, sens_key: str) -> bool:
+		sensor_asset = self.assets['spacecraft'].getSensorSuiteByKey(sens_suite_key).getSensorByKey(sens_key)
+		return sensor_asset.isFullResTiled()
+
 	def generateSensorFullRes(self, sc_id: int, sens_suite_key: str, sens_key: str) -> tuple[np.ndarray, np.ndarray, object, SensorImgMetadata]:
 		# TOOD: use sc_id to select which spacecraft asset to generate
-		sc_asset = self.assets['spacecraft']
 		sensor_asset = self.assets['spacecraft'].getSensorSuiteByKey(sens_suite_key).getSensorByKey(sens_key)
 		img_data, mo_data, moConverterFunction = sensor_asset.generateFullRes()
-		img_metadata = SensorImgMetadata(spacecraft_id=sc_id,
+		img_metadata = self._buildSensorImgMetadata(sc_id, sens_suite_key, sens_key, (img_data.shape[1], img_data.shape[0]))
+		return img_data, mo_data, moConverterFunction, img_metadata
+
+	def generateSensorTiledFullRes(self, sc_id: int, sens_suite_key: str, sens_key: str) -> tuple[tiled_render.TiledSensorImage, threading.Worker, object, SensorImgMetadata]:
+		# TOOD: use sc_id to select which spacecraft asset to generate
+		sensor_asset = self.assets['spacecraft'].getSensorSuiteByKey(sens_suite_key).getSensorByKey(sens_key)
+		tiled_img, worker, moConverterFunction = sensor_asset.generateTiledFullRes()
+		img_metadata = self._buildSensorImgMetadata(sc_id, sens_suite_key, sens_key, tiled_img.resolution)
+		return tiled_img, worker, moConverterFunction, img_metadata
+
+	def _buildSensorImgMetadata(self, sc_id: int, sens_suite_key: str, sens_key: str, resolution:tuple[int,int]) -> SensorImgMetadata:
+		sc_asset = self.assets['spacecraft']
+		sensor_asset = self.assets['spacecraft'].getSensorSuiteByKey(sens_suite_key).getSensorByKey(sens_key)
+		return SensorImgMetadata(spacecraft_id=sc_id,
 						spacecraft_name=self.assets['spacecraft'].data['name'],
 						sensor_suite_name=sens_suite_key,
 						sensor_name=sens_key,
-						resolution=(img_data.shape[1], img_data.shape[0]),
+						resolution=resolution,
 						fov=sensor_asset.data['fov'],
 						lens_model=sensor_asset.data['lens_model'].__name__,
 						current_time=sensor_asset.data['curr_datetime'],
@@ -96,8 +217,6 @@ class SensorViewsCanvasWrapper(BaseCanvas):
 						sensor_eci_quaternion=sensor_asset.data['curr_quat'].reshape(4,).tolist(),
 						image_md5_hash=None)
 
-		return img_data, mo_data, moConverterFunction, img_metadata
-
 	def selectSensor(self, view:int, sc_id: int, sens_suite_key: str, sens_key: str) -> None:
 		# remove parent scene of old sensor
 		# make old sensor dormant
@@ -169,9 +288,46 @@ class SensorViewsCanvasWrapper(BaseCanvas):
 				asset.updateIndex(index)
 
 	def recomputeRedraw(self) -> None:
+		self._applyGovernorOptions()
 		for asset in self.assets.values():
 			if asset.isActive():
 				asset.recomputeRedraw()
+		self.resolution_governor.update([sensor for sensor in self.displayed_sensors if sensor is not None])
+
+	def prefetchPreviews(self, indices:np.ndarray) -> None:
+		'''Raycast the previews of the displayed sensors at upcoming indices ahead of playback.'''
+		for sensor in self.displayed_sensors:
+			if sensor is not None:
+				sensor.prefetchPreviews(indices)
+
+	def _applyGovernorOptions(self) -> None:
+		# governor settings are exposed as options of the spacecraft asset
+		sc_opts = self.assets['spacecraft'].opts
+		frame_time_budget = sc_opts['preview_frame_time_budget']['value']/1000
+		if frame_time_budget != self.resolution_governor.frame_time_budget:
+			self.setFrameTimeBudget(frame_time_budget)
+		if sc_opts['adaptive_preview_resolution']['value'] != self.resolution_governor.enabled:
+			self.setAdaptivePreviewResolution(sc_opts['adaptive_preview_resolution']['value'])
+
+	def setFrameTimeBudget(self, frame_time_budget:float) -> None:
+		self.resolution_governor.setFrameTimeBudget(frame_time_budget)
+
+	def holdPreviewResolution(self) -> None:
+		'''Raycast the previews of the displayed sensors at the default resolution until released,
+			so that exported frames don't depend on how long each took to raycast.'''
+		self.resolution_governor.hold([sensor for sensor in self.displayed_sensors if sensor is not None],
+										sensors.DFLT_PREVIEW_1D_RESOLUTION)
+
+	def releasePreviewResolution(self) -> None:
+		self.resolution_governor.release()
+
+	def setAdaptivePreviewResolution(self, state:bool) -> None:
+		self.resolution_governor.setEnabled(state)
+		if not state:
+			# previews stay at the default resolution while not adapting
+			for sensor in self.displayed_sensors:
+				if sensor is not None:
+					sensor.setPreviewResolution(sensors.DFLT_PREVIEW_1D_RESOLUTION)
 
 	def setFirstDrawFlags(self) -> None:
 		for asset in self.assets.values():
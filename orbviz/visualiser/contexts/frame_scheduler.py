@@ -0,0 +1,63 @@
+'''Coalesces index changes of a context into at most one redraw per display refresh.
+
+Dragging the time slider emits many index changes per frame. Each change only replaces the pending
+index, and the latest is drawn once the next display refresh is due. Contexts which aren't visible
+only hold their pending index, and catch up with a single redraw when they are made active.
+'''
+import logging
+import time
+
+from collections.abc import Callable
+
+from PyQt5 import QtCore
+
+from orbviz.util.display import frameInterval
+
+logger = logging.getLogger(__name__)
+
+
+class FrameScheduler:
+	def __init__(self, draw_fn:Callable[[int], None]):
+		self._draw_fn = draw_fn
+		self._pending_index = None
+		self._visible = False
+		self._last_draw_time = None
+		self._timer = QtCore.QTimer()
+		self._timer.setSingleShot(True)
+		self._timer.timeout.connect(self.flush)
+
+	def requestIndex(self, index:int) -> None:
+		'''Draw index on the next display refresh, or once visible, replacing any index not yet drawn.'''
+		self._pending_index = index
+		if not self._visible or self._timer.isActive():
+			return
+		self._timer.start(self._msUntilNextFrame())
+
+	def flush(self) -> None:
+		'''Draw the pending index now.'''
+		self._timer.stop()
+		if self._pending_index is None:
+			return
+		index = self._pending_index
+		self._pending_index = None
+		self._last_draw_time = time.perf_counter()
+		self._draw_fn(index)
+
+	def setVisible(self, state:bool) -> None:
+		'''Set whether draws are scheduled, becoming visible draws any index requested while hidden.'''
+		self._visible = state
+		if state:
+			self.flush()
+		else:
+			self._timer.stop()
+
+	def isDirty(self) -> bool:
+		'''Whether an index has been requested but not yet drawn.'''
+		return self._pending_index is not None
+
+	def _msUntilNextFrame(self) -> int:
+		if self._last_draw_time is None:
+			return 0
+		elapsed = time.perf_counter() - self._last_draw_time
+		return max(int((frameInterval() - elapsed) * 1000), 0)
+
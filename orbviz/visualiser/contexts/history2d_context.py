@@ -3,13 +3,8 @@ import pathlib
 
 from typing import Any
 
-import imageio
-
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-import vispy.app as app
-from vispy.gloo.util import _screenshot
-
 import orbviz.model.data_models.data_types as data_types
 from orbviz.model.data_models.earth_raycast_data import EarthRayCastData
 from orbviz.model.data_models.groundstation_data import GroundStationCollection
@@ -18,6 +13,7 @@ import orbviz.visualiser.contexts.base_context as base
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
 from orbviz.visualiser.contexts.canvas_wrappers.cw_container import CWContainer
 import orbviz.visualiser.contexts.canvas_wrappers.history2d_cw as history2d_cw
+import orbviz.visualiser.contexts.video_export as video_export
 import orbviz.visualiser.interface.console as console
 import orbviz.visualiser.interface.controls as controls
 import orbviz.visualiser.interface.dialogs as dialogs
@@ -79,7 +75,7 @@ class History2DContext(base.BaseContext):
 
 	def connectControls(self) -> None:
 		logger.info("Connecting controls of %s", self.config['name'])
-		self.controls.time_slider.add_connect(self._updateDisplayedIndex)
+		self.controls.time_slider.add_connect(self.requestDisplayedIndex)
 		self.controls.action_dict['center-earth']['callback'] = self._centerCameraEarth
 		self.controls.action_dict['save-gif']['callback'] = self.setupGIFDialog
 		self.controls.action_dict['save-screenshot']['callback'] = self.setupScreenshot
@@ -143,44 +139,20 @@ class History2DContext(base.BaseContext):
 	def _centerCameraEarth(self) -> None:
 		self.canvas_wrapper.centerCameraEarth()
 
-	def saveGif(self, file:pathlib.Path, loop=True, camera_adjustment_data=None, start_index=0, end_index=-1):
-		# TODO: need to lockout controls
-		console.send('Starting GIF saving, please do not touch the controls.')
+	def saveGif(self, file:pathlib.Path, loop=True, camera_adjustment_data=None, start_index=0, end_index=-1,
+					resolution=None, fps=video_export.DFLT_EXPORT_FPS):
 		max_num_steps = self.controls.time_slider.num_ticks
 		start_idx = max(0, min(start_index, max_num_steps))
 		if end_index == -1:
 			end_index = max_num_steps
 		end_idx = max(start_idx, min(end_index, max_num_steps))
 
-		if loop:
-			num_loops = 0
-		else:
-			num_loops = 1
-
-		writer = imageio.get_writer(file, loop=num_loops)
-
-		# calculate viewport of just the canvas
-		geom = self.canvas_wrapper.canvas.native.geometry()
-		ratio = self.canvas_wrapper.canvas.native.devicePixelRatio()
-		geom = (geom.x(), geom.y(), geom.width(), geom.height())
-		new_pos = self.canvas_wrapper.canvas.native.mapTo(self.window, QtCore.QPoint(0, 0))
-		new_y = self.window.height() - (new_pos.y() + geom[3])
-		viewport = (new_pos.x() * ratio, new_y * ratio, geom[2] * ratio, geom[3] * ratio)
-
-		for ii in range(start_idx, end_idx):
-			self.controls.time_slider.setValue(ii)
-			app.process_events()
-
-			im = _screenshot(viewport=viewport)
-			writer.append_data(im)
-			# use this to print to console on last iteration, otherwise thread doesn't get serviced until after writer closes
-			if ii==end_idx-1:
-				console.send("Writing file. Please wait...")
-				app.process_events()
-
-		writer.close()
-		self.controls.time_slider.setValue(start_idx)
-		console.send(f"Saved {self.config['name']} GIF to {file}")
+		self.controls.time_slider.pausePlayback()
+		try:
+			self.exportFrames(file, range(start_idx, end_idx), self.controls.time_slider.setValue,
+								resolution=resolution, fps=fps, loop=loop)
+		finally:
+			self.controls.time_slider.setValue(start_idx)
 
 	def setupGIFDialog(self):
 		dflt_camera_setup = {}
@@ -189,7 +161,8 @@ class History2DContext(base.BaseContext):
 							self,
 							self.canvas_wrapper.view_box.camera.name,
 							dflt_camera_setup,
-							timespan_max_range)
+							timespan_max_range,
+							dflt_resolution=self.canvas_wrapper.canvas.physical_size)
 
 class Controls(base.BaseControls):
 	def __init__(self, parent_context:base.BaseContext, canvas_wrapper:BaseCanvas):
@@ -212,7 +185,6 @@ class Controls(base.BaseControls):
 		self.menubar = controls.Menubar(self.context.window, self.action_dict, context_name=self.context.config['name'])
 
 		self.setHotkeys()
-		self._connectSliderCamUpdate()
 
 	def setHotkeys(self):
 		self.shortcuts={}
@@ -224,13 +196,8 @@ class Controls(base.BaseControls):
 		self.shortcuts['Home'].activated.connect(self.time_slider.setBeginning)
 		self.shortcuts['End'] = QtWidgets.QShortcut(QtGui.QKeySequence('End'), self.context.widget)
 		self.shortcuts['End'].activated.connect(self.time_slider.setEnd)
-
-	def _connectSliderCamUpdate(self):
-		self.time_slider.slider.valueChanged.connect(self._updateCam)
-
-	def _updateCam(self):
-		if self.context.sccam_state and self.context.canvas_wrapper is not None:
-			self.context.canvas_wrapper.centerCameraSpacecraft(set_zoom=False)
+		self.shortcuts['Space'] = QtWidgets.QShortcut(QtGui.QKeySequence('Space'), self.context.widget)
+		self.shortcuts['Space'].activated.connect(self.time_slider.togglePlayback)
 
 	def getCurrIndex(self):
 		return self.time_slider.getValue()
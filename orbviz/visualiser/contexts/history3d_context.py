@@ -3,19 +3,15 @@ import pathlib
 
 from typing import Any
 
-import imageio
-
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-import vispy.app as app
-from vispy.gloo.util import _screenshot
-
 import orbviz.model.data_models.data_types as data_types
 from orbviz.model.data_models.groundstation_data import GroundStationCollection
 from orbviz.model.data_models.history_data import HistoryData
 import orbviz.visualiser.contexts.base_context as base
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
 import orbviz.visualiser.contexts.canvas_wrappers.history3d_cw as history3d_cw
+import orbviz.visualiser.contexts.video_export as video_export
 import orbviz.visualiser.interface.console as console
 import orbviz.visualiser.interface.controls as controls
 import orbviz.visualiser.interface.dialogs as dialogs
@@ -76,7 +72,7 @@ class History3DContext(base.BaseContext):
 
 	def connectControls(self) -> None:
 		logger.info("Connecting controls of %s", self.config['name'])
-		self.controls.time_slider.add_connect(self._updateDisplayedIndex)
+		self.controls.time_slider.add_connect(self.requestDisplayedIndex)
 		self.controls.action_dict['center-earth']['callback'] = self._centerCameraEarth
 		self.controls.action_dict['center-spacecraft']['callback'] = self._toggleCameraSpacecraft
 		self.controls.action_dict['save-gif']['callback'] = self.setupGIFDialog
@@ -108,6 +104,9 @@ class History3DContext(base.BaseContext):
 		self.canvas_wrapper.updateIndex(index)
 		self.data['history'].updateIndex(index)
 		self.canvas_wrapper.recomputeRedraw()
+		if self.sccam_state:
+			# follow the spacecraft once its assets are at the new index
+			self.canvas_wrapper.centerCameraSpacecraft(set_zoom=False)
 
 	def _procDataUpdated(self):
 		self._updateControls()
@@ -172,9 +171,8 @@ class History3DContext(base.BaseContext):
 																			'el_start':0,
 																			'az_range':0,
 																			'el_range':0},
-																			start_index=0, end_index=-1):
-		# TODO: need to lockout controls
-		console.send('Starting GIF saving, please do not touch the controls.')
+																			start_index=0, end_index=-1,
+																			resolution=None, fps=video_export.DFLT_EXPORT_FPS):
 		max_num_steps = self.controls.time_slider.num_ticks
 		start_idx = max(0, min(start_index, max_num_steps))
 		if end_index == -1:
@@ -189,41 +187,19 @@ class History3DContext(base.BaseContext):
 		azimuth_step_angle = camera_adjustment_data['az_range']/num_steps
 		elevation_step_angle = camera_adjustment_data['el_range']/num_steps
 
-		if loop:
-			num_loops = 0
-		else:
-			num_loops = 1
-
-		writer = imageio.get_writer(file, loop=num_loops)
-
-		# calculate viewport of just the canvas
-		geom = self.canvas_wrapper.canvas.native.geometry()
-		ratio = self.canvas_wrapper.canvas.native.devicePixelRatio()
-		geom = (geom.x(), geom.y(), geom.width(), geom.height())
-		new_pos = self.canvas_wrapper.canvas.native.mapTo(self.window, QtCore.QPoint(0, 0))
-		new_y = self.window.height() - (new_pos.y() + geom[3])
-		viewport = (new_pos.x() * ratio, new_y * ratio, geom[2] * ratio, geom[3] * ratio)
-
-		for ii in range(start_idx, end_idx):
-
+		def prepareFrame(ii:int) -> None:
 			self.canvas_wrapper.view_box.camera.azimuth = start_azimuth - ii*azimuth_step_angle
 			self.canvas_wrapper.view_box.camera.elevation = start_elevation - ii*elevation_step_angle
 			self.canvas_wrapper.onManualCameraRotate()
 			self.controls.time_slider.setValue(ii)
-			app.process_events()
-
-			im = _screenshot(viewport=viewport)
-			writer.append_data(im)
-			# use this to print to console on last iteration, otherwise thread doesn't get serviced until after writer closes
-			if ii==end_idx-1:
-				console.send("Writing file. Please wait...")
-				app.process_events()
 
-		writer.close()
-		self.canvas_wrapper.view_box.camera.azimuth = start_azimuth
-		self.canvas_wrapper.view_box.camera.elevation = start_elevation
-		self.controls.time_slider.setValue(start_idx)
-		console.send(f"Saved {self.config['name']} GIF to {file}")
+		self.controls.time_slider.pausePlayback()
+		try:
+			self.exportFrames(file, range(start_idx, end_idx), prepareFrame, resolution=resolution, fps=fps, loop=loop)
+		finally:
+			self.canvas_wrapper.view_box.camera.azimuth = start_azimuth
+			self.canvas_wrapper.view_box.camera.elevation = start_elevation
+			self.controls.time_slider.setValue(start_idx)
 
 	def setupGIFDialog(self):
 		dflt_camera_setup = {'az_start':self.canvas_wrapper.view_box.camera.azimuth,
@@ -233,7 +209,8 @@ class History3DContext(base.BaseContext):
 							self,
 							self.canvas_wrapper.view_box.camera.name,
 							dflt_camera_setup,
-							timespan_max_range)
+							timespan_max_range,
+							dflt_resolution=self.canvas_wrapper.canvas.physical_size)
 
 		
 class Controls(base.BaseControls):
@@ -257,34 +234,24 @@ class Controls(base.BaseControls):
 		self.menubar = controls.Menubar(self.context.window, self.action_dict, context_name=self.context.config['name'])
 
 		self.setHotkeys()
-		self._connectSliderCamUpdate()
 
 	def setHotkeys(self):
 		self.shortcuts['PgDown'] = QtWidgets.QShortcut(QtGui.QKeySequence('PgDown'), self.context.widget)
 		self.shortcuts['PgDown'].activated.connect(self.time_slider.incrementValue)
-		self.shortcuts['PgDown'].activated.connect(self._updateCam)
 		self.shortcuts['PgUp'] = QtWidgets.QShortcut(QtGui.QKeySequence('PgUp'), self.context.widget)
 		self.shortcuts['PgUp'].activated.connect(self.time_slider.decrementValue)
-		self.shortcuts['PgUp'].activated.connect(self._updateCam)
 		self.shortcuts['Home'] = QtWidgets.QShortcut(QtGui.QKeySequence('Home'), self.context.widget)
 		self.shortcuts['Home'].activated.connect(self.time_slider.setBeginning)
-		self.shortcuts['Home'].activated.connect(self._updateCam)
 		self.shortcuts['End'] = QtWidgets.QShortcut(QtGui.QKeySequence('End'), self.context.widget)
 		self.shortcuts['End'].activated.connect(self.time_slider.setEnd)
-		self.shortcuts['End'].activated.connect(self._updateCam)
+		self.shortcuts['Space'] = QtWidgets.QShortcut(QtGui.QKeySequence('Space'), self.context.widget)
+		self.shortcuts['Space'].activated.connect(self.time_slider.togglePlayback)
 		# self.shortcuts['F12'] = QtWidgets.QShortcut(QtGui.QKeySequence('F12'), self.context.window)
 		# self.shortcuts['F12'].activated.connect(self.context.setupGIFDialog)
 
 	def getCurrIndex(self) -> int:
 		return self.time_slider.getValue()
 
-	def _connectSliderCamUpdate(self):
-		self.time_slider.slider.valueChanged.connect(self._updateCam)
-
-	def _updateCam(self):
-		if self.context.sccam_state and self.context.canvas_wrapper is not None:
-			self.context.canvas_wrapper.centerCameraSpacecraft(set_zoom=False)
-
 	def prepSerialisation(self):
 		state = {}
 		state['config_controls'] = self.config_controls.prepSerialisation()
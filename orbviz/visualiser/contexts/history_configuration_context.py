@@ -62,7 +62,7 @@ class HistoryConfigurationContext(BaseContext):
 		logger.info("Connecting controls of %s", self.config['name'])
 		self.controls.submit_button.clicked.connect(self._configureData)
 		self.data['history'].data_err.connect(self._resetControls)
-		self.controls.time_slider.add_connect(self._updateDisplayedIndex)
+		self.controls.time_slider.add_connect(self.requestDisplayedIndex)
 
 	def _configureData(self) -> None:
 		logger.info('Setting up data configuration for context: %s', self)
@@ -263,6 +263,8 @@ class Controls(BaseControls):
 		self.shortcuts['Home'].activated.connect(self.time_slider.setBeginning)
 		self.shortcuts['End'] = QtWidgets.QShortcut(QtGui.QKeySequence('End'), self.context.widget)
 		self.shortcuts['End'].activated.connect(self.time_slider.setEnd)
+		self.shortcuts['Space'] = QtWidgets.QShortcut(QtGui.QKeySequence('Space'), self.context.widget)
+		self.shortcuts['Space'].activated.connect(self.time_slider.togglePlayback)
 
 	def _reloadConstellation(self, use_constellation_state:bool):
 		if use_constellation_state:
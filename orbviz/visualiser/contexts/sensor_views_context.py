@@ -3,13 +3,8 @@ import pathlib
 
 from typing import Any
 
-import imageio
-
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-import vispy.app as app
-from vispy.gloo.util import _screenshot
-
 import orbviz.model.data_models.data_types as data_types
 from orbviz.model.data_models.earth_raycast_data import EarthRayCastData
 from orbviz.model.data_models.groundstation_data import GroundStationCollection
@@ -17,6 +12,7 @@ from orbviz.model.data_models.history_data import HistoryData
 from orbviz.visualiser.contexts.base_context import BaseContext, BaseControls
 from orbviz.visualiser.contexts.canvas_wrappers.base_cw import BaseCanvas
 import orbviz.visualiser.contexts.canvas_wrappers.sensor_views_cw as sensor_views_cw
+import orbviz.visualiser.contexts.video_export as video_export
 import orbviz.visualiser.interface.console as console
 import orbviz.visualiser.interface.controls as controls
 import orbviz.visualiser.interface.dialogs as orbviz_dialogs
@@ -77,7 +73,8 @@ class SensorViewsContext(BaseContext):
 		self.layout.addWidget(content_widget)
 
 	def connectControls(self) -> None:
-		self.controls.time_slider.add_connect(self._updateDisplayedIndex)
+		self.controls.time_slider.add_connect(self.requestDisplayedIndex)
+		self.controls.time_slider.playback.addPrefetcher(self.canvas_wrapper.prefetchPreviews)
 		self.controls.sensor_view_selectors.selected.connect(self.setViewActiveSensor)
 		self.controls.sensor_view_selectors.generate.connect(self.generateSensorFullRes)
 		self.controls.action_dict['save-gif']['callback'] = self.setupGIFDialog
@@ -125,6 +122,11 @@ class SensorViewsContext(BaseContext):
 
 	def generateSensorFullRes(self, view_id:int, sc_id:int, suite_key:str, sens_key:str) -> None:
 		logger.debug('Generating Full Res for view %s: %s - %s - %s', view_id, sc_id, suite_key, sens_key)
+		if self.canvas_wrapper.isSensorFullResTiled(sc_id, suite_key, sens_key):
+			tiled_img, worker, moConverterFunction, img_metadata = self.canvas_wrapper.generateSensorTiledFullRes(sc_id, suite_key, sens_key)
+			orbviz_dialogs.fullResSensorImageDialog(None, tiled_img.mo_data, moConverterFunction, img_metadata,
+													tiled_img=tiled_img, tiled_worker=worker)
+			return
 		img_data, mo_data, moConverterFunction, img_metadata = self.canvas_wrapper.generateSensorFullRes(sc_id, suite_key, sens_key)
 		orbviz_dialogs.fullResSensorImageDialog(img_data, mo_data, moConverterFunction, img_metadata)
 
@@ -140,44 +142,22 @@ class SensorViewsContext(BaseContext):
 	def saveState(self) -> None:
 		pass
 		
-	def saveGif(self, file:pathlib.Path, loop=True, camera_adjustment_data=None, start_index=0, end_index=-1):
-		# TODO: need to lockout controls
-		console.send('Starting GIF saving, please do not touch the controls.')
+	def saveGif(self, file:pathlib.Path, loop=True, camera_adjustment_data=None, start_index=0, end_index=-1,
+					resolution=None, fps=video_export.DFLT_EXPORT_FPS):
 		max_num_steps = self.controls.time_slider.num_ticks
 		start_idx = max(0, min(start_index, max_num_steps))
 		if end_index == -1:
 			end_index = max_num_steps
 		end_idx = max(start_idx, min(end_index, max_num_steps))
 
-		if loop:
-			num_loops = 0
-		else:
-			num_loops = 1
-
-		writer = imageio.get_writer(file, loop=num_loops)
-
-		# calculate viewport of just the canvas
-		geom = self.canvas_wrapper.canvas.native.geometry()
-		ratio = self.canvas_wrapper.canvas.native.devicePixelRatio()
-		geom = (geom.x(), geom.y(), geom.width(), geom.height())
-		new_pos = self.canvas_wrapper.canvas.native.mapTo(self.window, QtCore.QPoint(0, 0))
-		new_y = self.window.height() - (new_pos.y() + geom[3])
-		viewport = (new_pos.x() * ratio, new_y * ratio, geom[2] * ratio, geom[3] * ratio)
-
-		for ii in range(start_idx, end_idx):
-			self.controls.time_slider.setValue(ii)
-			app.process_events()
-
-			im = _screenshot(viewport=viewport)
-			writer.append_data(im)
-			# use this to print to console on last iteration, otherwise thread doesn't get serviced until after writer closes
-			if ii==end_idx-1:
-				console.send("Writing file. Please wait...")
-				app.process_events()
-
-		writer.close()
-		self.controls.time_slider.setValue(start_idx)
-		console.send(f"Saved {self.config['name']} GIF to {file}")
+		self.controls.time_slider.pausePlayback()
+		self.canvas_wrapper.holdPreviewResolution()
+		try:
+			self.exportFrames(file, range(start_idx, end_idx), self.controls.time_slider.setValue,
+								resolution=resolution, fps=fps, loop=loop)
+		finally:
+			self.canvas_wrapper.releasePreviewResolution()
+			self.controls.time_slider.setValue(start_idx)
 
 	def setupGIFDialog(self):
 		dflt_camera_setup = {}
@@ -186,7 +166,8 @@ class SensorViewsContext(BaseContext):
 							self,
 							self.canvas_wrapper.view_boxes[0].camera.name,
 							dflt_camera_setup,
-							timespan_max_range)
+							timespan_max_range,
+							dflt_resolution=self.canvas_wrapper.canvas.physical_size)
 
 
 class Controls(BaseControls):
@@ -220,6 +201,8 @@ class Controls(BaseControls):
 		self.shortcuts['Home'].activated.connect(self.time_slider.setBeginning)
 		self.shortcuts['End'] = QtWidgets.QShortcut(QtGui.QKeySequence('End'), self.context.widget)
 		self.shortcuts['End'].activated.connect(self.time_slider.setEnd)
+		self.shortcuts['Space'] = QtWidgets.QShortcut(QtGui.QKeySequence('Space'), self.context.widget)
+		self.shortcuts['Space'].activated.connect(self.time_slider.togglePlayback)
 
 	def updateSensorViewLists(self):
 		if self.context.data['history'].getConfigValue('is_pointing_defined'):
@@ -75,7 +75,7 @@ class TimeSeriesContext(BaseContext):
 
 	def connectControls(self) -> None:
 		logger.info("Connecting controls of %s", self.config['name'])
-		self.controls.time_slider.add_connect(self._updateDisplayedIndex)
+		self.controls.time_slider.add_connect(self.requestDisplayedIndex)
 		self.controls.action_dict['save-gif']['callback'] = self.setupGIFDialog
 		self.controls.action_dict['save-screenshot']['callback'] = self.setupScreenshot
 
@@ -154,6 +154,7 @@ class TimeSeriesContext(BaseContext):
 
 		for ii in range(start_idx, end_idx):
 			self.controls.time_slider.setValue(ii)
+			self.flushDisplayedIndex()
 			app.process_events()
 			self.canvas_wrapper.figure.canvas.draw()
 
@@ -0,0 +1,199 @@
+'''Export of a context's frames over a range of indices as a GIF or video file.
+
+Frames are rendered on the GUI thread, which owns the GL context, and handed to an encoder thread
+through a bounded queue, so rendering and encoding overlap and the memory held by pending frames is
+capped. GIFs are written with imageio, MP4 and WebM by piping raw frames to a local ffmpeg.
+'''
+import logging
+import pathlib
+import queue
+import shutil
+import subprocess
+import threading
+
+from collections.abc import Callable, Sequence
+
+import imageio
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('gif', 'mp4', 'webm')
+# number of rendered frames waiting to be encoded before rendering blocks
+FRAME_QUEUE_SIZE = 8
+# default frame rate of exported files [fps]
+DFLT_EXPORT_FPS = 24
+# how often a blocked queue operation checks for cancellation [s]
+QUEUE_POLL_PERIOD = 0.1
+
+_FFMPEG_CODEC_ARGS = {'mp4': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-crf', '18'],
+						'webm': ['-c:v', 'libvpx-vp9', '-pix_fmt', 'yuv420p', '-crf', '30', '-b:v', '0']}
+
+
+def exportFormat(file:pathlib.Path) -> str:
+	'''Format of an export file, from its extension.'''
+	fmt = pathlib.Path(file).suffix.lower().lstrip('.')
+	if fmt not in EXPORT_FORMATS:
+		logger.error("Can't export to %s, format must be one of %s", file, EXPORT_FORMATS)
+		raise ValueError(f"Can't export to {file}, format must be one of {EXPORT_FORMATS}")
+	return fmt
+
+def exportResolution(resolution:tuple[int,int], fmt:str) -> tuple[int,int]:
+	'''Resolution actually exported, video encoders need an even width and height.'''
+	width, height = max(int(resolution[0]), 1), max(int(resolution[1]), 1)
+	if fmt != 'gif':
+		width, height = max(width - width%2, 2), max(height - height%2, 2)
+	return width, height
+
+def ffmpegCommand(file:pathlib.Path, resolution:tuple[int,int], fps:float) -> list[str]:
+	'''ffmpeg command encoding raw RGB frames read from stdin.'''
+	fmt = exportFormat(file)
+	if fmt not in _FFMPEG_CODEC_ARGS:
+		logger.error("%s is not encoded with ffmpeg", fmt)
+		raise ValueError(f"{fmt} is not encoded with ffmpeg")
+	ffmpeg = shutil.which('ffmpeg')
+	if ffmpeg is None:
+		logger.error("Can't export %s, ffmpeg was not found on the PATH", file)
+		raise FileNotFoundError(f"Can't export {file}, ffmpeg was not found on the PATH")
+	return [ffmpeg, '-y', '-loglevel', 'error',
+			'-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{resolution[0]}x{resolution[1]}', '-r', f'{fps}',
+			'-i', '-', *_FFMPEG_CODEC_ARGS[fmt], str(file)]
+
+
+class VideoExporter:
+	def __init__(self, file:pathlib.Path, resolution:tuple[int,int], fps:float=DFLT_EXPORT_FPS, loop:bool=True):
+		'''Renders and encodes a sequence of frames.
+
+		Args:
+			file (pathlib.Path): output file, the format is taken from its extension
+			resolution (tuple[int,int]): width and height of the exported frames [pixels]
+			fps (float): frame rate of the exported file
+			loop (bool): whether a GIF loops, ignored for video
+		'''
+		self.file = pathlib.Path(file)
+		self.format = exportFormat(self.file)
+		self.resolution = exportResolution(resolution, self.format)
+		self.fps = fps
+		self.loop = loop
+		self.encoded_frames = 0
+		self._queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+		self._cancelled = threading.Event()
+		self._error = None
+		self._thread = None
+
+	def run(self, render_frame:Callable[[int], np.ndarray], indices:Sequence[int],
+				progress_callback:Callable[[int, int], None]|None=None) -> bool:
+		'''Render a frame for each index and encode them.
+
+		Args:
+			render_frame (Callable[[int], np.ndarray]): renders the frame for an index, as an (h,w,3|4) uint8 array
+			indices (Sequence[int]): indices to render, in order
+			progress_callback (Callable[[int, int], None]|None): given the number of frames rendered and the total,
+				after each frame. Cancel from here to stop the export
+
+		Returns:
+			bool: True if the file was written, False if the export was cancelled
+		'''
+		if self.format != 'gif':
+			# fail before rendering anything if ffmpeg is missing
+			ffmpegCommand(self.file, self.resolution, self.fps)
+		self.file.parent.mkdir(parents=True, exist_ok=True)
+		self._thread = threading.Thread(target=self._encode, name='video-encoder', daemon=True)
+		self._thread.start()
+		try:
+			for ii, index in enumerate(indices):
+				if self.isCancelled() or not self._put(self._fitFrame(render_frame(index))):
+					break
+				if progress_callback is not None:
+					progress_callback(ii+1, len(indices))
+		except Exception:
+			self.cancel()
+			raise
+		finally:
+			self._put(None, block_when_cancelled=True)
+			self._thread.join()
+
+		if self._error is not None:
+			logger.error("Failed to encode %s: %s", self.file, self._error)
+			raise RuntimeError(f"Failed to encode {self.file}: {self._error}") from self._error
+		if self.isCancelled():
+			self.file.unlink(missing_ok=True)
+			logger.info("Export of %s cancelled", self.file)
+			return False
+		return True
+
+	def cancel(self) -> None:
+		self._cancelled.set()
+
+	def isCancelled(self) -> bool:
+		return self._cancelled.is_set()
+
+	def _fitFrame(self, frame:np.ndarray) -> np.ndarray:
+		frame = np.asarray(frame)[:, :, :3]
+		width, height = self.resolution
+		if frame.shape[:2] != (height, width):
+			# pad or crop, i.e. the frame was rendered before rounding to an even size
+			fitted = np.zeros((height, width, 3), dtype=np.uint8)
+			h, w = min(height, frame.shape[0]), min(width, frame.shape[1])
+			fitted[:h, :w] = frame[:h, :w]
+			frame = fitted
+		return np.ascontiguousarray(frame, dtype=np.uint8)
+
+	def _put(self, frame:np.ndarray|None, block_when_cancelled:bool=False) -> bool:
+		while True:
+			if self._error is not None or not self._thread.is_alive():
+				return False
+			if self.isCancelled() and not block_when_cancelled:
+				return False
+			try:
+				self._queue.put(frame, timeout=QUEUE_POLL_PERIOD)
+			except queue.Full:
+				continue
+			else:
+				return True
+
+	def _frames(self):
+		while True:
+			frame = self._queue.get()
+			if frame is None:
+				return
+			if self.isCancelled():
+				# drain the queue, so the renderer can finish
+				continue
+			yield frame
+
+	def _encode(self) -> None:
+		try:
+			if self.format == 'gif':
+				self._encodeGif()
+			else:
+				self._encodeFFmpeg()
+		except Exception as e:
+			self._error = e
+			self.cancel()
+			# unblock the renderer, this thread is the only consumer
+			while not self._queue.empty():
+				self._queue.get_nowait()
+
+	def _encodeGif(self) -> None:
+		writer = imageio.get_writer(self.file, loop=0 if self.loop else 1, duration=1000/self.fps)
+		try:
+			for frame in self._frames():
+				writer.append_data(frame)
+				self.encoded_frames += 1
+		finally:
+			writer.close()
+
+	def _encodeFFmpeg(self) -> None:
+		proc = subprocess.Popen(ffmpegCommand(self.file, self.resolution, self.fps),
+								stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+		try:
+			for frame in self._frames():
+				proc.stdin.write(frame.tobytes())
+				self.encoded_frames += 1
+		except BrokenPipeError:
+			pass
+		finally:
+			_, stderr = proc.communicate()
+		if proc.returncode != 0 and not self.isCancelled():
+			raise RuntimeError(f"ffmpeg exited with {proc.returncode}: {stderr.decode(errors='replace').strip()}")
@@ -15,10 +15,13 @@ from vispy.app.canvas import MouseEvent
 
 from orbviz.model.data_models import data_types
 from orbviz.model.data_models import datapane as datapane_model
+import orbviz.model.tiled_render as tiled_render
 import orbviz.util.hashing as orbviz_hashing
 import orbviz.util.paths as orbviz_paths
+import orbviz.util.threading as threading
 import orbviz.visualiser.assets.widgets as vispy_widgets
 import orbviz.visualiser.cameras.RestrictedPanZoom as RestrictedPanZoom
+import orbviz.visualiser.contexts.video_export as video_export
 import orbviz.visualiser.interface.console as console
 import orbviz.visualiser.interface.datapane as datapane
 import orbviz.visualiser.interface.widgets as widgets
@@ -74,7 +77,8 @@ class SpaceTrackCredentialsDialog:
 		self.window.close()
 
 class GIFDialog:
-	def __init__(self, parent_window, opening_context, camera_type:str, dflt_camera_data:dict[str,float], num_ticks:int, three_dim=True):
+	def __init__(self, parent_window, opening_context, camera_type:str, dflt_camera_data:dict[str,float], num_ticks:int, three_dim=True,
+					dflt_resolution:tuple[int,int]|None=None):
 		if camera_type not in ['Turntable', 'RestrictedPanZoom', 'Static2D', 'matplotlib']:
 			raise ValueError("GIF capture not supported for this context's camera type")
 
@@ -94,8 +98,15 @@ class GIFDialog:
 													save=True,
 													margins=[0,0,0,0],
 													width=600)
+		self._file_selector.setToolTip('Saved as a GIF, or as a video if the file ends in .mp4 or .webm')
 		self.min_size = None
 
+		# offscreen export, frames are rendered at a chosen resolution
+		self.dflt_resolution = dflt_resolution
+		if self.dflt_resolution is not None:
+			self._width_option = widgets.ValueSpinner('Width [px]:', self.dflt_resolution[0], allow_no_callbacks=True)
+			self._fps_option = widgets.ValueSpinner('Frame rate [fps]:', video_export.DFLT_EXPORT_FPS, allow_no_callbacks=True)
+
 		store_start = QtWidgets.QPushButton('Store Start Time')
 		store_start.clicked.connect(self.storeStartTime)
 		store_start.setToolTip("Use Main Window's current displayed time as the GIF start time")
@@ -116,6 +127,9 @@ class GIFDialog:
 		hlayout1 = QtWidgets.QHBoxLayout()
 		hlayout1.addWidget(self._loop_option)
 		hlayout1.addStretch()
+		if self.dflt_resolution is not None:
+			hlayout1.addWidget(self._width_option)
+			hlayout1.addWidget(self._fps_option)
 		layout.addLayout(hlayout1)
 
 		if self.three_dim:
@@ -220,6 +234,14 @@ class GIFDialog:
 		slider_range = self._time_slider.getRange()
 		camera_adjustment_data = {}
 
+		export_kwargs = {}
+		if self.dflt_resolution is not None:
+			width = self._width_option.getValue()
+			# keep the canvas aspect ratio, the scene is scaled to fill the frame
+			height = round(width * self.dflt_resolution[1] / self.dflt_resolution[0])
+			export_kwargs['resolution'] = (width, height)
+			export_kwargs['fps'] = self._fps_option.getValue()
+
 		if self.three_dim and self._isCameraAdjustEnabled() :
 
 			for k,v in self.camera_adjustment_data_sources.items():
@@ -229,7 +251,8 @@ class GIFDialog:
 										loop=self._loop_option.getState(),
 										camera_adjustment_data=camera_adjustment_data,
 										start_index=slider_range[0],
-										end_index=slider_range[1])
+										end_index=slider_range[1],
+										**export_kwargs)
 		else:
 			for k,v in self.camera_adjustment_data_sources.items():
 				camera_adjustment_data[k] = v.getValue()
@@ -240,7 +263,8 @@ class GIFDialog:
 										loop=self._loop_option.getState(),
 										camera_adjustment_data=camera_adjustment_data,
 										start_index=slider_range[0],
-										end_index=slider_range[1])
+										end_index=slider_range[1],
+										**export_kwargs)
 
 class GroundStationDialog:
 	def __init__(self, shell:base_shell.BaseShell, enabled_gs:dict[str,dict[str,str|pathlib.Path]]={}):
@@ -361,7 +385,16 @@ class fullResSensorImageDialog:
 	MOUSEOVER_DIST_THRESHOLD = 5
 	last_mevnt_time = time.monotonic()
 	mouse_over_is_highlighting = False
-	def __init__(self, img_data, mo_data, moConverterFunction, img_metadata:data_types.SensorImgMetadata):
+	# minimum time between redraws of a tiled image's overview [s]
+	OVERVIEW_UPDATE_PERIOD = 0.25
+	def __init__(self, img_data, mo_data, moConverterFunction, img_metadata:data_types.SensorImgMetadata,
+					tiled_img:tiled_render.TiledSensorImage|None=None, tiled_worker:threading.Worker|None=None):
+		# a tiled image is displayed as its overview, which fills in as the worker raycasts each tile
+		self.tiled_img = tiled_img
+		self.tiled_worker = tiled_worker
+		self.last_overview_update = time.monotonic()
+		if tiled_img is not None:
+			img_data = tiled_img.overview/255
 		sc_name = img_metadata.getSCName()
 		sens_suite_name = img_metadata.getSensSuiteName()
 		sens_name = img_metadata.getSensName()
@@ -371,9 +404,15 @@ class fullResSensorImageDialog:
 
 		self.filename = f"{sc_name}-{sens_suite_name}-{sens_name}-{datetime_str}.bmp"
 		self.window = QtWidgets.QDialog()
-		self.window.setWindowTitle(f'Sensor Image - {sc_name}:{sens_suite_name} - {sens_name}')
+		self.title = f'Sensor Image - {sc_name}:{sens_suite_name} - {sens_name}'
+		self.window.setWindowTitle(self.title)
 		vlayout = QtWidgets.QVBoxLayout()
-		self.canvas = scene.canvas.SceneCanvas(size=(width/2,height/2),
+		if tiled_img is not None:
+			# size the window from the overview, large format images would not fit on screen
+			canvas_size = (img_data.shape[1]/2, img_data.shape[0]/2)
+		else:
+			canvas_size = (width/2, height/2)
+		self.canvas = scene.canvas.SceneCanvas(size=canvas_size,
 								keys='interactive',
 								bgcolor='white',
 								show=True)
@@ -391,6 +430,9 @@ class fullResSensorImageDialog:
 			img_data,
 			parent=self.view.scene,
 		)
+		if tiled_img is not None:
+			step = tiled_img.overview_step
+			self.visuals['image'].transform = scene.transforms.STTransform(scale=(step, step))
 		self.mo_data = mo_data
 		self.moConverterFunction = moConverterFunction
 		self.mouseOverText = vispy_widgets.PopUpTextBox(v_parent=self.canvas.scene,
@@ -441,6 +483,12 @@ class fullResSensorImageDialog:
 		save_button.clicked.connect(self.save)
 		cancel_button.clicked.connect(self.cancel)
 		self.mouseOverText.notifier.text_updated.connect(self.datapane.setMouseText)
+		self.save_button = save_button
+		if tiled_img is not None:
+			self.window.finished.connect(self._discardTiledImage)
+			tiled_worker.signals.progress.connect(self._onTileProgress)
+			tiled_worker.signals.finished.connect(self._updateOverview)
+			save_button.setEnabled(tiled_img.isComplete())
 
 		# Build Data Pane
 		self._buildDataPane(img_metadata)
@@ -454,9 +502,11 @@ class fullResSensorImageDialog:
 		save_file = self._saveFileDialog('Sensor Image Save...', dflt_path, self.filename)
 		if save_file.name != '':
 			self.save_file = pathlib.Path(save_file)
-			int_img_data = (self.img_data*255).astype(np.uint8)
-			im = Image.fromarray(int_img_data)
-			im.save(self.save_file)
+			if self.tiled_img is not None:
+				self.tiled_img.save(self.save_file)
+			else:
+				im = Image.fromarray((self.img_data*255).astype(np.uint8))
+				im.save(self.save_file)
 
 			self.img_metadata.setHash(orbviz_hashing.md5(self.save_file))
 			metadata_file = self.save_file.with_suffix('.md')
@@ -467,6 +517,35 @@ class fullResSensorImageDialog:
 	def cancel(self):
 		self.window.close()
 
+	def _onTileProgress(self, num_complete:int) -> None:
+		if time.monotonic() - self.last_overview_update < self.OVERVIEW_UPDATE_PERIOD:
+			return
+		self._updateOverview()
+
+	def _updateOverview(self) -> None:
+		if self.tiled_img is None or self.tiled_img.img is None or not self.window.isVisible():
+			return
+		self.last_overview_update = time.monotonic()
+		self.visuals['image'].set_data(self.tiled_img.overview/255)
+		if self.tiled_img.isComplete():
+			self.window.setWindowTitle(self.title)
+			self.save_button.setEnabled(True)
+		else:
+			self.window.setWindowTitle(f'{self.title} - {self.tiled_img.num_complete}/{len(self.tiled_img.tiles)} tiles')
+		self.canvas.update()
+
+	def _discardTiledImage(self) -> None:
+		if self.tiled_worker is None:
+			self.tiled_img.remove()
+			return
+		# connected before checking the worker, so an image completed after the check is still removed.
+		# A worker stopped before its next tile removes the image itself
+		self.tiled_worker.signals.finished.connect(self.tiled_img.remove)
+		if self.tiled_worker.isRunning():
+			self.tiled_worker.terminate()
+		else:
+			self.tiled_img.remove()
+
 	def _setMouseOverVisible(self):
 		self.mouseOverText.setParent(self.view.scene)
 		self.mouseOverText.setVisible(True)
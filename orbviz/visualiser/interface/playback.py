@@ -0,0 +1,197 @@
+'''Real time playback of a time slider.
+
+Playback is driven by a monotonic clock rather than by counting ticks, so the displayed index stays on schedule
+however long each frame takes to draw. On each display refresh the simulation time is advanced by the elapsed wall
+time multiplied by the playback rate, and the slider is moved to the last sample at or before it. Samples passed
+over between refreshes are dropped rather than drawn late.
+'''
+import collections
+import logging
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from PyQt5 import QtCore
+
+from orbviz.util.display import frameInterval
+
+logger = logging.getLogger(__name__)
+
+# default simulation seconds per wall second
+DFLT_PLAYBACK_RATE = 60.0
+# upcoming indices are passed to prefetchers for this far ahead [wall seconds]
+PREFETCH_HORIZON = 1.0
+# maximum number of upcoming indices passed to prefetchers
+MAX_PREFETCH_INDICES = 64
+# period over which the achieved frame rate is measured [wall seconds]
+FPS_WINDOW = 1.0
+
+
+class PlaybackEngine:
+	def __init__(self, get_index:Callable[[], int], set_index:Callable[[int], None],
+					get_sample_seconds:Callable[[], np.ndarray|None],
+					rate:float=DFLT_PLAYBACK_RATE,
+					clock:Callable[[], float]=time.monotonic):
+		'''Steps an index in real time.
+
+		Args:
+			get_index (Callable[[], int]): returns the displayed index
+			set_index (Callable[[int], None]): displays an index
+			get_sample_seconds (Callable[[], np.ndarray|None]): returns the time of each index since the first [s]
+			rate (float): simulation seconds per wall second
+			clock (Callable[[], float]): monotonic wall clock [s]
+		'''
+		self._get_index = get_index
+		self._set_index = set_index
+		self._get_sample_seconds = get_sample_seconds
+		self._clock = clock
+		self.rate = rate
+		self.loop = False
+		self._playing = False
+		self._sample_seconds = None
+		self._anchor_wall = 0.
+		self._anchor_sim = 0.
+		self._last_index = None
+		self._prefetchers = []
+		self._stats_callbacks = []
+		self._frame_times = collections.deque()
+		self._last_stats_time = 0.
+		self.resetStats()
+		self._timer = QtCore.QTimer()
+		self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+		self._timer.timeout.connect(self.tick)
+
+	def play(self) -> None:
+		sample_seconds = self._get_sample_seconds()
+		if sample_seconds is None or len(sample_seconds) < 2:
+			logger.warning("Can't play back, there is no timespan to play")
+			return
+		self._sample_seconds = np.asarray(sample_seconds, dtype=float)
+		index = self._get_index()
+		if index >= len(self._sample_seconds) - 1:
+			# at the end, start again
+			index = 0
+			self._set_index(index)
+		self._anchor(index)
+		self.resetStats()
+		self._playing = True
+		self._timer.start(max(int(frameInterval()*1000), 1))
+
+	def pause(self) -> None:
+		if not self._playing:
+			return
+		self._playing = False
+		self._timer.stop()
+		stats = self.getStats()
+		logger.info("Playback paused: %.1f fps, %d frames drawn, %d dropped",
+						stats['fps'], stats['drawn_frames'], stats['dropped_frames'])
+		self._emitStats()
+
+	def toggle(self) -> None:
+		if self._playing:
+			self.pause()
+		else:
+			self.play()
+
+	def isPlaying(self) -> bool:
+		return self._playing
+
+	def setRate(self, rate:float) -> None:
+		'''Set the simulation seconds per wall second, keeping the current simulation time.'''
+		if self._playing:
+			self._anchor(self._last_index, sim_time=self._simTime(self._clock()))
+		self.rate = rate
+
+	def addPrefetcher(self, callback:Callable[[np.ndarray], None]) -> None:
+		'''Register a callback given the indices expected to be displayed next, soonest first.'''
+		self._prefetchers.append(callback)
+
+	def addStatsCallback(self, callback:Callable[[dict[str, Any]], None]) -> None:
+		'''Register a callback given the playback statistics, about once a second while playing.'''
+		self._stats_callbacks.append(callback)
+
+	def resetStats(self) -> None:
+		self._drawn_frames = 0
+		self._dropped_frames = 0
+		self._frame_times.clear()
+
+	def getStats(self) -> dict[str, Any]:
+		'''Achieved frame rate, and the number of indices drawn and dropped since playback started.'''
+		if len(self._frame_times) > 1 and self._frame_times[-1] > self._frame_times[0]:
+			fps = (len(self._frame_times) - 1) / (self._frame_times[-1] - self._frame_times[0])
+		else:
+			fps = 0.
+		return {'fps': fps,
+				'drawn_frames': self._drawn_frames,
+				'dropped_frames': self._dropped_frames,
+				'rate': self.rate}
+
+	def tick(self) -> None:
+		'''Move to the index due now, called once per display refresh while playing.'''
+		if not self._playing:
+			return
+		now = self._clock()
+		if self._get_index() != self._last_index:
+			# index has been moved by hand, continue from there
+			self._anchor(self._get_index(), wall_time=now)
+
+		last = len(self._sample_seconds) - 1
+		sim_time = self._simTime(now)
+		index = min(int(np.searchsorted(self._sample_seconds, sim_time, side='right')) - 1, last)
+		if index >= last and self.loop and self._last_index == last:
+			# last index has been displayed for a frame, start again
+			self._anchor(0, wall_time=now)
+			self._last_index = None
+			index = 0
+		elif index != self._last_index:
+			self._dropped_frames += max(index - self._last_index - 1, 0)
+
+		if index != self._last_index:
+			self._drawn_frames += 1
+			self._last_index = index
+			self._set_index(index)
+			self._recordFrame(now)
+			self._prefetch(self._simTime(now))
+
+		if now - self._last_stats_time >= FPS_WINDOW:
+			self._last_stats_time = now
+			self._emitStats()
+		if index >= last and not self.loop:
+			self.pause()
+
+	def _anchor(self, index:int, wall_time:float|None=None, sim_time:float|None=None) -> None:
+		self._anchor_wall = self._clock() if wall_time is None else wall_time
+		self._anchor_sim = self._sample_seconds[index] if sim_time is None else sim_time
+		self._last_index = index
+
+	def _simTime(self, wall_time:float) -> float:
+		return self._anchor_sim + (wall_time - self._anchor_wall) * self.rate
+
+	def _recordFrame(self, wall_time:float) -> None:
+		self._frame_times.append(wall_time)
+		while self._frame_times[0] < wall_time - FPS_WINDOW:
+			self._frame_times.popleft()
+
+	def _prefetch(self, sim_time:float) -> None:
+		if len(self._prefetchers) == 0:
+			return
+		# indices due within the horizon, thinned to those which will actually be displayed
+		horizon = sim_time + PREFETCH_HORIZON * self.rate
+		start = self._last_index + 1
+		stop = int(np.searchsorted(self._sample_seconds, horizon, side='right'))
+		frame_sim_step = frameInterval() * self.rate
+		due = np.floor((self._sample_seconds[start:stop] - sim_time) / frame_sim_step)
+		_, first = np.unique(due, return_index=True)
+		upcoming = (start + first)[:MAX_PREFETCH_INDICES]
+		if len(upcoming) == 0:
+			return
+		for callback in self._prefetchers:
+			callback(upcoming)
+
+	def _emitStats(self) -> None:
+		stats = self.getStats()
+		for callback in self._stats_callbacks:
+			callback(stats)
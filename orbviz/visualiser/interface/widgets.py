@@ -5,6 +5,7 @@ import pathlib
 
 from typing import Any
 
+import numpy as np
 from spherapy.timespan import TimeSpan
 
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -12,6 +13,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 import orbviz.model.data_models.data_types as orbviz_data_types
 import orbviz.util.paths as orbviz_paths
 import orbviz.visualiser.colours as colours
+from orbviz.visualiser.interface.playback import DFLT_PLAYBACK_RATE, PlaybackEngine
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,20 @@ class TimeSlider(QtWidgets.QWidget):
 		self._curr_dt_picker = SmallDatetimeEntry(self.start_dt)
 		self._curr_dt_picker.updated.connect(self.setIndex2Datetime)
 		self.setTimeLabels()
+		self.playback = PlaybackEngine(self.getValue, self.setValue, self.getSampleSeconds)
+		self.playback.addStatsCallback(self._setPlaybackStats)
+		self._play_button = QtWidgets.QToolButton()
+		self._play_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+		self._play_button.setToolTip('Play/Pause')
+		self._play_button.clicked.connect(self.togglePlayback)
+		self._rate_spinbox = QtWidgets.QDoubleSpinBox()
+		self._rate_spinbox.setRange(0.01, 1e6)
+		self._rate_spinbox.setDecimals(2)
+		self._rate_spinbox.setSuffix(' s/s')
+		self._rate_spinbox.setToolTip('Playback rate, simulation seconds per second')
+		self._rate_spinbox.setValue(DFLT_PLAYBACK_RATE)
+		self._rate_spinbox.valueChanged.connect(self.playback.setRate)
+		self._playback_stats_label = QtWidgets.QLabel('')
 
 		self.slider.setMinimum(0)
 		self.slider.setMaximum(self.num_ticks)
@@ -53,13 +69,17 @@ class TimeSlider(QtWidgets.QWidget):
 		hlayout2.addWidget(self._curr_dt_picker)
 		hlayout2.addStretch()
 		hlayout2.addWidget(self._end_dt_label)
+		hlayout3.addWidget(self._play_button)
 		hlayout3.addWidget(self.slider)
+		hlayout3.addWidget(self._rate_spinbox)
+		hlayout3.addWidget(self._playback_stats_label)
 		vlayout.addLayout(hlayout2)
 		vlayout.addLayout(hlayout3)
 		self.slider.valueChanged.connect(self._run_callbacks)
 		self.setLayout(vlayout)
 
 	def setTimespan(self, timespan:TimeSpan):
+		self.pausePlayback()
 		self._timespan = timespan
 		self.setRange(self._timespan.start, self._timespan.end, len(self._timespan))
 
@@ -77,6 +97,36 @@ class TimeSlider(QtWidgets.QWidget):
 	def getValue(self):
 		return self.slider.value()
 
+	def getSampleSeconds(self) -> np.ndarray|None:
+		'''Time of each index since the first [s].'''
+		if self._timespan is not None:
+			return np.asarray(self._timespan.secondsSinceStart(), dtype=float)
+		if self.tick_delta is not None:
+			return np.arange(self.num_ticks) * self.tick_delta.total_seconds()
+		return None
+
+	def togglePlayback(self) -> None:
+		self.playback.toggle()
+		self._setPlayButtonIcon()
+
+	def pausePlayback(self) -> None:
+		self.playback.pause()
+		self._setPlayButtonIcon()
+
+	def _setPlayButtonIcon(self) -> None:
+		if self.playback.isPlaying():
+			self._play_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPause))
+		else:
+			self._play_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+			self._playback_stats_label.setText('')
+
+	def _setPlaybackStats(self, stats:dict[str, Any]) -> None:
+		if not self.playback.isPlaying():
+			# playback reached the end
+			self._setPlayButtonIcon()
+			return
+		self._playback_stats_label.setText(f" {stats['fps']:.0f} fps, {stats['dropped_frames']} dropped")
+
 	def setValue(self, value):
 		self.slider.setValue(value)
 		if self._timespan is not None:
@@ -0,0 +1,251 @@
+# Copyright (c) OrbViz Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.md for more info.
+
+import numpy as np
+
+from vispy import gloo
+from vispy.color import Color
+from vispy.scene.visuals import create_visual_node
+from vispy.visuals.visual import Visual
+
+# largest screen space error of a decimated path [pixels]
+LOD_TOLERANCE = 0.5
+# decimation stops once a level has fewer vertices than this
+LOD_MIN_VERTICES = 64
+# number of vertices either side of the current index always drawn at full detail
+LOD_DETAIL_HALF_WIDTH = 256
+
+_VERTEX_SHADER = """
+attribute vec3 a_position;
+attribute float a_index;
+varying float v_index;
+
+void main(void) {
+    gl_Position = $transform(vec4(a_position, 1.0));
+    v_index = a_index;
+}
+"""
+
+_FRAGMENT_SHADER = """
+uniform vec4 u_color;
+uniform float u_curr_index;
+uniform float u_dash_size;
+uniform bool u_show_past;
+uniform bool u_show_future;
+uniform bool u_dash_past;
+uniform bool u_dash_future;
+varying float v_index;
+
+void main() {
+    // segments ending at or before the current index are in the past
+    bool past = v_index < u_curr_index;
+    if ((past && !u_show_past) || (!past && !u_show_future))
+        discard;
+    // v_index runs from k to k+1 along segment k, dashes alternate every u_dash_size segments
+    bool dashed = past ? u_dash_past : u_dash_future;
+    if (dashed && mod(floor(v_index), 2.0*u_dash_size) >= u_dash_size)
+        discard;
+    gl_FragColor = u_color;
+}
+"""
+
+
+class OrbitPathVisual(Visual):
+    """
+    Displays a path split into past and future at a current index
+
+    The whole path is uploaded once, with the index of each vertex. Which segments are past or
+    future, and which are dashed, is decided in the fragment shader against the current index,
+    so changing index needs no geometry to be rebuilt or uploaded.
+
+    Long paths are drawn at a level of detail chosen from the screen space size of the path.
+    Each level joins a subset of the vertices, and its largest deviation from the full path is
+    measured once, so the coarsest level within `LOD_TOLERANCE` pixels is drawn. Vertices near
+    the current index are always drawn at full detail.
+
+    Parameters
+    ----------
+    pos : (N, 2) or (N, 3) array | None
+        Vertices of the path, in order.
+    color : str | tuple
+        Color of the path.
+    width : float
+        Line width in pixels.
+    antialias : bool
+        Enables line smoothing.
+    dash_size : int
+        Number of segments in each dash, and in each gap between dashes.
+    cut_idxs : array | None
+        Indices of vertices not joined to the following vertex, i.e. at a map edge.
+    """
+
+    def __init__(self, pos=None, color='white', width=1., antialias=True, dash_size=3, cut_idxs=None):
+        self._pos_vbo = gloo.VertexBuffer()
+        self._index_vbo = gloo.VertexBuffer()
+        self._segments_ibo = gloo.IndexBuffer()
+        self._pos = None
+        self._cut_idxs = np.zeros(0, dtype=int)
+        self._lod_levels = []
+        self._lod_level = 0
+        self._lod_window = None
+        self._curr_index = 0
+        self._width = width
+        self._antialias = antialias
+
+        Visual.__init__(self, vcode=_VERTEX_SHADER, fcode=_FRAGMENT_SHADER)
+        self.set_gl_state('translucent')
+        self._draw_mode = 'lines'
+        self._index_buffer = self._segments_ibo
+        self.shared_program['u_curr_index'] = 0.
+        self.set_dash(dash_size, dash_past=False, dash_future=True)
+        self.set_parts_visible(past=True, future=True)
+        self.set_data(pos=pos, color=color, cut_idxs=cut_idxs)
+        self.freeze()
+
+    def set_data(self, pos=None, color=None, width=None, cut_idxs=None):
+        """Set the path, and its style.
+
+        Parameters
+        ----------
+        pos : (N, 2) or (N, 3) array | None
+            Vertices of the path, in order. Kept if None.
+        color : str | tuple | None
+            Color of the path. Kept if None.
+        width : float | None
+            Line width in pixels. Kept if None.
+        cut_idxs : array | None
+            Indices of vertices not joined to the following vertex, only used with pos.
+        """
+        if pos is not None:
+            pos = np.asarray(pos)
+            vertices = np.zeros((len(pos), 3), dtype=np.float32)
+            vertices[:, :pos.shape[1]] = pos
+            self._pos = vertices
+            self._pos_vbo.set_data(vertices)
+            self._index_vbo.set_data(np.arange(len(pos), dtype=np.float32))
+            self._cut_idxs = np.zeros(0, dtype=int) if cut_idxs is None else np.asarray(cut_idxs)
+            self._lod_levels = _buildLodLevels(vertices, self._cut_idxs)
+            self._lod_level = 0
+            self._lod_window = None
+            self._updateSegments()
+            self.shared_program['a_position'] = self._pos_vbo
+            self.shared_program['a_index'] = self._index_vbo
+        if color is not None:
+            self.shared_program['u_color'] = Color(color).rgba
+        if width is not None:
+            self._width = width
+        self.update()
+
+    def set_index(self, index):
+        """Set the index splitting the past and future parts of the path."""
+        self.shared_program['u_curr_index'] = float(index)
+        self._curr_index = int(index)
+        self.update()
+
+    def set_dash(self, dash_size, dash_past=False, dash_future=True):
+        """Set the dash length, in segments, and which parts of the path are dashed."""
+        self.shared_program['u_dash_size'] = float(max(dash_size, 1))
+        self.shared_program['u_dash_past'] = dash_past
+        self.shared_program['u_dash_future'] = dash_future
+        self.update()
+
+    def set_parts_visible(self, past=True, future=True):
+        """Set whether the past and future parts of the path are drawn."""
+        self.shared_program['u_show_past'] = past
+        self.shared_program['u_show_future'] = future
+        self.update()
+
+    def _updateSegments(self):
+        num_verts = len(self._pos)
+        if self._lod_window is not None and self._lod_level == 0 and self._lod_window[2] == 0:
+            # full detail doesn't depend on the window
+            return
+        # full detail window is only re-centred once the index nears its edge
+        lo, hi = self._lod_window[:2] if self._lod_window is not None else (0, 0)
+        margin = LOD_DETAIL_HALF_WIDTH // 2
+        if self._lod_window is None or not lo + margin <= self._curr_index <= hi - margin:
+            lo = max(self._curr_index - LOD_DETAIL_HALF_WIDTH, 0)
+            hi = min(self._curr_index + LOD_DETAIL_HALF_WIDTH, num_verts - 1)
+        elif self._lod_window[2] == self._lod_level:
+            return
+        self._lod_window = (lo, hi, self._lod_level)
+        kept = self._lod_levels[self._lod_level][0]
+        if self._lod_level > 0:
+            kept = np.union1d(kept, np.arange(lo, hi + 1))
+        segments = np.column_stack((kept[:-1], kept[1:]))
+        segments = segments[~np.isin(segments[:, 0], self._cut_idxs)]
+        self._segments_ibo.set_data(segments.astype(np.uint32))
+
+    def _selectLodLevel(self, view):
+        # pixels per world unit, largest over a sample of the path
+        tr = view.transforms.get_transform('visual', 'canvas')
+        samples = self._pos[self._lod_levels[-1][0]]
+        extent = np.ptp(samples, axis=0).max()
+        if extent == 0:
+            return 0
+        step = extent * 1e-3
+        offsets = np.vstack((np.zeros(3), np.eye(3) * step))
+        mapped = tr.map((samples[:, None, :] + offsets[None, :, :]).reshape(-1, 3)).reshape(len(samples), 4, 4)
+        # samples behind the camera aren't drawn
+        in_front = np.all(mapped[:, :, 3] > 0, axis=1)
+        if not np.any(in_front):
+            return 0
+        screen = mapped[in_front, :, :2] / mapped[in_front, :, 3:4]
+        pix_per_unit = np.linalg.norm(screen[:, 1:] - screen[:, :1], axis=2).max() / step
+        level = 0
+        for ii, (_, error) in enumerate(self._lod_levels):
+            if error * pix_per_unit <= LOD_TOLERANCE:
+                level = ii
+        return level
+
+    def _prepare_transforms(self, view):
+        view.view_program.vert['transform'] = view.transforms.get_transform()
+
+    def _prepare_draw(self, view):
+        if self._pos is None or len(self._pos) < 2:
+            return False
+        if len(self._lod_levels) > 1:
+            self._lod_level = self._selectLodLevel(view)
+        self._updateSegments()
+        self.update_gl_state(line_smooth=bool(self._antialias))
+        width = self.transforms.pixel_scale * self._width
+        self.update_gl_state(line_width=max(width, 1.0))
+
+    def _compute_bounds(self, axis, view):
+        if self._pos is None:
+            return None
+        return self._pos[:, axis].min(), self._pos[:, axis].max()
+
+
+def _buildLodLevels(pos, cut_idxs):
+    """Decimate a path into successively coarser levels.
+
+    Level k keeps every 2**k-th vertex, the last vertex, and the vertices either side of each cut.
+
+    Returns
+    -------
+    levels : list of (kept, error)
+        Indices of the vertices kept by each level, and the largest distance of any vertex of the
+        path from the decimated path, in world units.
+    """
+    num_verts = len(pos)
+    required = np.concatenate(([0, num_verts - 1], cut_idxs, np.asarray(cut_idxs) + 1)).astype(int)
+    required = required[(required >= 0) & (required < num_verts)]
+    levels = [(np.arange(num_verts), 0.)]
+    stride = 2
+    while num_verts // stride >= LOD_MIN_VERTICES:
+        kept = np.union1d(np.arange(0, num_verts, stride), required)
+        # distance of each vertex from the decimated segment spanning it
+        seg = np.append(np.repeat(np.arange(len(kept) - 1), np.diff(kept)), len(kept) - 2)
+        start = pos[kept[seg]]
+        chord = pos[kept[seg + 1]] - start
+        rel = pos - start
+        chord_sq = np.einsum('ij,ij->i', chord, chord)
+        frac = np.clip(np.einsum('ij,ij->i', rel, chord) / np.where(chord_sq > 0, chord_sq, 1), 0, 1)
+        error = np.linalg.norm(rel - frac[:, None] * chord, axis=1).max()
+        levels.append((kept, max(error, levels[-1][1])))
+        stride *= 2
+    return levels
+
+
+OrbitPath = create_visual_node(OrbitPathVisual)
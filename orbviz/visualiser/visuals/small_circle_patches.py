@@ -0,0 +1,108 @@
+# Copyright (c) OrbViz Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.md for more info.
+
+import numpy as np
+
+from vispy.scene.visuals import create_visual_node
+from vispy.visuals.line import LineVisual
+from vispy.visuals.mesh import MeshVisual
+from vispy.visuals.visual import CompoundVisual
+
+
+class SmallCirclePatchesVisual(CompoundVisual):
+    """
+    Displays many small circle patches on a map as a single mesh and border
+
+    Every patch has the same vertex layout, as from `spherical.padSmallCirclePatches`: vertices
+    ii and -1-ii of a patch are the two ends of a span of latitude. Patches are filled with a
+    strip of triangles between consecutive spans, so the faces only depend on the number of
+    patches, and moving the patches only uploads new vertices.
+
+    Parameters
+    ----------
+    border_width : float
+        Border width in pixels.
+    **kwargs : dict
+        Keyword arguments to pass to `CompoundVisual`.
+    """
+
+    def __init__(self, border_width=2, **kwargs):
+        self._mesh = MeshVisual()
+        self._border = LineVisual(method='gl')
+        self._border_width = border_width
+        self._patches = None
+        self._colors = None
+        CompoundVisual.__init__(self, [self._mesh, self._border], **kwargs)
+        self._mesh.set_gl_state(polygon_offset_fill=False,
+                                polygon_offset=(0, 0), cull_face=False)
+        self.freeze()
+
+    def set_patches(self, patches, colors=None):
+        """Set the vertices of every patch.
+
+        Parameters
+        ----------
+        patches : (P, V, 2) array
+            Vertices of each of P patches.
+        colors : (P, 4) array | None
+            RGBA color of each patch. Kept if None, and the number of patches is unchanged.
+        """
+        patches = np.asarray(patches, dtype=np.float32)
+        vertices = patches.reshape(-1, 2)
+        same_layout = self._patches is not None and patches.shape == self._patches.shape
+        self._patches = patches
+        if not same_layout:
+            num_patches, num_verts = patches.shape[:2]
+            self._mesh.set_data(vertices=vertices, faces=_stripFaces(num_patches, num_verts))
+            self._border.set_data(pos=vertices, connect=_borderSegments(num_patches, num_verts),
+                                  width=self._border_width)
+        else:
+            # same layout, only the vertices move
+            self._mesh.mesh_data.set_vertices(vertices)
+            self._border.set_data(pos=vertices)
+        if colors is not None or not same_layout:
+            self.set_colors(self._colors if colors is None else colors)
+        else:
+            self._mesh.mesh_data_changed()
+
+    def set_colors(self, colors):
+        """Set the RGBA color of each patch, a patch with zero alpha is hidden."""
+        if colors is None:
+            return
+        self._colors = np.asarray(colors, dtype=np.float32)
+        if self._patches is None:
+            return
+        vertex_colors = np.repeat(self._colors, self._patches.shape[1], axis=0)
+        self._mesh.mesh_data.set_vertex_colors(vertex_colors)
+        self._mesh.mesh_data_changed()
+        self._border.set_data(color=vertex_colors)
+
+    @property
+    def mesh(self):
+        """The vispy.visuals.MeshVisual filling the patches."""
+        return self._mesh
+
+    @property
+    def border(self):
+        """The vispy.visuals.LineVisual drawing the border of the patches."""
+        return self._border
+
+
+def _stripFaces(num_patches, num_verts):
+    # two triangles between each consecutive pair of spans
+    k = np.arange(num_verts//2 - 1)
+    last = num_verts - 1
+    quad = np.column_stack((k, k+1, last-k, last-k, k+1, last-k-1)).reshape(-1, 3)
+    starts = np.arange(num_patches).reshape(-1, 1, 1) * num_verts
+    return (quad + starts).reshape(-1, 3).astype(np.uint32)
+
+
+def _borderSegments(num_patches, num_verts):
+    # closed loop around each patch
+    idxs = np.arange(num_verts)
+    loop = np.column_stack((idxs, np.roll(idxs, -1)))
+    starts = np.arange(num_patches).reshape(-1, 1, 1) * num_verts
+    return (loop + starts).reshape(-1, 2)
+
+
+SmallCirclePatches = create_visual_node(SmallCirclePatchesVisual)
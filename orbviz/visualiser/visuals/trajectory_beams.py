@@ -0,0 +1,251 @@
+# Copyright (c) OrbViz Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.md for more info.
+
+import numpy as np
+
+from vispy.color import Color
+from vispy.gloo import VertexBuffer
+from vispy.scene.visuals import create_visual_node
+from vispy.visuals import Visual
+from vispy.visuals.mesh import MeshVisual
+
+# smallest rotation taking the z axis onto nadir from pos
+_NADIR_ROTATION = """
+mat3 nadirRotation(vec3 pos) {
+    vec3 d = -normalize(pos);
+    if (d.z <= -1.0 + 1e-6) {
+        return mat3(1.0, 0.0, 0.0, 0.0, -1.0, 0.0, 0.0, 0.0, -1.0);
+    }
+    float k = 1.0 / (1.0 + d.z);
+    // columns
+    return mat3(1.0 - d.x*d.x*k, -d.x*d.y*k, -d.x,
+                -d.x*d.y*k, 1.0 - d.y*d.y*k, -d.y,
+                d.x, d.y, d.z);
+}
+"""
+
+_BEAMS_VERTEX_SHADER = _NADIR_ROTATION + """
+attribute vec3 a_shift;
+varying vec4 v_base_color;
+void main() {
+    v_base_color = $color_transform($base_color);
+    vec3 pos = $to_vec4($position).xyz;
+    gl_Position = $transform(vec4(nadirRotation(a_shift) * pos + a_shift, 1.0));
+}
+"""
+
+_CIRCLES_VERTEX_SHADER = _NADIR_ROTATION + """
+attribute vec3 a_position;
+attribute vec3 a_shift;
+void main() {
+    gl_Position = $transform(vec4(nadirRotation(a_shift) * a_position + a_shift, 1.0));
+}
+"""
+
+_CIRCLES_FRAGMENT_SHADER = """
+uniform vec4 u_color;
+void main() {
+    gl_FragColor = u_color;
+}
+"""
+
+
+class TrajectoryBuffer:
+    """
+    Trajectories of a set of instances, uploaded once to the GPU
+
+    The buffer is ordered by timestep, so the positions of every instance at a timestep are a
+    contiguous slice of it, and can be bound as a per instance attribute without uploading anything.
+
+    Parameters
+    ----------
+    trajectories : (N, T, 3) array
+        Position of each of N instances at each of T timesteps.
+    """
+
+    def __init__(self, trajectories):
+        self.num_instances, self.num_steps = trajectories.shape[:2]
+        steps = np.ascontiguousarray(np.transpose(trajectories, (1, 0, 2)), dtype=np.float32)
+        self.vbo = VertexBuffer(steps.reshape(-1, 3))
+
+    def instances(self, index, instance=None):
+        """View of the positions at a timestep, one per instance.
+
+        Parameters
+        ----------
+        index : int
+            Timestep.
+        instance : int | None
+            Only view this instance, all instances if None.
+        """
+        n = self.num_instances
+        index = min(max(int(index), 0), self.num_steps-1)
+        if instance is None:
+            view = self.vbo[index*n:(index+1)*n]
+        else:
+            view = self.vbo[index*n+instance:index*n+instance+1]
+        view.divisor = 1
+        return view
+
+
+class TrajectoryBeamsVisual(MeshVisual):
+    """
+    Copies of a mesh placed at trajectories held on the GPU and pointed at nadir
+
+    The mesh is defined about the origin, pointing along +z. Each copy is rotated in the vertex shader
+    so +z points from its position to the origin, then moved to its position.
+    When instanced, the mesh is drawn once per instance, with the positions bound from a
+    TrajectoryBuffer, so changing timestep uploads nothing. Otherwise the copies are merged into one
+    mesh, for GL implementations without instancing, and changing timestep uploads one position per vertex.
+
+    Parameters
+    ----------
+    vertices : (V, 3) array
+        Vertices of the mesh.
+    faces : (F, 3) array
+        Faces of the mesh.
+    trajectories : TrajectoryBuffer | (N, T, 3) array
+        Position of each of N copies at each of T timesteps, an array if not instanced.
+    instanced : bool
+        Whether to draw the copies with instancing.
+    **kwargs : dict
+        Keyword arguments to pass to `MeshVisual`.
+    """
+
+    _shaders = {
+        'vertex': _BEAMS_VERTEX_SHADER,
+        'fragment': MeshVisual._shaders['fragment'],
+    }
+
+    def __init__(self, vertices, faces, trajectories, instanced=True, **kwargs):
+        self._instanced = instanced
+        self._trajectories = trajectories
+        self._index = 0
+        self._shift_vbo = None
+        if not instanced:
+            num_copies = trajectories.shape[0]
+            offsets = np.arange(num_copies).reshape(-1, 1, 1) * len(vertices)
+            faces = (faces + offsets).reshape(-1, 3)
+            vertices = np.tile(vertices, (num_copies, 1))
+            # merged vertices are unindexed by MeshVisual, three per face
+            self._verts_per_copy = 3 * len(faces) // num_copies
+            self._shift_vbo = VertexBuffer(np.zeros((len(faces)*3, 3), dtype=np.float32))
+        MeshVisual.__init__(self, vertices, faces, **kwargs)
+        self.set_index(0)
+
+    def set_trajectories(self, trajectories):
+        """Place the copies along other trajectories, with the same number of copies.
+
+        Parameters
+        ----------
+        trajectories : TrajectoryBuffer | (N, T, 3) array
+            As for the constructor.
+        """
+        self._trajectories = trajectories
+        self._bindShift()
+        self.update()
+
+    def set_index(self, index):
+        """Select the timestep to draw.
+
+        Parameters
+        ----------
+        index : int
+            Timestep to draw.
+        """
+        self._index = int(index)
+        self._bindShift()
+        self.update()
+
+    def _bindShift(self):
+        if self._instanced:
+            self.shared_program['a_shift'] = self._trajectories.instances(self._index)
+        else:
+            positions = self._trajectories[:, self._index, :].astype(np.float32)
+            self._shift_vbo.set_data(np.repeat(positions, self._verts_per_copy, axis=0))
+            self.shared_program['a_shift'] = self._shift_vbo
+
+    def _update_data(self):
+        if MeshVisual._update_data(self) is False:
+            return False
+        # MeshVisual rebinds its own attributes when the mesh changes
+        self._bindShift()
+
+
+class TrajectoryCirclesVisual(Visual):
+    """
+    Copies of a line strip placed at trajectories held on the GPU and pointed at nadir
+
+    Each copy is drawn as its own line strip, rotated and placed as for TrajectoryBeamsVisual.
+
+    Parameters
+    ----------
+    points : (P, 3) array
+        Points of the line strip, about the origin.
+    trajectories : TrajectoryBuffer
+        Position of each copy at each timestep.
+    color : Color
+        Colour of the lines.
+    width : float
+        Width of the lines, in pixels.
+    selectable : bool
+        Only draw the copy chosen with set_selected, rather than every copy.
+    """
+
+    def __init__(self, points, trajectories, color='white', width=1., selectable=False):
+        Visual.__init__(self, vcode=_CIRCLES_VERTEX_SHADER, fcode=_CIRCLES_FRAGMENT_SHADER)
+        self._draw_mode = 'line_strip'
+        self._trajectories = trajectories
+        self._index = 0
+        self._selectable = selectable
+        self._selected = None
+        self.shared_program['a_position'] = VertexBuffer(np.asarray(points, dtype=np.float32))
+        self.set_color(color)
+        self.set_width(width)
+        self._bindShift()
+
+    def set_trajectories(self, trajectories):
+        """Draw the copies at the positions of another TrajectoryBuffer."""
+        self._trajectories = trajectories
+        self._bindShift()
+        self.update()
+
+    def set_index(self, index):
+        """Select the timestep to draw."""
+        self._index = int(index)
+        self._bindShift()
+        self.update()
+
+    def set_selected(self, instance):
+        """Select the copy drawn when selectable, none are drawn if instance is None."""
+        self._selected = instance
+        self._bindShift()
+        self.update()
+
+    def set_color(self, color):
+        self.shared_program['u_color'] = Color(color).rgba
+        self.update()
+
+    def set_width(self, width):
+        self.set_gl_state('translucent', line_width=width)
+        self.update()
+
+    def _bindShift(self):
+        if not self._selectable:
+            self.shared_program['a_shift'] = self._trajectories.instances(self._index)
+        elif self._selected is not None:
+            self.shared_program['a_shift'] = self._trajectories.instances(self._index, self._selected)
+
+    def _prepare_transforms(self, view):
+        view.view_program.vert['transform'] = view.get_transform()
+
+    def _prepare_draw(self, view):
+        if self._selectable and self._selected is None:
+            return False
+
+    def _compute_bounds(self, axis, view):
+        return None
+
+
+TrajectoryBeams = create_visual_node(TrajectoryBeamsVisual)
+TrajectoryCircles = create_visual_node(TrajectoryCirclesVisual)
@@ -0,0 +1,161 @@
+# Copyright (c) OrbViz Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.md for more info.
+
+import numpy as np
+
+from vispy.gloo import VertexBuffer
+from vispy.scene.visuals import create_visual_node
+import vispy.visuals.markers as vmarkers
+
+# vertex shader of vispy's MarkersVisual, kept here as a_position is bound from the trajectory buffer
+_VERTEX_SHADER = """
+uniform float u_antialias;
+uniform float u_px_scale;
+uniform bool u_scaling;
+uniform bool u_spherical;
+
+attribute vec3 a_position;
+attribute vec4 a_fg_color;
+attribute vec4 a_bg_color;
+attribute float a_edgewidth;
+attribute float a_size;
+attribute float a_symbol;
+
+varying vec4 v_fg_color;
+varying vec4 v_bg_color;
+varying float v_edgewidth;
+varying float v_depth_middle;
+varying float v_alias_ratio;
+varying float v_symbol;
+
+float big_float = 1e10; // prevents numerical imprecision
+
+void main (void) {
+    v_fg_color  = a_fg_color;
+    v_bg_color  = a_bg_color;
+    // fluctuations can mess "fake integers" up, so we do +0.5 and floor to make sure it's right
+    v_symbol = a_symbol + 0.5;
+
+    vec4 pos = vec4(a_position, 1);
+    vec4 fb_pos = $visual_to_framebuffer(pos);
+    vec4 x;
+    vec4 size_vec;
+    gl_Position = $framebuffer_to_render(fb_pos);
+
+    // NOTE: gl_stuff uses framebuffer coords!
+    if (u_scaling) {
+        // scaling == "scene": scale marker using entire visual -> framebuffer set of transforms
+        // scaling == "visual": scale marker using only the Visual's transform
+        pos = $framebuffer_to_scene_or_visual(fb_pos);
+        x = $framebuffer_to_scene_or_visual(fb_pos + vec4(big_float, 0, 0, 0));
+        x = (x - pos);
+        // multiply that direction by the size and add it to the position
+        // this gives us the position of the edge of the point, which we convert in screen space
+        size_vec = $scene_or_visual_to_framebuffer(pos + normalize(x) * a_size);
+        // divide by `w` for perspective, and subtract pos
+        // this gives us the actual screen-space size of the point
+        $v_size = size_vec.x / size_vec.w - fb_pos.x / fb_pos.w;
+        v_edgewidth = ($v_size / a_size) * a_edgewidth;
+    }
+    else {
+        // scaling == "fixed": marker is always the same number of pixels
+        $v_size = a_size * u_px_scale;
+        v_edgewidth = a_edgewidth * u_px_scale;
+    }
+
+    // gl_PointSize is the diameter
+    gl_PointSize = $v_size + 4. * (v_edgewidth + 1.5 * u_antialias);
+
+    if (u_spherical == true) {
+        // similar as above for scaling, but in towards the screen direction
+        // Get the framebuffer z direction relative to this sphere in visual coords
+        vec4 z = $framebuffer_to_scene_or_visual(fb_pos + vec4(0, 0, big_float, 0));
+        z = (z - pos);
+        // Get the depth of the sphere in its middle point on the screen
+        // size/2 because we need the radius, not the diameter
+        vec4 depth_z_vec = $scene_or_visual_to_framebuffer(pos + normalize(z) * a_size / 2);
+        v_depth_middle = depth_z_vec.z / depth_z_vec.w - fb_pos.z / fb_pos.w;
+        // size ratio between aliased and non-aliased, needed for correct depth
+        v_alias_ratio = gl_PointSize / $v_size;
+    }
+}
+"""
+
+
+class TrajectoryMarkersVisual(vmarkers.MarkersVisual):
+    """
+    Markers whose positions are selected from trajectories held on the GPU
+
+    The trajectory of every marker is uploaded once, as a single vertex buffer ordered by timestep.
+    Changing timestep rebinds the position attribute to the slice of the buffer for that
+    timestep, so no position data is uploaded while scrubbing.
+
+    Parameters
+    ----------
+    trajectories : (N, T, 3) array | None
+        Position of each of N markers at each of T timesteps.
+    **kwargs : dict
+        Keyword arguments to pass to `MarkersVisual`.
+    """
+
+    _shaders = {
+        'vertex': _VERTEX_SHADER,
+        'fragment': vmarkers.MarkersVisual._shaders['fragment'],
+    }
+
+    def __init__(self, trajectories=None, **kwargs):
+        self._traj_vbo = None
+        self._num_markers = 0
+        self._num_steps = 0
+        self._index = 0
+        vmarkers.MarkersVisual.__init__(self, **kwargs)
+        if trajectories is not None:
+            self.set_trajectories(trajectories)
+
+    def set_trajectories(self, trajectories):
+        """Upload the trajectory of every marker.
+
+        Parameters
+        ----------
+        trajectories : (N, T, 3) array
+            Position of each of N markers at each of T timesteps.
+        """
+        num_markers, num_steps = trajectories.shape[:2]
+        self._num_markers = num_markers
+        self._num_steps = num_steps
+        # timestep major, so each timestep is a contiguous slice of the buffer
+        steps = np.ascontiguousarray(np.transpose(trajectories, (1, 0, 2)), dtype=np.float32)
+        self._traj_vbo = VertexBuffer(steps.reshape(-1, 3))
+        self._index = min(self._index, num_steps-1)
+        if self._data is None or len(self._data) != num_markers:
+            vmarkers.MarkersVisual.set_data(self, pos=trajectories[:, self._index, :])
+        self._bindStep()
+
+    def set_index(self, index):
+        """Select the timestep to draw.
+
+        Parameters
+        ----------
+        index : int
+            Timestep to draw.
+        """
+        self._index = int(index)
+        self._bindStep()
+        self.update()
+
+    def set_data(self, pos=None, **kwargs):
+        vmarkers.MarkersVisual.set_data(self, pos=pos, **kwargs)
+        if pos is None:
+            return
+        if self._traj_vbo is not None and len(pos) == self._num_markers:
+            # set_data binds positions from its own buffer, restore the trajectory buffer
+            self._bindStep()
+
+    def _bindStep(self):
+        if self._traj_vbo is None:
+            return
+        n = self._num_markers
+        self.shared_program['a_position'] = self._traj_vbo[self._index*n:(self._index+1)*n]
+
+
+TrajectoryMarkers = create_visual_node(TrajectoryMarkersVisual)
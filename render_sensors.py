@@ -0,0 +1,101 @@
+import argparse
+import datetime as dt
+import logging
+import os
+import pathlib
+import warnings
+
+import PIL
+
+import orbviz
+import orbviz.model.batch_render as batch_render
+import orbviz.util.logging as orbviz_logging
+import orbviz.util.paths as orbviz_paths
+
+logger = logging.getLogger('orbviz')
+
+warnings.filterwarnings("ignore", message="Optimal rotation is not uniquely or poorly defined for the given sets of vectors.")
+orbviz_logging.configureLogger()
+
+def setDefaultPackageOptions() -> None:
+	orbviz.running = True
+	orbviz.debug = False
+	orbviz.high_precision = False
+	PIL.Image.MAX_IMAGE_PIXELS = None
+
+def parseDatetime(dt_str:str) -> dt.datetime:
+	d = dt.datetime.fromisoformat(dt_str)
+	if d.tzinfo is None:
+		d = d.replace(tzinfo=dt.timezone.utc)
+	return d
+
+def parseSensor(sensor_str:str) -> tuple[str, str]:
+	parts = sensor_str.split('/')
+	if len(parts) != 2:
+		raise argparse.ArgumentTypeError(f"sensor should be given as SUITE/SENSOR, not {sensor_str}")
+	return parts[0], parts[1]
+
+if __name__ == '__main__':
+	setDefaultPackageOptions()
+	parser = argparse.ArgumentParser(
+						prog='render_sensors',
+						description='Render sensor images over a timespan without a display.')
+	parser.add_argument('primary_config', type=pathlib.Path, help='primary configuration json')
+	parser.add_argument('pointing_file', type=pathlib.Path, help='pointing csv, defines the timespan unless --start and --end are given')
+	parser.add_argument('--start', type=parseDatetime, default=None, help='timespan start, ISO format, UTC if no timezone is given')
+	parser.add_argument('--end', type=parseDatetime, default=None, help='timespan end, ISO format, UTC if no timezone is given')
+	parser.add_argument('--sampling-period', type=int, default=30, dest='sampling_period', help='timespan step [s]')
+	parser.add_argument('--sensor', type=parseSensor, action='append', dest='sensors', default=None,
+						help='SUITE/SENSOR to render, may be repeated. Default: all imaging sensors')
+	parser.add_argument('--first-index', type=int, default=0, dest='first_index')
+	parser.add_argument('--last-index', type=int, default=None, dest='last_index', help='inclusive, default: end of timespan')
+	parser.add_argument('--step', type=int, default=1)
+	parser.add_argument('--format', choices=batch_render.OUTPUT_FORMATS, default='png', dest='output_format',
+						help='png or npy file per frame, or memmap: one memory mapped npy array per sensor')
+	parser.add_argument('--output', type=pathlib.Path, default=None, help=f'output directory, default: {orbviz_paths.data_dir.joinpath("renders")}/<timestamp>')
+	parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of render processes')
+	parser.add_argument('--no-eclipse', action='store_false', dest='draw_eclipse')
+	parser.add_argument('--atmosphere', action='store_true', dest='draw_atm')
+	parser.add_argument('--no-sun', action='store_false', dest='draw_sun')
+	parser.add_argument('--no-moon', action='store_false', dest='draw_moon')
+	parser.add_argument('--highlight-limb', action='store_true', dest='highlight_edge')
+	parser.add_argument('--high_precision', action='store_true', dest='high_precision')
+	parser.add_argument('--debug', action='store_true', dest='debug')
+	args = parser.parse_args()
+	if args.high_precision:
+		orbviz.high_precision = True
+	if args.debug:
+		orbviz.debug = True
+	if (args.start is None) != (args.end is None):
+		parser.error('--start and --end must be given together')
+
+	logger.info("orbviz headless sensor renderer:")
+	logger.info("\tVersion: %s", orbviz.version)
+	history = batch_render.loadHistory(args.primary_config, args.pointing_file,
+										period_start=args.start, period_end=args.end,
+										sampling_period=args.sampling_period)
+	sensors = batch_render.listImagingSensors(history)
+	if args.sensors is not None:
+		sensors = [sensor for sensor in sensors if (sensor[1], sensor[2]) in args.sensors]
+	if len(sensors) == 0:
+		parser.error('no matching imaging sensors in primary configuration')
+
+	num_steps = len(history.getTimespan())
+	last_index = num_steps-1 if args.last_index is None else min(args.last_index, num_steps-1)
+	indices = range(args.first_index, last_index+1, args.step)
+	jobs = batch_render.buildFrameJobs(history, sensors, indices)
+
+	output_dir = args.output
+	if output_dir is None:
+		output_dir = orbviz_paths.data_dir.joinpath('renders', dt.datetime.now().strftime("%y%m%d-%H%M%S"))
+	logger.info("Rendering %s frames of %s sensors to %s", len(jobs), len(sensors), output_dir)
+
+	raycast_options = {'draw_eclipse':args.draw_eclipse,
+						'draw_atm':args.draw_atm,
+						'draw_sun':args.draw_sun,
+						'draw_moon':args.draw_moon,
+						'highlight_edge':args.highlight_edge}
+	batch_render.renderFrames(batch_render.loadRaycastSource(), jobs, output_dir,
+								output_format=args.output_format,
+								raycast_options=raycast_options,
+								num_workers=args.workers)
@@ -0,0 +1,99 @@
+import datetime as dt
+import types
+
+import numpy as np
+import numpy.testing as np_test
+
+from orbviz.model import batch_render
+from orbviz.model.data_models import data_types
+
+
+class _StubAttitude:
+	def __init__(self, invalid_indices=()):
+		self.invalid_indices = invalid_indices
+
+	def isAttitudeValid(self, index):
+		return index not in self.invalid_indices
+
+	def getSensorAttitudeMatrix(self, suite_name, sens_name, index):
+		return np.eye(3) * (index+1)
+
+
+class _StubHistory:
+	def __init__(self, num_steps=5, invalid_indices=()):
+		start = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+		self.timespan = [start + dt.timedelta(seconds=30*ii) for ii in range(num_steps)]
+		pos = np.arange(num_steps*3, dtype=float).reshape(num_steps, 3)
+		self.orbits = {1: types.SimpleNamespace(pos=pos, sun_pos=pos+100, moon_pos=pos+200)}
+		self.attitude = _StubAttitude(invalid_indices)
+		sens_config = {'resolution':(6, 4), 'fov':(20, 15)}
+		suite = types.SimpleNamespace(getSensorConfig=lambda sens_name: sens_config)
+		sc_config = types.SimpleNamespace(getSensorSuites=lambda: {'suite': suite})
+		self.primary_config = types.SimpleNamespace(getAllSpacecraftConfigs=lambda: {1: sc_config})
+
+	def getTimespan(self):
+		return self.timespan
+
+	def getOrbits(self):
+		return self.orbits
+
+	def getSCAttitude(self, sc_id):
+		return self.attitude
+
+	def getPrimaryConfig(self):
+		return self.primary_config
+
+
+class _StubRaycastSource:
+	def __init__(self):
+		self.options = []
+
+	def rayCastFromSensor(self, resolution, pix_per_rad, transform, rays_sf, curr_dt, sun_eci, moon_eci, **kwargs):
+		self.options.append(kwargs)
+		# encode the position in the image, so frames can be told apart
+		img = np.full((len(rays_sf), 3), transform[0,3], dtype=np.float32)
+		return img, np.zeros(len(rays_sf), dtype=data_types.MOUSE_OVER_DTYPE)
+
+
+def test_buildFrameJobs_skipsInvalidAttitude():
+	history = _StubHistory(invalid_indices=(2,))
+	jobs = batch_render.buildFrameJobs(history, [(1, 'suite', 'cam')], range(1, 5))
+	assert [job['index'] for job in jobs] == [1, 3, 4]
+	assert [job['frame_num'] for job in jobs] == [0, 1, 2]
+	job = jobs[1]
+	assert job['resolution'] == (6, 4)
+	assert job['fov'] == (20, 15)
+	assert job['datetime'] == history.timespan[3]
+	np_test.assert_array_equal(job['transform'][0:3,0:3], np.eye(3)*4)
+	np_test.assert_array_equal(job['transform'][0:3,3], history.orbits[1].pos[3])
+	np_test.assert_array_equal(job['sun_eci'], history.orbits[1].sun_pos[3])
+	np_test.assert_array_equal(job['moon_eci'], history.orbits[1].moon_pos[3])
+
+
+def test_createMemmaps_shapesAndDtypes(tmp_path):
+	jobs = batch_render.buildFrameJobs(_StubHistory(), [(1, 'suite', 'cam')], range(0, 5, 2))
+	batch_render._createMemmaps(jobs, tmp_path)
+	frames = np.load(tmp_path.joinpath('1_suite_cam.npy'), mmap_mode='r')
+	assert frames.shape == (3, 4, 6, 3)
+	assert frames.dtype == np.uint8
+	indices = np.load(tmp_path.joinpath('1_suite_cam_indices.npy'))
+	np_test.assert_array_equal(indices, [0, 2, 4])
+
+
+def test_renderFrames_memmap(tmp_path):
+	jobs = batch_render.buildFrameJobs(_StubHistory(), [(1, 'suite', 'cam')], range(3))
+	raycast_src = _StubRaycastSource()
+	paths = batch_render.renderFrames(raycast_src, jobs, tmp_path, output_format='memmap',
+										raycast_options={'draw_atm':False})
+	assert paths == [tmp_path.joinpath('1_suite_cam.npy')]*3
+	assert raycast_src.options == [{'draw_atm':False}]*3
+	frames = np.load(paths[0])
+	for frame_num, job in enumerate(jobs):
+		np_test.assert_array_equal(frames[frame_num], job['transform'][0,3])
+
+
+def test_renderFrames_png(tmp_path):
+	jobs = batch_render.buildFrameJobs(_StubHistory(), [(1, 'suite', 'cam')], range(2))
+	paths = batch_render.renderFrames(_StubRaycastSource(), jobs, tmp_path, output_format='png')
+	assert [path.name for path in paths] == ['1_suite_cam_000000.png', '1_suite_cam_000001.png']
+	assert all(path.exists() for path in paths)
@@ -0,0 +1,73 @@
+import numpy as np
+import numpy.testing as np_test
+from PIL import Image
+import pytest
+
+from orbviz.model import tiled_render
+from orbviz.model.data_models import data_types
+from orbviz.model.lens_models import pinhole
+import orbviz.util.paths as orbviz_paths
+
+
+def test_calcTiles_coverDetector():
+	resolution = (10, 7)
+	covered = np.zeros((7, 10), dtype=int)
+	for x, y, w, h in tiled_render.calcTiles(resolution, 4):
+		covered[y:y+h, x:x+w] += 1
+	np_test.assert_array_equal(covered, 1)
+
+
+def test_tilePixelIdxs():
+	idxs = tiled_render.tilePixelIdxs((10, 7), (4, 4, 4, 3))
+	y, x = np.divmod(idxs, 10)
+	np_test.assert_array_equal(y, np.repeat([4, 5, 6], 4))
+	np_test.assert_array_equal(x, np.tile([4, 5, 6, 7], 3))
+
+
+def test_writeTile_fillsImageAndOverview(tmp_path):
+	resolution = (10, 7)
+	tiled_img = tiled_render.TiledSensorImage(resolution, output_dir=tmp_path, tile_size=4, overview_1D_resolution=4)
+	full_img = np.arange(7*10*3, dtype=np.uint8).reshape(7, 10, 3)
+	for tile in tiled_img.tiles:
+		x, y, w, h = tile
+		mo_tile = np.zeros(w*h, dtype=data_types.MOUSE_OVER_DTYPE)
+		mo_tile['val1'] = tiled_render.tilePixelIdxs(resolution, tile)
+		tiled_img.writeTile(tile, full_img[y:y+h, x:x+w], mo_tile)
+	assert tiled_img.isComplete()
+	np_test.assert_array_equal(tiled_img.img, full_img)
+	np_test.assert_array_equal(tiled_img.mo_data['val1'], np.arange(70))
+	step = tiled_img.overview_step
+	np_test.assert_array_equal(tiled_img.overview, full_img[::step, ::step])
+
+
+@pytest.mark.parametrize('suffix', ['.bmp', '.png'])
+def test_save_writesImageInStrips(tmp_path, monkeypatch, suffix):
+	monkeypatch.setattr(tiled_render, 'SAVE_STRIP_PIXELS', 20)
+	# odd width, so bitmap rows are padded
+	tiled_img = tiled_render.TiledSensorImage((7, 9), output_dir=tmp_path.joinpath('img'))
+	full_img = np.random.default_rng(0).integers(0, 256, size=(9, 7, 3), dtype=np.uint8)
+	tiled_img.img[:] = full_img
+	path = tmp_path.joinpath(f'saved{suffix}')
+	tiled_img.save(path)
+	with Image.open(path) as im:
+		np_test.assert_array_equal(np.asarray(im.convert('RGB')), full_img)
+
+
+class _StubRaycastSource:
+	def rayCastFromSensor(self, resolution, pix_per_rad, transform, rays_sf, *args, **kwargs):
+		return np.zeros((len(rays_sf), 3)), np.zeros(len(rays_sf), dtype=data_types.MOUSE_OVER_DTYPE)
+
+
+def test_raycastTiled_abandonedImageRemoved(tmp_path, monkeypatch):
+	monkeypatch.setattr(orbviz_paths, 'cache_dir', tmp_path)
+	tiled_img = tiled_render.TiledSensorImage((10, 7), tile_size=4)
+	assert tiled_img.output_dir.exists()
+	num_calls = []
+	def running():
+		num_calls.append(1)
+		return len(num_calls) < 3
+	result = tiled_render.raycastTiled(_StubRaycastSource(), pinhole, (10, 7), (20, 15), np.eye(4),
+										None, None, None, tiled_img, running=running)
+	assert result is None
+	assert tiled_img.num_complete == 2
+	assert not tiled_img.output_dir.exists()
@@ -0,0 +1,91 @@
+import datetime as dt
+
+import numpy as np
+import numpy.testing as np_test
+import pytest
+
+from orbviz.model.data_models import data_types
+from orbviz.model.data_models import earth_raycast_data
+import orbviz.model.lens_models.pinhole as pinhole
+import orbviz.util.conversion as orbviz_conversion
+
+RESOLUTION = (40, 30)
+FOV = (20, 15) # [deg]
+DATETIME = dt.datetime(2024, 3, 1, 12, tzinfo=dt.timezone.utc)
+SUN_ECI = np.array([1.5e8, 0., 0.]) # [km]
+
+
+@pytest.fixture
+def raycast_src(monkeypatch):
+	# reprojection only uses the geometry of the Earth, not its images
+	monkeypatch.setattr(earth_raycast_data.EarthRayCastData, 'process', lambda self: None)
+	return earth_raycast_data.EarthRayCastData()
+
+
+def _nadirTransform(yaw:float=0.) -> np.ndarray:
+	# sensor 700km above the equator looking at nadir, rotated about the sensor y axis by yaw [rad]
+	T = np.eye(4)
+	T[0:3,0:3] = np.column_stack(((0,1,0), (0,0,-1), (-1,0,0)))
+	c, s = np.cos(yaw), np.sin(yaw)
+	T[0:3,0:3] = T[0:3,0:3].dot(np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]]))
+	T[0:3,3] = (7078., 0., 0.)
+	return T
+
+
+def _geolocatedFrame(raycast_src, transform:np.ndarray) -> dict:
+	rays_cf = pinhole.generatePixelRays(RESOLUTION, FOV)[:,:3]
+	rays_ecf = orbviz_conversion.eci2ecef(transform[:3,:3].dot(rays_cf.T).T, DATETIME, high_precision=False)
+	pos_ecf = orbviz_conversion.eci2ecef(transform[:3,3], DATETIME, high_precision=False)
+	cart, earth_intsct = raycast_src._lineOfSightToSurface(pos_ecf, rays_ecf)
+	assert np.all(earth_intsct)
+	lats, lons = raycast_src._convertCartesianToEllipsoidGeodetic(cart)
+	num_pixels = RESOLUTION[0]*RESOLUTION[1]
+	mo_data = np.zeros(num_pixels, dtype=data_types.MOUSE_OVER_DTYPE)
+	mo_data['type'] = data_types.MouseOverType.GEODETIC
+	mo_data['val1'] = lats
+	mo_data['val2'] = lons
+	# colour each pixel with its own index, so the source of a reused pixel can be checked
+	img = np.repeat(np.arange(num_pixels, dtype=np.float32).reshape(-1,1), 3, axis=1)
+	return {'img':img, 'mo_data':mo_data, 'datetime':DATETIME, 'sun_eci':SUN_ECI}
+
+
+def _reproject(raycast_src, transform:np.ndarray, prev_frame:dict, **kwargs) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+	pix_per_rad = pinhole.calcPixelAngularSize(RESOLUTION, FOV)
+	return raycast_src.reprojectSensorFrame(RESOLUTION, pix_per_rad, transform, DATETIME, SUN_ECI, prev_frame, **kwargs)
+
+
+def test_reprojectSensorFrame_unchangedPoseReturnsPreviousFrame(raycast_src):
+	prev_frame = _geolocatedFrame(raycast_src, _nadirTransform())
+	img, mo_data, missing_idxs = _reproject(raycast_src, _nadirTransform(), prev_frame)
+	assert len(missing_idxs) == 0
+	np_test.assert_array_equal(img, prev_frame['img'])
+	np_test.assert_array_equal(mo_data, prev_frame['mo_data'])
+
+
+def test_reprojectSensorFrame_onlyFlagsUnfilledPixels(raycast_src):
+	prev_frame = _geolocatedFrame(raycast_src, _nadirTransform())
+	non_geodetic = np.arange(5*RESOLUTION[0]+10, 5*RESOLUTION[0]+20)
+	prev_frame['mo_data']['type'][non_geodetic] = data_types.MouseOverType.CELESTIAL
+	shift = 3
+	yaw = shift*np.deg2rad(FOV[0])/RESOLUTION[0]
+	img, mo_data, missing_idxs = _reproject(raycast_src, _nadirTransform(yaw), prev_frame, draw_eclipse=False)
+
+	# pixels which were not geolocated, and columns uncovered by the turn
+	y, x = np.divmod(np.arange(RESOLUTION[0]*RESOLUTION[1]), RESOLUTION[0])
+	src_idxs = y*RESOLUTION[0] + x - shift
+	expected_missing = (x < shift) | np.isin(src_idxs, non_geodetic)
+	np_test.assert_array_equal(missing_idxs, np.flatnonzero(expected_missing))
+	np_test.assert_array_equal(img[~expected_missing,0], src_idxs[~expected_missing])
+	np_test.assert_array_equal(mo_data[~expected_missing], prev_frame['mo_data'][src_idxs[~expected_missing]])
+	np_test.assert_array_equal(img[expected_missing], 0)
+	assert np.all(mo_data['type'][expected_missing] == data_types.MouseOverType.DUMMY)
+
+
+def test_reprojectSensorFrame_rejectsPixelsBeyondMaxError(raycast_src):
+	prev_frame = _geolocatedFrame(raycast_src, _nadirTransform())
+	# turn by a fraction of a pixel, so every reprojected pixel lands 0.3px from a pixel centre
+	yaw = 0.3*np.deg2rad(FOV[0])/RESOLUTION[0]
+	_, _, missing_idxs = _reproject(raycast_src, _nadirTransform(yaw), prev_frame, max_error_px=0.5)
+	assert len(missing_idxs) == 0
+	_, _, missing_idxs = _reproject(raycast_src, _nadirTransform(yaw), prev_frame, max_error_px=0.2)
+	assert len(missing_idxs) == RESOLUTION[0]*RESOLUTION[1]
@@ -0,0 +1,72 @@
+import numpy as np
+import numpy.testing as np_test
+
+from orbviz.model.geometry import spherical
+
+
+def test_splitLonLatPolygon_acrossAntimeridian():
+	lats = np.array([-10, -10, 10, 10])
+	lons = np.array([170, -170, -170, 170])
+	patch1, patch2, split = spherical.splitLonLatPolygon(lats, lons)
+	assert split
+	np_test.assert_allclose(patch1[:,0], [170, 190, 190, 170])
+	np_test.assert_allclose(patch2[:,0], [-190, -170, -170, -190])
+	np_test.assert_allclose(patch1[:,1], lats)
+
+
+def test_splitLonLatPolygon_aroundPole():
+	lons = np.arange(0, 360, 90) - 135
+	lats = np.full(4, 80)
+	patch1, _, _ = spherical.splitLonLatPolygon(lats, lons)
+	# closed along the map edge at the north pole
+	np_test.assert_allclose(patch1[-2:], [[225, 90], [-135, 90]])
+	assert np.ptp(patch1[:,0]) == 360
+
+
+def test_calcTerminatorOutlines():
+	solar_lats = np.array([20., -20.])
+	solar_lons = np.array([30., -100.])
+	outlines = spherical.calcTerminatorOutlines(solar_lats, solar_lons)
+	assert outlines.shape == (2, 364, 2)
+	# terminator is 90 degrees from the subsolar point
+	terminator = outlines[:, 1:-2]
+	lats, lons = np.deg2rad(terminator[...,1]), np.deg2rad(terminator[...,0])
+	cos_angle = np.sin(lats)*np.sin(np.deg2rad(solar_lats)).reshape(-1,1) + \
+				np.cos(lats)*np.cos(np.deg2rad(solar_lats)).reshape(-1,1)*np.cos(lons - np.deg2rad(solar_lons).reshape(-1,1))
+	np_test.assert_allclose(cos_angle, 0, atol=1e-12)
+	# closed at the pole in darkness
+	np_test.assert_array_equal(outlines[0, [0,-2,-1], 1], -90)
+	np_test.assert_array_equal(outlines[1, [0,-2,-1], 1], 90)
+
+
+def test_genSmallCirclePatches_matchesScalar():
+	rng = np.random.default_rng(0)
+	angles = rng.uniform(1, 170, 200)
+	lats = rng.uniform(-89, 89, 200)
+	lons = rng.uniform(-180, 180, 200)
+	# centers on the equator and antimeridian
+	lats[:10] = 0
+	lons[10:20] = 180
+	patches1, patches2, split = spherical.genSmallCirclePatches(angles, lats, lons)
+	assert len(patches1) == 200
+	for ii in range(200):
+		circle_lats, lons1, lons2 = spherical.genSmallCircleCenterSubtendedAngle(angles[ii], lats[ii], lons[ii])
+		circle1, circle2 = spherical.splitSmallCirclePatch(lons[ii], lats[ii], circle_lats, lons1, lons2)
+		np_test.assert_allclose(patches1[ii], circle1)
+		np_test.assert_allclose(patches2[ii], circle2)
+		assert split[ii] == (not np.all(circle1 == circle2))
+
+
+def test_padSmallCirclePatches_keepsOutline():
+	rng = np.random.default_rng(1)
+	angles = rng.uniform(1, 170, 50)
+	lats = rng.uniform(-89, 89, 50)
+	lons = rng.uniform(-180, 180, 50)
+	patches, _, _ = spherical.genSmallCirclePatches(angles, lats, lons)
+	padded = spherical.padSmallCirclePatches(patches)
+	assert padded.shape == (50, 2*spherical.SMALL_CIRCLE_NUM_LATS+4, 2)
+	for ii in range(50):
+		# padding only repeats existing vertices
+		np_test.assert_array_equal(np.unique(padded[ii], axis=0), np.unique(patches[ii], axis=0))
+		np_test.assert_array_equal(padded[ii, 0], patches[ii][0])
+		np_test.assert_array_equal(padded[ii, -1], patches[ii][-1])
@@ -0,0 +1,41 @@
+import numpy as np
+import numpy.testing as np_test
+
+from orbviz.model.lens_models import pinhole
+
+
+def test_calcNestedPixelIdxs_shareRays():
+	coarse = (6, 4)
+	fine = (12, 8)
+	idxs = pinhole.calcNestedPixelIdxs(coarse, fine)
+	coarse_rays = pinhole.generatePixelRays(coarse, (30, 20))
+	fine_rays = pinhole.generatePixelRays(fine, (30, 20))
+	np_test.assert_allclose(fine_rays[idxs], coarse_rays, rtol=1e-12, atol=1e-12)
+
+
+def test_calcNestedPixelIdxs_notNested():
+	assert pinhole.calcNestedPixelIdxs((6, 4), (10, 8)) is None
+
+
+def test_generatePixelRays_subset():
+	idxs = np.array([0, 5, 17, 23])
+	all_rays = pinhole.generatePixelRays((6, 4), (30, 20))
+	subset_rays = pinhole.generatePixelRays((6, 4), (30, 20), pixel_idxs=idxs)
+	np_test.assert_allclose(subset_rays, all_rays[idxs])
+
+
+def test_calcPerimeterPixelIdxs_loop():
+	idxs = pinhole.calcPerimeterPixelIdxs((4, 3))
+	np_test.assert_array_equal(idxs, [0, 1, 2, 3, 7, 11, 10, 9, 8, 4])
+
+
+def test_projectToPixel_invertsGeneratePixelRays():
+	pixels = (7, 5)
+	rays = pinhole.generatePixelRays(pixels, (40, 25))
+	x, y = pinhole.projectToPixel(rays*3, pixels, (40, 25))
+	py, px = np.divmod(np.arange(pixels[0]*pixels[1]), pixels[0])
+	np_test.assert_allclose(x, px, atol=1e-9)
+	np_test.assert_allclose(y, py, atol=1e-9)
+	x, y = pinhole.projectToPixel(np.array([0., 0., -1.]), pixels, (40, 25))
+	assert np.isnan(x[0])
+	assert np.isnan(y[0])
@@ -0,0 +1,43 @@
+import numpy as np
+import numpy.testing as np_test
+
+from orbviz.model.lens_models import pinhole, ray_tables
+import orbviz.util.paths as orbviz_paths
+
+
+def test_getPixelRays_matchesLensModel():
+	rays = ray_tables.getPixelRays(pinhole, (6, 4), (30, 20))
+	assert rays.dtype == np.float32
+	np_test.assert_allclose(rays, pinhole.generatePixelRays((6, 4), (30, 20))[:,:3], atol=1e-7)
+	idxs = np.array([0, 5, 17, 23])
+	np_test.assert_array_equal(ray_tables.getPixelRays(pinhole, (6, 4), (30, 20), pixel_idxs=idxs), rays[idxs])
+
+
+def test_getPixelRays_shared():
+	assert ray_tables.getPixelRays(pinhole, (6, 4), (30, 20)) is ray_tables.getPixelRays(pinhole, [6, 4], [30.0, 20.0])
+
+
+def test_getPixelRays_persisted(tmp_path, monkeypatch):
+	monkeypatch.setattr(orbviz_paths, 'cache_dir', tmp_path)
+	monkeypatch.setattr(ray_tables, 'PERSIST_MIN_PIXELS', 1)
+	monkeypatch.setattr(ray_tables, 'GENERATION_CHUNK_PIXELS', 7)
+	rays = np.array(ray_tables.getPixelRays(pinhole, (8, 6), (40, 30)))
+	ray_tables.clearCache()
+	loaded = ray_tables.getPixelRays(pinhole, (8, 6), (40, 30))
+	assert isinstance(loaded, np.memmap)
+	assert len(list(tmp_path.glob('*.npy'))) == 1
+	np_test.assert_array_equal(loaded, rays)
+	np_test.assert_allclose(loaded, pinhole.generatePixelRays((8, 6), (40, 30))[:,:3], atol=1e-7)
+
+
+def test_getPixelRays_cacheBounded(monkeypatch):
+	monkeypatch.setattr(ray_tables, 'MAX_CACHED_TABLES', 2)
+	ray_tables.clearCache()
+	first = ray_tables.getPixelRays(pinhole, (6, 4), (30, 20))
+	second = ray_tables.getPixelRays(pinhole, (6, 4), (31, 20))
+	# using the first table again makes the second the least recently used
+	assert ray_tables.getPixelRays(pinhole, (6, 4), (30, 20)) is first
+	ray_tables.getPixelRays(pinhole, (6, 4), (32, 20))
+	assert len(ray_tables._tables) == 2
+	assert ray_tables.getPixelRays(pinhole, (6, 4), (30, 20)) is first
+	assert ray_tables.getPixelRays(pinhole, (6, 4), (31, 20)) is not second
@@ -0,0 +1,14 @@
+import numpy as np
+import numpy.testing as np_test
+
+from orbviz.util import array_u
+
+
+def test_PackedRaggedArray_fromList():
+	arrays = [np.ones((3,2)), np.zeros((0,2)), np.arange(8).reshape(4,2)]
+	packed = array_u.PackedRaggedArray.fromList(arrays, dtype=np.float32)
+	assert len(packed) == 3
+	assert packed.values.dtype == np.float32
+	np_test.assert_array_equal(packed.lengths(), [3, 0, 4])
+	for ii, arr in enumerate(arrays):
+		np_test.assert_array_equal(packed[ii], arr)
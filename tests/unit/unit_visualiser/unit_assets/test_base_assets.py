@@ -0,0 +1,31 @@
+from orbviz.visualiser.assets import base_assets
+
+
+class _DummyVisual:
+	def __init__(self):
+		self.parent = 'view'
+		self.visible = False
+
+
+def test_visualPool_reusesByKey():
+	pool = base_assets.VisualPool(max_pooled_per_key=1)
+	visual, is_new = pool.acquire(('mesh', 10), _DummyVisual)
+	assert is_new
+	assert pool.counts() == {'live': 1, 'pooled': 0}
+
+	pool.release(visual)
+	assert visual.parent is None
+	assert visual.visible
+	assert pool.counts() == {'live': 0, 'pooled': 1}
+
+	other, is_new = pool.acquire(('mesh', 20), _DummyVisual)
+	assert is_new
+	reused, is_new = pool.acquire(('mesh', 10), _DummyVisual)
+	assert not is_new
+	assert reused is visual
+
+	# only max_pooled_per_key visuals are kept per key
+	extra, _ = pool.acquire(('mesh', 20), _DummyVisual)
+	pool.release(other)
+	pool.release(extra)
+	assert pool.counts() == {'live': 1, 'pooled': 1}
@@ -0,0 +1,173 @@
+import datetime as dt
+import types
+
+import numpy as np
+import numpy.testing as np_test
+
+import orbviz
+from orbviz.model.data_models import data_types
+import orbviz.util.threading as threading
+from orbviz.visualiser.assets import sensors
+
+
+class _StubRaycastSource:
+	def __init__(self, on_block=None):
+		self.num_blocks = 0
+		self.on_block = on_block
+
+	def rayCastFromSensor(self, resolution, pix_per_rad, transform, rays_sf, *args, pixel_idxs=None, **kwargs):
+		self.num_blocks += 1
+		if self.on_block is not None:
+			self.on_block()
+		# encode the position in the image, so frames can be told apart
+		return np.full((len(rays_sf), 3), transform[0,3], dtype=np.float32), np.zeros(len(rays_sf), dtype=data_types.MOUSE_OVER_DTYPE)
+
+
+class _StubAttitude:
+	def isAttitudeValid(self, index):
+		return True
+
+	def getSensorAttitudeMatrix(self, suite_name, sens_name, index):
+		return np.eye(3)
+
+	def getSensorAttitudeQuat(self, suite_name, sens_name, index):
+		return np.array((0., 0., 0., 1.))
+
+
+class _StubHistory:
+	def __init__(self, num_steps=5):
+		start = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+		self.timespan = [start + dt.timedelta(seconds=30*ii) for ii in range(num_steps)]
+		pos = np.zeros((num_steps, 3))
+		pos[:,0] = np.arange(num_steps) + 7000
+		self.orbits = {1: types.SimpleNamespace(pos=pos, sun_pos=pos+100, moon_pos=pos+200)}
+		self.attitude = _StubAttitude()
+
+	def getOrbits(self):
+		return self.orbits
+
+	def getSCAttitude(self, sc_id):
+		return self.attitude
+
+
+def _makeSensorImage():
+	asset = sensors.SensorImageAsset(1, name='cam', parent_suite_name='suite',
+										config={'bf_quat':(1,0,0,0), 'resolution':(64,48), 'fov':(20,15)})
+	coarse_res = (32, 24)
+	asset.data['disp_res'] = coarse_res
+	asset.data['disp_img'] = np.zeros((coarse_res[0]*coarse_res[1], 3), dtype=np.float32)
+	asset.data['mo_data'] = np.zeros(coarse_res[0]*coarse_res[1], dtype=data_types.MOUSE_OVER_DTYPE)
+	return asset
+
+
+def _refinementWorker(asset, fine_res):
+	worker = threading.Worker(asset._raycastRefinementLevel,
+								asset.data['refine_generation'],
+								fine_res,
+								asset.data['disp_res'],
+								asset.data['disp_img'],
+								asset.data['mo_data'],
+								np.eye(4), None, None, None, {})
+	worker.signals.result.connect(asset._storeRefinementLevel)
+	asset.data['refine_worker'] = worker
+	return worker
+
+
+def test_sensorImageRefinement_stopsWhenIndexChanges(monkeypatch):
+	monkeypatch.setattr(sensors, 'REFINEMENT_BLOCK_PIXELS', 128)
+	asset = _makeSensorImage()
+	coarse_img = asset.data['disp_img']
+	# index changes while the first block is being raycast
+	asset.data['raycast_src'] = _StubRaycastSource(on_block=asset._cancelRefinement)
+	worker = _refinementWorker(asset, (128, 96))
+	worker.run()
+	assert asset.data['raycast_src'].num_blocks == 1
+	assert asset.data['disp_res'] == (32, 24)
+	assert asset.data['disp_img'] is coarse_img
+
+
+def test_sensorImageRefinement_discardsSupersededLevel():
+	asset = _makeSensorImage()
+	asset.data['raycast_src'] = _StubRaycastSource()
+	generation = asset.data['refine_generation']
+	fine_res = (64, 48)
+	result = asset._raycastRefinementLevel(generation, fine_res, asset.data['disp_res'], asset.data['disp_img'],
+											asset.data['mo_data'], np.eye(4), None, None, None, {}, threading.Flag(True))
+	assert result[1] == fine_res
+	asset._cancelRefinement()
+	asset._storeRefinementLevel(result)
+	assert asset.data['disp_res'] == (32, 24)
+
+
+def _prefetchingSensorImage(monkeypatch):
+	monkeypatch.setattr(orbviz, 'threadpool', threading.SynchronousThreadpool())
+	asset = _makeSensorImage()
+	asset.opts['progressive_refinement']['value'] = False
+	asset.opts['temporal_reprojection']['value'] = False
+	asset.setSource(_StubHistory(), _StubRaycastSource())
+	asset._setActiveFlag()
+	return asset
+
+
+def _showIndex(asset, index):
+	asset.data['curr_index'] = index
+	asset._setStaleFlag()
+	return asset.prepareRaycast()
+
+
+def test_sensorImagePrefetch_usedInPlaceOfRaycast(monkeypatch):
+	asset = _prefetchingSensorImage(monkeypatch)
+	asset.prefetchPreviews(np.array([2, 3]))
+	assert asset.data['raycast_src'].num_blocks == 2
+	# already prefetched indices aren't raycast again
+	asset.prefetchPreviews(np.array([2, 3]))
+	assert asset.data['raycast_src'].num_blocks == 2
+
+	assert _showIndex(asset, 3) is None
+	assert not asset.isStale()
+	assert asset.data['disp_res'] == asset.data['lowres']
+	np_test.assert_array_equal(asset.data['disp_img'], 7003)
+	assert asset.popPreviewRaycastTime() is not None
+	assert 3 not in asset.data['prefetched']
+
+
+def test_sensorImagePrefetch_discardedWhenSettingsChange(monkeypatch):
+	asset = _prefetchingSensorImage(monkeypatch)
+	asset.prefetchPreviews(np.array([1, 2]))
+	asset.opts['plot_atmosphere']['value'] = not asset.opts['plot_atmosphere']['value']
+	assert _showIndex(asset, 1) is not None
+	asset.setPreviewResolution(240)
+	assert _showIndex(asset, 2) is not None
+	assert len(asset.data['prefetched']) == 0
+
+
+def test_sensorImageRelease_stopsRefinement():
+	asset = _makeSensorImage()
+	asset.data['raycast_src'] = _StubRaycastSource(on_block=asset._releaseVisuals)
+	# released while a level is being raycast
+	worker = _refinementWorker(asset, (128, 96))
+	worker.run()
+	assert asset.data['raycast_src'].num_blocks == 1
+	assert 'image' not in asset.visuals
+	# released after a level has been raycast, but before it is stored
+	asset = _makeSensorImage()
+	asset.data['raycast_src'] = _StubRaycastSource()
+	result = asset._raycastRefinementLevel(asset.data['refine_generation'], (64, 48), asset.data['disp_res'],
+											asset.data['disp_img'], asset.data['mo_data'], np.eye(4), None, None, None, {},
+											threading.Flag(True))
+	asset._releaseVisuals()
+	asset._storeRefinementLevel(result)
+	assert asset.data['disp_res'] == (32, 24)
+
+
+def test_sensorCone_reusedOnlyWithSameAlpha():
+	sensor_dict = {'range':1000., 'fov':30., 'bf_quat':(0,0,0,1), 'colour':(255,0,0)}
+	asset = sensors.Sensor3DAsset.cone(1, 'cone', 'suite', sensor_dict)
+	cone = asset.visuals['sensor_cone']
+	asset._releaseVisuals()
+	asset.opts['sensor_cone_alpha']['value'] = 0.2
+	asset._createVisuals()
+	assert asset.visuals['sensor_cone'] is not cone
+	asset._releaseVisuals()
+	other = sensors.Sensor3DAsset.cone(1, 'other', 'suite', sensor_dict)
+	assert other.visuals['sensor_cone'] is cone
@@ -0,0 +1,30 @@
+from orbviz.visualiser.contexts.frame_scheduler import FrameScheduler
+
+
+def test_frameScheduler_coalescesRequests():
+	drawn = []
+	scheduler = FrameScheduler(drawn.append)
+	scheduler.setVisible(True)
+	for index in range(10):
+		scheduler.requestIndex(index)
+	assert drawn == []
+	assert scheduler.isDirty()
+	scheduler.flush()
+	assert drawn == [9]
+	assert not scheduler.isDirty()
+	scheduler.flush()
+	assert drawn == [9]
+
+
+def test_frameScheduler_catchesUpWhenVisible():
+	drawn = []
+	scheduler = FrameScheduler(drawn.append)
+	scheduler.requestIndex(3)
+	scheduler.requestIndex(4)
+	assert drawn == []
+	scheduler.setVisible(True)
+	assert drawn == [4]
+	scheduler.setVisible(False)
+	scheduler.requestIndex(5)
+	assert scheduler.isDirty()
+	assert drawn == [4]
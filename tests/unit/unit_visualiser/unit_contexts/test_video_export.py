@@ -0,0 +1,79 @@
+import imageio
+import numpy as np
+import numpy.testing as np_test
+import pytest
+
+from orbviz.visualiser.contexts import video_export
+
+
+def _renderFrame(index):
+	return np.full((6, 8, 4), index*40, dtype=np.uint8)
+
+
+def test_videoExporter_writesGif(tmp_path):
+	file = tmp_path.joinpath('export.gif')
+	progress = []
+	exporter = video_export.VideoExporter(file, (8, 6), fps=10)
+	assert exporter.run(_renderFrame, range(5), progress_callback=lambda done, total: progress.append((done, total)))
+	assert progress[-1] == (5, 5)
+	frames = imageio.mimread(file)
+	assert len(frames) == 5
+	np_test.assert_array_equal(frames[3][:, :, :3], 120)
+
+
+def test_videoExporter_cancelRemovesFile(tmp_path):
+	file = tmp_path.joinpath('export.gif')
+	exporter = video_export.VideoExporter(file, (8, 6))
+	rendered = []
+
+	def cancelAfterTwo(done, total):
+		if done == 2:
+			exporter.cancel()
+
+	def renderFrame(index):
+		rendered.append(index)
+		return _renderFrame(index)
+
+	assert not exporter.run(renderFrame, range(50), progress_callback=cancelAfterTwo)
+	assert rendered == [0, 1]
+	assert not file.exists()
+
+
+class _FailingWriter:
+	def __init__(self, fail_after):
+		self.fail_after = fail_after
+		self.num_frames = 0
+		self.closed = False
+
+	def append_data(self, frame):
+		if self.num_frames == self.fail_after:
+			raise OSError('disk full')
+		self.num_frames += 1
+
+	def close(self):
+		self.closed = True
+
+
+def test_videoExporter_encoderFailureStopsRendering(tmp_path, monkeypatch):
+	writer = _FailingWriter(fail_after=2)
+	monkeypatch.setattr(video_export.imageio, 'get_writer', lambda *args, **kwargs: writer)
+	exporter = video_export.VideoExporter(tmp_path.joinpath('export.gif'), (8, 6))
+	rendered = []
+
+	def renderFrame(index):
+		rendered.append(index)
+		return _renderFrame(index)
+
+	with pytest.raises(RuntimeError, match='disk full'):
+		exporter.run(renderFrame, range(1000))
+	# rendering stops once the encoder has failed, at most a queue's worth of frames later
+	assert len(rendered) < 1000
+	assert not exporter._thread.is_alive()
+	assert writer.closed
+	assert exporter.encoded_frames == 2
+
+def test_exportResolution_evenForVideo():
+	assert video_export.exportResolution((641, 361), 'mp4') == (640, 360)
+	assert video_export.exportResolution((641, 361), 'gif') == (641, 361)
+	with pytest.raises(ValueError, match='format must be one of'):
+		video_export.exportFormat('export.avi')
@@ -0,0 +1,33 @@
+import numpy as np
+
+from orbviz.visualiser.contexts.canvas_wrappers.picking import ScreenPickingIndex
+
+
+def _moInfo(screen_pos):
+	return {'screen_pos':screen_pos, 'world_pos':[], 'strings':[str(ii) for ii in range(len(screen_pos))], 'objects':[]}
+
+
+def test_query_nearestWithinThreshold():
+	mo_infos = [_moInfo([(None, None), (10, 10)]), _moInfo(np.array([[100., 100.], [12., 13.]]))]
+	picking_index = ScreenPickingIndex()
+	assert picking_index.isStale(('cam', 0))
+	picking_index.rebuild(('cam', 0), mo_infos)
+	assert not picking_index.isStale(('cam', 0))
+	assert picking_index.isStale(('cam', 1))
+
+	mo_info, ii = picking_index.query((11.5, 12.5), 5)
+	assert mo_info is mo_infos[1]
+	assert ii == 1
+	mo_info, ii = picking_index.query((9, 9), 5)
+	assert mo_info is mo_infos[0]
+	assert ii == 1
+	assert picking_index.query((50, 50), 5) is None
+
+
+def test_rebuild_masksExcludePoints():
+	mo_infos = [_moInfo([(10, 10), (12, 12)])]
+	picking_index = ScreenPickingIndex()
+	picking_index.rebuild(None, mo_infos, [np.array([False, True])])
+	assert picking_index.query((10, 10), 5)[1] == 1
+	picking_index.rebuild(None, mo_infos, [np.array([False, False])])
+	assert picking_index.query((10, 10), 5) is None
@@ -0,0 +1,63 @@
+from orbviz.visualiser.contexts.canvas_wrappers.sensor_views_cw import PreviewResolutionGovernor
+
+
+class _StubSensor:
+	'''Raycast time proportional to the number of preview pixels.'''
+	def __init__(self, preview_res, secs_per_pixel, res=(2048, 1536)):
+		self.data = {'res': res}
+		self.preview_res = preview_res
+		self.secs_per_pixel = secs_per_pixel
+
+	def popPreviewRaycastTime(self):
+		return self.secs_per_pixel * self.preview_res**2
+
+	def getPreviewResolution(self):
+		return self.preview_res
+
+	def setPreviewResolution(self, preview_res):
+		self.preview_res = preview_res
+
+
+def test_governor_downscalesAfterConsecutiveFrames():
+	governor = PreviewResolutionGovernor(frame_time_budget=0.030)
+	sensor = _StubSensor(480, 0.050/480**2)
+	for _ in range(PreviewResolutionGovernor.DOWNSCALE_FRAMES-1):
+		governor.update([sensor])
+		assert sensor.preview_res == 480
+	governor.update([sensor])
+	assert sensor.preview_res == 400
+
+
+def test_governor_settlesWithoutOscillating():
+	governor = PreviewResolutionGovernor(frame_time_budget=0.030)
+	# just over budget at 480, within budget at 400
+	sensor = _StubSensor(480, 0.033/480**2)
+	history = []
+	for _ in range(100):
+		governor.update([sensor])
+		history.append(sensor.preview_res)
+	assert history[-1] == 400
+	assert history.index(400) == PreviewResolutionGovernor.DOWNSCALE_FRAMES-1
+	assert set(history[history.index(400):]) == {400}
+
+
+def test_governor_upscaleCappedAtSensorResolution():
+	governor = PreviewResolutionGovernor(frame_time_budget=0.030)
+	sensor = _StubSensor(320, 1e-12, res=(500, 400))
+	for _ in range(100):
+		governor.update([sensor])
+	assert sensor.preview_res == 480
+
+
+def test_governor_holdFixesResolutionUntilReleased():
+	governor = PreviewResolutionGovernor(frame_time_budget=0.030)
+	slow = _StubSensor(320, 0.050/480**2)
+	fast = _StubSensor(640, 1e-12)
+	governor.hold([slow, fast], 480)
+	assert (slow.preview_res, fast.preview_res) == (480, 480)
+	for _ in range(100):
+		governor.update([slow, fast])
+	assert (slow.preview_res, fast.preview_res) == (480, 480)
+	governor.release()
+	assert (slow.preview_res, fast.preview_res) == (320, 640)
+	assert not governor.isHeld()
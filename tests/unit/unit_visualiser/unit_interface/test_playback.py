@@ -0,0 +1,61 @@
+import numpy as np
+
+from orbviz.visualiser.interface.playback import PlaybackEngine
+
+
+class _FakeClock:
+	def __init__(self):
+		self.now = 0.
+
+	def __call__(self):
+		return self.now
+
+
+def _makeEngine(num_samples, rate):
+	clock = _FakeClock()
+	shown = [0]
+	engine = PlaybackEngine(lambda: shown[-1], shown.append, lambda: np.arange(num_samples, dtype=float),
+							rate=rate, clock=clock)
+	return engine, shown, clock
+
+
+def test_playbackEngine_dropsFramesToKeepSchedule():
+	engine, shown, clock = _makeEngine(100, rate=10)
+	engine.play()
+	clock.now = 0.05
+	engine.tick()
+	assert shown[-1] == 0
+	clock.now = 0.35
+	engine.tick()
+	assert shown[-1] == 3
+	stats = engine.getStats()
+	assert stats['drawn_frames'] == 1
+	assert stats['dropped_frames'] == 2
+	clock.now = 20
+	engine.tick()
+	assert shown[-1] == 99
+	assert not engine.isPlaying()
+
+
+def test_playbackEngine_followsManualIndexChange():
+	engine, shown, clock = _makeEngine(100, rate=10)
+	engine.play()
+	clock.now = 1
+	shown.append(50)
+	engine.tick()
+	assert shown[-1] == 50
+	clock.now = 1.5
+	engine.tick()
+	assert shown[-1] == 55
+	engine.pause()
+
+def test_playbackEngine_prefetchesUpcomingIndices():
+	engine, shown, clock = _makeEngine(100, rate=10)
+	upcoming = []
+	engine.addPrefetcher(upcoming.append)
+	engine.play()
+	clock.now = 0.35
+	engine.tick()
+	assert shown[-1] == 3
+	# samples due within the next wall second, soonest first
+	np.testing.assert_array_equal(upcoming[-1], np.arange(4, 14))
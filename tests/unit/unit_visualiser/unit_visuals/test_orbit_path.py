@@ -0,0 +1,24 @@
+import numpy as np
+
+from orbviz.visualiser.visuals import orbit_path
+
+
+def _distToPath(points, path):
+	starts = path[:-1]
+	chords = path[1:] - starts
+	rel = points[:,None,:] - starts[None,:,:]
+	frac = np.clip(np.einsum('ijk,jk->ij', rel, chords) / np.einsum('jk,jk->j', chords, chords), 0, 1)
+	return np.linalg.norm(rel - frac[...,None]*chords, axis=2).min(axis=1)
+
+
+def test_buildLodLevels_errorBounded():
+	t = np.linspace(0, 6*np.pi, 2000)
+	pos = np.column_stack((np.cos(t), np.sin(t), 0.01*t))
+	cut_idxs = np.array([700, 1500])
+	levels = orbit_path._buildLodLevels(pos, cut_idxs)
+	assert len(levels[0][0]) == 2000
+	assert len(levels[-1][0]) >= orbit_path.LOD_MIN_VERTICES
+	for kept, error in levels[1:]:
+		# cuts and the path ends survive decimation
+		assert np.all(np.isin([0, 700, 701, 1500, 1501, 1999], kept))
+		assert _distToPath(pos, pos[kept]).max() <= error + 1e-9
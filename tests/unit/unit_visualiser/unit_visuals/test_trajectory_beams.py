@@ -0,0 +1,47 @@
+import numpy as np
+
+from orbviz.model.geometry import polyhedra
+from orbviz.visualiser.visuals import trajectory_beams
+
+
+def _trajectories(num_instances=4, num_steps=3):
+	return np.arange(num_instances*num_steps*3, dtype=float).reshape(num_instances, num_steps, 3) + 1
+
+
+def _cone():
+	return polyhedra.calcConeMesh((0,0,0), 1000., np.array((0,0,1)).reshape(1,3), 30., theta_sample=8)
+
+
+def test_trajectoryBuffer_instancesViewTimestep():
+	buffer = trajectory_beams.TrajectoryBuffer(_trajectories())
+	view = buffer.instances(2)
+	assert view.base is buffer.vbo
+	assert view.divisor == 1
+	assert view.size == 4
+	assert view.offset == 2*4*view.itemsize
+	single = buffer.instances(1, 3)
+	assert single.size == 1
+	assert single.offset == (1*4+3)*single.itemsize
+
+
+def test_trajectoryBeams_instancedBindsTimestepWithoutUpload():
+	buffer = trajectory_beams.TrajectoryBuffer(_trajectories())
+	vertices, faces = _cone()
+	beams = trajectory_beams.TrajectoryBeamsVisual(vertices, faces, buffer)
+	beams.set_index(1)
+	shift = beams.shared_program['a_shift']
+	assert shift.base is buffer.vbo
+	assert shift.offset == 1*4*shift.itemsize
+
+
+def test_trajectoryBeams_mergedShiftsEveryVertex():
+	trajectories = _trajectories()
+	vertices, faces = _cone()
+	beams = trajectory_beams.TrajectoryBeamsVisual(vertices, faces, trajectories, instanced=False)
+	beams.set_index(2)
+	# merged faces are unindexed, three vertices per face of each copy
+	num_vertices = len(trajectories)*3*len(faces)
+	assert len(beams.mesh_data.get_vertices(indexed='faces').reshape(-1,3)) == num_vertices
+	shift = beams.shared_program['a_shift']
+	assert shift.size == num_vertices
+	assert getattr(shift, 'divisor', None) is None